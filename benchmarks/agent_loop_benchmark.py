@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Measure the agent loop's own overhead per turn, independent of model speed.
+
+The real main agent (`create_main_agent`, full toolsets and system prompts)
+is driven by a scripted pydantic-ai `FunctionModel` that replays a
+tool-heavy conversation: every turn makes `--rounds` rounds of tool calls
+(read, search, glob, ls, todo_write) against a synthetic repository before
+answering. Each turn runs the same steps as `cli/runner.py`: token
+estimate, `agent.run` with the growing history, then the session recorder.
+
+Two passes are made:
+  * timing  - per-turn wall time split into model stand-in, tool execution
+              (wall time with at least one tool call running, from the tool
+              metrics registry, so concurrent calls count once) and harness
+              overhead, which includes pydantic-ai's tool dispatch;
+  * memory  - the same conversation under tracemalloc, reporting traced
+              memory, peak and live allocated blocks per turn, plus the
+              allocation sites that grew the most (skip with --no-memory).
+
+Usage:
+    python benchmarks/agent_loop_benchmark.py [--turns 50] [--rounds 2] [--output loop.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_repo import NEEDLE, RepoSpec, generate_repo  # noqa: E402
+
+SCHEMA_VERSION = 1
+
+_PROVIDERS = {
+    "providers": [{
+        "name": "bench", "type": "openai-compatible", "base_url": "http://127.0.0.1:9/v1",
+        "api_key_env": "COGENT_BENCH_API_KEY", "api_key_optional": True,
+        "models": ["scripted"], "default_model": "scripted",
+    }]
+}
+
+BENCH_REPO = RepoSpec(files=300, depth=3, fanout=3, max_lines=200, big_file_mb=0.5, ignored_files=50)
+
+
+class ScriptedModel:
+    """Replays `rounds` rounds of tool calls per user turn, then a short answer.
+
+    Time spent inside the stand-in is accumulated so it can be subtracted
+    from the turn's wall time.
+    """
+
+    def __init__(self, repo: str, files: List[str], rounds: int):
+        self.repo = repo
+        self.files = files
+        self.rounds = rounds
+        self.turn = 0
+        self.elapsed_s = 0.0
+
+    def _tool_calls(self, turn: int, round_no: int) -> list:
+        from pydantic_ai.messages import ToolCallPart
+        n = turn * self.rounds + round_no
+        path = self.files[n % len(self.files)]
+        calls = [
+            ('read', {'file_path': path, 'offset': 1, 'limit': 80}),
+            ('search', {'pattern': NEEDLE, 'path': self.repo, 'format': 'lines', 'glob': 'pkg0_0/**/*.py'}),
+            ('glob', {'pattern': '**/*.md', 'path': self.repo}),
+            ('ls', {'path': os.path.dirname(path)}),
+            ('todo_write', {'updates': [{'id': n, 'description': f'Review {os.path.basename(path)}',
+                                         'state': 'in_progress'}]}),
+        ]
+        return [ToolCallPart(name, args, f'call_{n}_{i}') for i, (name, args) in enumerate(calls)]
+
+    def __call__(self, messages, info):
+        from pydantic_ai.messages import ModelResponse, TextPart, ToolReturnPart, UserPromptPart
+        started = time.perf_counter()
+        # Tool rounds completed since the latest user prompt
+        rounds_done = 0
+        for m in reversed(messages):
+            parts = getattr(m, 'parts', [])
+            if any(isinstance(p, UserPromptPart) for p in parts):
+                break
+            if any(isinstance(p, ToolReturnPart) for p in parts):
+                rounds_done += 1
+        if rounds_done < self.rounds:
+            response = ModelResponse(parts=self._tool_calls(self.turn, rounds_done))
+        else:
+            response = ModelResponse(parts=[TextPart(f'Turn {self.turn}: reviewed the files, nothing to change.')])
+        self.elapsed_s += time.perf_counter() - started
+        return response
+
+
+def _text_files(repo: str) -> List[str]:
+    out = []
+    for dirpath, dirs, files in os.walk(repo):
+        dirs[:] = sorted(d for d in dirs if d not in {'.git', 'node_modules', 'build', 'generated'})
+        out.extend(os.path.join(dirpath, f) for f in sorted(files) if f.endswith(('.py', '.md', '.txt')))
+    return out
+
+
+async def _conversation(workdir: str, repo: str, turns: int, rounds: int, cache_stable: bool,
+                        memory: bool) -> Dict[str, Any]:
+    from pydantic_ai.models.function import FunctionModel
+
+    from main_agent import create_main_agent, main_system_prompts
+    from models.agent_deps import AgentDeps
+    from models.session_recorder import SessionRecorder
+    from models.todo_store import TodoStore
+    from models.token_estimator import get_token_estimator
+    from tools.tool_metrics import get_tool_metrics
+
+    scripted = ScriptedModel(repo, _text_files(repo), rounds)
+    agent = create_main_agent(cache_stable_prompt=cache_stable)
+    recorder = SessionRecorder(workdir)
+    deps = AgentDeps(cwd=workdir, todos=TodoStore.for_session(workdir, recorder.session_id))
+    estimator = get_token_estimator()
+    metrics = get_tool_metrics()
+    history: list = []
+    rows: List[Dict[str, Any]] = []
+    first_snapshot = None
+
+    if memory:
+        tracemalloc.start()
+        first_snapshot = tracemalloc.take_snapshot()
+
+    with agent.override(model=FunctionModel(scripted)):
+        for turn in range(turns):
+            scripted.turn = turn
+            tool_ms_before = metrics.busy_ms()
+            model_s_before = scripted.elapsed_s
+            if memory:
+                tracemalloc.reset_peak()
+            blocks_before = sys.getallocatedblocks()
+
+            started = time.perf_counter()
+            user_text = f'Turn {turn}: review the next files and keep the todo list current.'
+            estimated = estimator.estimate_prompt(
+                history, user_text,
+                system_prompts=() if history else main_system_prompts(deps, cache_stable))
+            estimated_at = time.perf_counter()
+            result = await agent.run(user_text, message_history=history, deps=deps)
+            ran_at = time.perf_counter()
+            history = result.all_messages()
+            usage = result.usage() if callable(result.usage) else result.usage  # method in older pydantic-ai
+            recorder.record_turn(estimated, usage, ran_at - started)
+            recorder.record(history, tool_stats=metrics.summary())
+            finished = time.perf_counter()
+
+            turn_ms = (finished - started) * 1000
+            tool_ms = metrics.busy_ms() - tool_ms_before
+            model_ms = (scripted.elapsed_s - model_s_before) * 1000
+            row = {
+                'turn': turn + 1,
+                'history_messages': len(history),
+                'estimated_tokens': estimated,
+                'turn_ms': round(turn_ms, 3),
+                'estimate_ms': round((estimated_at - started) * 1000, 3),
+                'record_ms': round((finished - ran_at) * 1000, 3),
+                'tool_ms': round(tool_ms, 3),
+                'model_ms': round(model_ms, 3),
+                'harness_ms': round(turn_ms - tool_ms - model_ms, 3),
+                'allocated_blocks_delta': sys.getallocatedblocks() - blocks_before,
+            }
+            if memory:
+                current, peak = tracemalloc.get_traced_memory()
+                row['traced_kb'] = round(current / 1024, 1)
+                row['peak_kb'] = round(peak / 1024, 1)
+            rows.append(row)
+
+    out: Dict[str, Any] = {'turns': rows}
+    if memory:
+        growth = tracemalloc.take_snapshot().compare_to(first_snapshot, 'lineno')
+        tracemalloc.stop()
+        out['top_allocations'] = [
+            {'site': str(stat.traceback), 'size_diff_kb': round(stat.size_diff / 1024, 1), 'count_diff': stat.count_diff}
+            for stat in growth[:10]
+        ]
+    return out
+
+
+def _slope(xs: List[float], ys: List[float]) -> float:
+    """Least-squares slope of ys over xs (0 for fewer than two points)."""
+    if len(xs) < 2:
+        return 0.0
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+
+
+def summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Early vs. late medians and per-message growth of the harness overhead."""
+    k = max(1, len(rows) // 10)
+    early, late = rows[:k], rows[-k:]
+    summary = {}
+    for key in ('turn_ms', 'harness_ms', 'estimate_ms', 'record_ms', 'tool_ms'):
+        summary[key] = {
+            'median': round(statistics.median(r[key] for r in rows), 3),
+            'first_decile_median': round(statistics.median(r[key] for r in early), 3),
+            'last_decile_median': round(statistics.median(r[key] for r in late), 3),
+        }
+    summary['harness_ms_per_history_message'] = round(
+        _slope([r['history_messages'] for r in rows], [r['harness_ms'] for r in rows]), 5)
+    return summary
+
+
+def run_agent_loop_benchmark(turns: int = 50, rounds: int = 2, cache_stable: bool = False,
+                             memory: bool = True, workdir: Optional[str] = None) -> Dict[str, Any]:
+    from tools.file_cache import get_file_cache
+    from tools.task_tool import get_sub_agent_registry
+
+    base = workdir or tempfile.mkdtemp(prefix='cogent-loop-bench-')
+    previous_cwd = os.getcwd()
+    saved_env = {k: os.environ.pop(k, None) for k in ('MODEL_PROVIDER', 'MODEL_NAME')}
+    try:
+        repo = os.path.join(base, 'repo')
+        generate_repo(repo, BENCH_REPO)
+        with open(os.path.join(base, 'providers.json'), 'w', encoding='utf-8') as f:
+            json.dump(_PROVIDERS, f)
+        os.chdir(base)
+        get_sub_agent_registry().clear()
+
+        get_file_cache().clear()
+        timing = asyncio.run(_conversation(base, repo, turns, rounds, cache_stable, memory=False))
+        report: Dict[str, Any] = {
+            'schema_version': SCHEMA_VERSION,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': {'turns': turns, 'rounds': rounds, 'tool_calls_per_round': 5, 'cache_stable': cache_stable},
+            'summary': summarize(timing['turns']),
+            'timing': timing['turns'],
+        }
+        if memory:
+            get_file_cache().clear()
+            mem = asyncio.run(_conversation(base, repo, turns, rounds, cache_stable, memory=True))
+            report['memory'] = [
+                {k: r[k] for k in ('turn', 'history_messages', 'traced_kb', 'peak_kb', 'allocated_blocks_delta')}
+                for r in mem['turns']
+            ]
+            report['top_allocations'] = mem['top_allocations']
+        return report
+    finally:
+        os.chdir(previous_cwd)
+        for k, v in saved_env.items():
+            if v is not None:
+                os.environ[k] = v
+        if workdir is None:
+            shutil.rmtree(base, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--turns', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=2, help='Tool-call rounds per turn (5 calls each)')
+    parser.add_argument('--cache-stable-prompt', action='store_true')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+    # Keep pydantic-ai's first-run banner out of the JSON on stdout
+    os.environ.setdefault('PYDANTIC_AI_NO_BANNER', '1')
+
+    report = run_agent_loop_benchmark(turns=args.turns, rounds=args.rounds,
+                                      cache_stable=args.cache_stable_prompt, memory=not args.no_memory)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    s = report['summary']
+    print(f"harness ms/turn: median {s['harness_ms']['median']} "
+          f"(first decile {s['harness_ms']['first_decile_median']}, last {s['harness_ms']['last_decile_median']}); "
+          f"+{s['harness_ms_per_history_message']} ms per history message", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
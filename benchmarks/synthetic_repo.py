@@ -0,0 +1,147 @@
+"""Deterministic synthetic repositories for the benchmarks.
+
+The generated tree mimics a real checkout closely enough to exercise the
+tools' hot paths: nested packages, mixed text/binary files, a `.gitignore`
+with a configurable number of rules, ignored and skip-listed directories
+full of files, and one large log file for offset reads and edits.
+"""
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+# Token that appears in a known fraction of lines, so searches have real hits
+NEEDLE = 'frobnicate'
+
+_WORDS = (
+    'self', 'value', 'result', 'config', 'request', 'handler', 'items', 'index', 'buffer', 'path',
+    'return', 'await', 'import', 'yield', 'lambda', 'None', 'True', 'False', 'data', 'context',
+)
+_TEXT_EXTENSIONS = ('.py', '.py', '.py', '.md', '.txt', '.js', '.json')
+
+
+@dataclass
+class RepoSpec:
+    files: int = 1000  # text + binary files outside the ignored directories
+    depth: int = 4  # directory nesting below the root
+    fanout: int = 3  # subdirectories per directory
+    min_lines: int = 20
+    max_lines: int = 400
+    min_line_length: int = 10
+    max_line_length: int = 120
+    binary_ratio: float = 0.05
+    gitignore_rules: int = 20
+    ignored_files: int = 200  # files placed in gitignored / skip-listed directories
+    needle_ratio: float = 0.01  # fraction of lines containing NEEDLE
+    big_file_mb: float = 8.0
+    seed: int = 0
+
+    def as_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def _line(rng: random.Random, spec: RepoSpec) -> str:
+    target = rng.randint(spec.min_line_length, spec.max_line_length)
+    indent = ' ' * (4 * rng.randint(0, 3))
+    words = [indent]
+    length = len(indent)
+    while length < target:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    if rng.random() < spec.needle_ratio:
+        words.insert(rng.randint(1, len(words)), NEEDLE)
+    return ' '.join(words).rstrip()
+
+
+def _directories(spec: RepoSpec) -> list:
+    dirs = ['']
+    frontier = ['']
+    for level in range(spec.depth):
+        nxt = []
+        for parent in frontier:
+            for i in range(spec.fanout):
+                d = os.path.join(parent, f'pkg{level}_{i}') if parent else f'pkg{level}_{i}'
+                nxt.append(d)
+        dirs.extend(nxt)
+        frontier = nxt
+    return dirs
+
+
+def _gitignore(rng: random.Random, spec: RepoSpec) -> list:
+    base = ['*.log', '!keep.log', 'build/', 'generated/', '**/tmp_*', '*.pyc', '/dist']
+    rules = base[:spec.gitignore_rules]
+    i = 0
+    while len(rules) < spec.gitignore_rules:
+        kind = i % 4
+        if kind == 0:
+            rules.append(f'cache_{i}/')
+        elif kind == 1:
+            rules.append(f'*.tmp{i}')
+        elif kind == 2:
+            rules.append(f'**/scratch_{i}/**')
+        else:
+            rules.append(f'pkg0_{rng.randint(0, spec.fanout)}/notes_{i}.md')
+        i += 1
+    return rules
+
+
+def generate_repo(root: str, spec: RepoSpec = RepoSpec()) -> Dict[str, object]:
+    """Populate `root` (created if missing) and return a short description of what was written."""
+    rng = random.Random(spec.seed)
+    os.makedirs(root, exist_ok=True)
+    dirs = _directories(spec)
+    for d in dirs[1:]:
+        os.makedirs(os.path.join(root, d), exist_ok=True)
+
+    text_files = binary_files = total_bytes = 0
+    for n in range(spec.files):
+        directory = os.path.join(root, rng.choice(dirs))
+        if rng.random() < spec.binary_ratio:
+            path = os.path.join(directory, f'blob_{n}.bin')
+            payload = rng.randbytes(rng.randint(256, 4096)) + b'\0'
+            with open(path, 'wb') as f:
+                f.write(payload)
+            binary_files += 1
+            total_bytes += len(payload)
+            continue
+        path = os.path.join(directory, f'mod_{n}{rng.choice(_TEXT_EXTENSIONS)}')
+        content = '\n'.join(_line(rng, spec) for _ in range(rng.randint(spec.min_lines, spec.max_lines))) + '\n'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        text_files += 1
+        total_bytes += len(content)
+
+    # Ignored content the walkers should prune: gitignored dirs and DEFAULT_SKIP_DIRS
+    ignored_dirs = ['build', 'generated', 'node_modules/dep/lib', '.git/objects', 'pkg0_0/tmp_cache']
+    for d in ignored_dirs:
+        os.makedirs(os.path.join(root, d), exist_ok=True)
+    for n in range(spec.ignored_files):
+        path = os.path.join(root, ignored_dirs[n % len(ignored_dirs)], f'ignored_{n}.py')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'{NEEDLE} = {n}\n' * 20)
+
+    with open(os.path.join(root, '.gitignore'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(_gitignore(rng, spec)) + '\n')
+
+    big_path = os.path.join(root, 'big.log')
+    big_lines = 0
+    target = int(spec.big_file_mb * 1024 * 1024)
+    with open(big_path, 'w', encoding='utf-8') as f:
+        written = 0
+        while written < target:
+            line = f'{big_lines + 1:09d} {_line(rng, spec)}\n'
+            f.write(line)
+            written += len(line)
+            big_lines += 1
+
+    return {
+        'root': root,
+        'directories': len(dirs),
+        'text_files': text_files,
+        'binary_files': binary_files,
+        'text_bytes': total_bytes,
+        'ignored_files': spec.ignored_files,
+        'big_file': big_path,
+        'big_file_lines': big_lines,
+    }
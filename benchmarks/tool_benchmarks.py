@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Time the tools' hot paths on a synthetic repository and emit JSON.
+
+Usage:
+    python benchmarks/tool_benchmarks.py [--files 2000] [--depth 4] [--big-file-mb 32]
+                                         [--repeat 5] [--output results.json]
+                                         [--compare baseline.json]
+
+Each benchmark runs `--repeat` times; min/median/mean wall times (ms) are
+reported. Keep the JSON of a release around and pass it to `--compare` to
+see per-benchmark ratios against it.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_repo import NEEDLE, RepoSpec, generate_repo  # noqa: E402
+
+SCHEMA_VERSION = 1
+
+
+def _time(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'repeats': repeat,
+    }
+
+
+def _synthetic_history(turns: int) -> list:
+    from pydantic_ai.messages import (
+        ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart,
+    )
+    from pydantic_ai.usage import RequestUsage
+
+    body = '\n'.join(f'{i:5d}  {NEEDLE} value = handler(request, {i})' for i in range(60))
+    messages = []
+    for t in range(turns):
+        call_id = f'call_{t}'
+        messages.append(ModelRequest(parts=[UserPromptPart(content=f'Step {t}: look at module {t}')]))
+        messages.append(ModelResponse(parts=[ToolCallPart('read', {'file_path': f'/repo/mod_{t}.py'}, call_id)],
+                                      usage=RequestUsage(input_tokens=1000 + t * 50, output_tokens=20)))
+        messages.append(ModelRequest(parts=[ToolReturnPart('read', body, call_id)]))
+        messages.append(ModelResponse(parts=[TextPart(f'Module {t} calls handler 60 times.')],
+                                      usage=RequestUsage(input_tokens=1500 + t * 50, output_tokens=12)))
+    return messages
+
+
+def run_benchmarks(spec: RepoSpec, repeat: int = 5, history_turns: int = 500,
+                   workdir: Optional[str] = None) -> Dict[str, object]:
+    from models.session_recorder import SessionRecorder
+    from tools.edit_tool import edit
+    from tools.file_cache import get_file_cache
+    from tools.glob_tool import glob
+    from tools.line_index import clear_line_indexes
+    from tools.ls_tool import ls
+    from tools.read_tool import read
+    from tools.search_tool import search
+
+    base = workdir or tempfile.mkdtemp(prefix='cogent-bench-')
+    repo = os.path.join(base, 'repo')
+    try:
+        started = time.perf_counter()
+        repo_info = generate_repo(repo, spec)
+        repo_info['generate_s'] = round(time.perf_counter() - started, 2)
+        big, big_lines = repo_info['big_file'], repo_info['big_file_lines']
+
+        def cold_caches():
+            get_file_cache().clear()
+            clear_line_indexes()
+
+        results: Dict[str, Dict[str, float]] = {}
+        for fmt in ('count', 'lines', 'context', 'full'):
+            results[f'search_{fmt}'] = _time(lambda: search(NEEDLE, path=repo, format=fmt), repeat)
+        results['search_glob_filtered'] = _time(
+            lambda: search(NEEDLE, path=repo, format='count', glob='**/*.py'), repeat)
+        results['glob_recursive'] = _time(lambda: glob('**/*.py', path=repo), repeat)
+        results['glob_anchored'] = _time(lambda: glob('pkg0_0/**/*.md', path=repo), repeat)
+        results['ls_flat'] = _time(lambda: ls(repo), repeat)
+        results['ls_depth_3'] = _time(lambda: ls(repo, depth=3), repeat)
+
+        tail = max(1, big_lines - 200)
+        results['read_offset_cold'] = _time(lambda: read(big, offset=tail, limit=200), repeat, setup=cold_caches)
+        results['read_offset_warm'] = _time(lambda: read(big, offset=tail, limit=200), repeat)
+        results['read_middle_warm'] = _time(lambda: read(big, offset=big_lines // 2, limit=200), repeat)
+
+        # Toggle one line back and forth so every run is a valid, unique replacement
+        marker = f'{big_lines // 2:09d} '
+        flip = {'state': False}
+
+        def edit_big():
+            old, new = (marker, marker + 'EDITED ') if not flip['state'] else (marker + 'EDITED ', marker)
+            out = edit(big, old, new)
+            if out.startswith('Error'):
+                raise RuntimeError(out)
+            flip['state'] = not flip['state']
+
+        results['edit_big_file'] = _time(edit_big, repeat)
+
+        history = _synthetic_history(history_turns)
+        recorder = SessionRecorder(base)
+        results['session_record'] = _time(lambda: recorder.record(history), repeat)
+        results['session_record']['messages'] = len(history)
+    finally:
+        if workdir is None:
+            shutil.rmtree(base, ignore_errors=True)
+
+    repo_info.pop('root', None)
+    repo_info.pop('big_file', None)
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'spec': spec.as_dict(),
+        'repo': repo_info,
+        'results': results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object]) -> str:
+    """Median ratios current/baseline per benchmark (>1 means slower)."""
+    rows = [f"{'benchmark':<22} {'baseline':>10} {'current':>10} {'ratio':>7}"]
+    base_results = baseline.get('results', {})
+    for name, res in current['results'].items():
+        old = base_results.get(name)
+        if not old:
+            rows.append(f"{name:<22} {'-':>10} {res['median_ms']:>10.2f} {'new':>7}")
+            continue
+        ratio = res['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        rows.append(f"{name:<22} {old['median_ms']:>10.2f} {res['median_ms']:>10.2f} {ratio:>7.2f}")
+    return "\n".join(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = RepoSpec()
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--files', type=int, default=defaults.files)
+    parser.add_argument('--depth', type=int, default=defaults.depth)
+    parser.add_argument('--fanout', type=int, default=defaults.fanout)
+    parser.add_argument('--min-lines', type=int, default=defaults.min_lines)
+    parser.add_argument('--max-lines', type=int, default=defaults.max_lines)
+    parser.add_argument('--max-line-length', type=int, default=defaults.max_line_length)
+    parser.add_argument('--binary-ratio', type=float, default=defaults.binary_ratio)
+    parser.add_argument('--gitignore-rules', type=int, default=defaults.gitignore_rules)
+    parser.add_argument('--big-file-mb', type=float, default=defaults.big_file_mb)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--history-turns', type=int, default=500,
+                        help='Turns in the synthetic history passed to SessionRecorder.record')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='Baseline JSON report to print median ratios against')
+    args = parser.parse_args(argv)
+
+    spec = RepoSpec(
+        files=args.files, depth=args.depth, fanout=args.fanout,
+        min_lines=args.min_lines, max_lines=args.max_lines, max_line_length=args.max_line_length,
+        binary_ratio=args.binary_ratio, gitignore_rules=args.gitignore_rules,
+        big_file_mb=args.big_file_mb, seed=args.seed,
+    )
+    report = run_benchmarks(spec, repeat=args.repeat, history_turns=args.history_turns)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print(compare(report, json.load(f)), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,14 +3,14 @@ import sys
 import re
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional
-from models.provider_config import list_available_models
+from typing import TYPE_CHECKING, Optional
+from models.provider_config import list_available_models, provider_stats
 from models.model_state import save_last_selection
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.key_binding import KeyBindings
 
-_PROMPT_SESSION: PromptSession | None = None
+if TYPE_CHECKING:  # prompt_toolkit is imported when the first interactive session is built
+    from prompt_toolkit import PromptSession
+
+_PROMPT_SESSION: "PromptSession | None" = None
 
 @dataclass
 class PromptState:
@@ -52,10 +52,13 @@ def _render_prompt() -> str:
     return '> '
 
 
-def init_prompt_session() -> PromptSession:
+def init_prompt_session() -> "PromptSession":
     global _PROMPT_SESSION
     if _PROMPT_SESSION is not None:
         return _PROMPT_SESSION
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.key_binding import KeyBindings
     cogent_dir = _ensure_cogent_dir()
     history_file = cogent_dir / 'history'
 
@@ -159,6 +162,31 @@ def _reset_prompt_for_tests():  # pragma: no cover - helper for unit tests
 _SLASH_PATTERN = r'/([a-zA-Z0-9_]+)'
 
 
+def _render_stats() -> str:
+    from tools.file_cache import file_cache_stats
+    from tools.line_index import line_index_stats
+    from tools.tool_metrics import format_tool_stats, get_tool_metrics
+    from sub_agents import get_subagent_executor
+
+    def _kv(stats: dict) -> str:
+        return ' '.join(f"{k}={v}" for k, v in stats.items())
+
+    lines = [
+        format_tool_stats(get_tool_metrics().summary()),
+        "",
+        f"[file cache] {_kv(file_cache_stats())}",
+        f"[line index] {_kv(line_index_stats())}",
+        f"[sub-agents] {_kv(get_subagent_executor().metrics())}",
+    ]
+    stats = provider_stats()
+    for sched in stats.get('rate_limits', []):
+        lines.append(f"[rate limit] {_kv(sched)}")
+    for router in stats.get('routers', []):
+        for target in router['targets']:
+            lines.append(f"[router {router['router']}] {_kv(target)}")
+    return "\n".join(lines)
+
+
 def process_slash_commands(user_text: str) -> str:
     """Replace leading slash command with markdown file content.
 
@@ -210,6 +238,11 @@ def process_slash_commands(user_text: str) -> str:
                     return ''  # no message passed to agent
             print(f"Invalid selection. Enter 1-{len(pairs)} or blank to cancel.")
 
+    # /stats: per-tool latency percentiles and cache counters for this session
+    if command == 'stats':
+        print(_render_stats())
+        return ''
+
     # Default: treat as markdown command insertion
     commands_dir = os.path.join(os.getcwd(), '.cogent', 'commands')
     if not os.path.exists(commands_dir):
@@ -1,22 +1,66 @@
 import os
+import time
 import asyncio
 import argparse
-import logfire
 from cli.prompt import _get_state  # internal access for model switch state
 from models.agent_deps import AgentDeps
+from models.provider_config import provider_stats
 from models.session_recorder import SessionRecorder
-from main_agent import create_main_agent
+from models.todo_store import TodoStore
+from models.token_estimator import get_token_estimator
+from tools.tool_metrics import enable_tool_spans, get_tool_metrics
+from main_agent import create_main_agent, main_system_prompts, cache_stable_prompt_enabled
 from .prompt import get_user_input, process_slash_commands
+from .streaming import run_streaming
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, '').strip().lower() in {'1', 'true', 'yes', 'on'}
+
+
+def _format_usage(estimated: int, usage, elapsed: float) -> str:
+    actual_in = getattr(usage, 'input_tokens', None)
+    actual_out = getattr(usage, 'output_tokens', None)
+    cached = getattr(usage, 'cache_read_tokens', 0) or 0
+    requests = getattr(usage, 'requests', None)
+    return (f"[tokens] est prompt ~{estimated} | actual in={actual_in} (cached {cached}) out={actual_out} "
+            f"| requests={requests} | {elapsed:.1f}s")
 
 
 async def run_loop():
     parser = argparse.ArgumentParser(description="Interactive agent CLI")
-    parser.parse_args()  # reserved for future flags
+    parser.add_argument('--show-tokens', action='store_true',
+                        help='Print estimated prompt size before sending and token usage after each turn '
+                             '(also enabled by COGENT_SHOW_TOKENS=1)')
+    parser.add_argument('--cache-stable-prompt', action='store_true',
+                        help='Freeze the system prompt per agent with static content first so provider '
+                             'prefix/KV caches can reuse it (also enabled by COGENT_CACHE_STABLE_PROMPT=1)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Render model output as it arrives with live tool-call progress '
+                             '(also enabled by COGENT_STREAM=1)')
+    parser.add_argument('--logfire', action='store_true',
+                        help='Send traces of agent runs to Logfire (also enabled by COGENT_LOGFIRE=1)')
+    parser.add_argument('--resume', metavar='SESSION_ID',
+                        help="Start with the TODO list an earlier session left in .cogent/sessions/")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Print an import-time breakdown of a cold start and exit')
+    args = parser.parse_args()
+    if args.profile_startup:
+        from .startup_profile import profile_startup
+        print(profile_startup())
+        return
+    stream = args.stream or _env_flag('COGENT_STREAM')
+    show_tokens = args.show_tokens or _env_flag('COGENT_SHOW_TOKENS')
+    cache_stable = args.cache_stable_prompt or cache_stable_prompt_enabled()
 
-    logfire.configure()
-    logfire.instrument_pydantic_ai()
+    if args.logfire or _env_flag('COGENT_LOGFIRE'):
+        # Imported on demand: loading and configuring logfire adds about a second to startup
+        import logfire
+        logfire.configure()
+        logfire.instrument_pydantic_ai()
+        enable_tool_spans()
 
-    agent = create_main_agent()
+    agent = create_main_agent(cache_stable_prompt=cache_stable)
     # Initialize prompt state model display if persistence or env selected a model
     state = _get_state()
     if getattr(agent, 'model', None) is not None:
@@ -27,9 +71,16 @@ async def run_loop():
             state.selected_provider = prov
         if mod and not state.selected_model:
             state.selected_model = mod
-    deps = AgentDeps(cwd=os.getcwd())
     history = []
     recorder = SessionRecorder(os.getcwd())
+    try:
+        todos = TodoStore.for_session(os.getcwd(), recorder.session_id, resume_from=args.resume)
+    except FileNotFoundError as e:
+        print(f"[resume] {e}")
+        return
+    deps = AgentDeps(cwd=os.getcwd(), todos=todos)
+    # Tokenizing the history every turn is only worth it when the numbers are shown
+    estimator = get_token_estimator() if show_tokens else None
 
     while True:
         try:
@@ -44,20 +95,55 @@ async def run_loop():
             print("Goodbye!")
             break
         processed_text = process_slash_commands(user_text)
+        if not processed_text.strip():
+            continue  # handled locally (e.g. /stats, /model)
         state = _get_state()
         if state.model_switch_requested:
             # Recreate agent with new selection and reset history
-            agent = create_main_agent(provider_name=state.selected_provider, model_name=state.selected_model)
+            agent = create_main_agent(
+                provider_name=state.selected_provider,
+                model_name=state.selected_model,
+                cache_stable_prompt=cache_stable,
+            )
             history = []
             state.model_switch_requested = False
             continue  # no user message this loop
+        # Local estimate of the request size (system prompts are only sent on the first turn)
+        estimated = None
+        if estimator is not None:
+            estimated = estimator.estimate_prompt(
+                history,
+                processed_text,
+                system_prompts=() if history else main_system_prompts(deps, cache_stable),
+            )
+            print(f"[tokens] sending ~{estimated} prompt tokens ({estimator.tokenizer.name})")
         try:
-            result = await agent.run(processed_text, message_history=history, deps=deps)
+            started = time.perf_counter()
+            first_token_s = None
+            subagents_before = deps.usage.snapshot()
+            if stream:
+                turn = await run_streaming(agent, processed_text, history, deps)
+                result, first_token_s = turn.result, turn.first_token_s
+            else:
+                result = await agent.run(processed_text, message_history=history, deps=deps)
+            elapsed = time.perf_counter() - started
             history = result.all_messages()
+            usage = result.usage()
+            subagent_usage = deps.usage.since(subagents_before)
+            recorder.record_turn(estimated, usage, elapsed, first_token_s=first_token_s,
+                                 subagent_usage=subagent_usage.as_dict() if subagent_usage.runs else None)
             if history:
                 # Persist the evolving transcript for this session
-                recorder.record(history)
-            print(result.output)
+                recorder.record(history, tool_stats=get_tool_metrics().summary(),
+                                provider_stats=provider_stats())
+            if not stream:
+                print(result.output)
+            if show_tokens:
+                print(_format_usage(estimated, usage, elapsed))
+                if subagent_usage.runs:
+                    print(f"[tokens] sub-agents: runs={subagent_usage.runs} in={subagent_usage.input_tokens} "
+                          f"out={subagent_usage.output_tokens} tool_calls={subagent_usage.tool_calls} "
+                          f"| {subagent_usage.wall_time_s:.1f}s")
         except Exception as e:  # pragma: no cover - broad safety
             print(f"[error invoking model: {e}]")
 
@@ -0,0 +1,61 @@
+"""`--profile-startup`: import-time breakdown of a cold CLI start.
+
+Runs `python -X importtime` in a fresh interpreter (so modules already loaded
+in this process do not hide their cost) and summarizes the report.
+"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# What a cold start imports before the first prompt is shown
+STARTUP_IMPORTS = ('cli.runner', 'main_agent')
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(report: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every line of a `-X importtime` report."""
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # header line
+        rows.append((fields[2].strip(), self_us, cumulative_us))
+    return rows
+
+
+def summarize(rows: List[Tuple[str, int, int]], top: int = 15) -> str:
+    by_package: Dict[str, int] = defaultdict(int)
+    for module, self_us, _ in rows:
+        by_package[module.split('.')[0]] += self_us
+    total_us = sum(by_package.values())
+    lines = [f"Startup imports: {total_us / 1000:.0f} ms across {len(rows)} modules", "",
+             "Self time by top-level package:"]
+    for package, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"  {us / 1000:8.1f} ms  {us * 100 / max(total_us, 1):5.1f}%  {package}")
+    lines += ["", "Slowest modules (cumulative, including their imports):"]
+    for module, _, cumulative_us in sorted(rows, key=lambda r: -r[2])[:top]:
+        lines.append(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+    return "\n".join(lines)
+
+
+def profile_startup(modules=STARTUP_IMPORTS, top: int = 15) -> str:
+    code = "import " + ", ".join(modules)
+    # The CLI runs from the user's project: keep that cwd, but import cogent from its checkout
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (_REPO_ROOT, env.get('PYTHONPATH')) if p)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, env=env)
+    rows = parse_importtime(proc.stderr)
+    report = summarize(rows, top=top)
+    if proc.returncode != 0:
+        report += "\n\n[import failed]\n" + proc.stderr.strip().splitlines()[-1]
+    return report
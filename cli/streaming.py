@@ -0,0 +1,107 @@
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, TextIO
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+)
+
+_ARGS_PREVIEW_CHARS = 80
+
+
+@dataclass
+class StreamedTurn:
+    result: Any
+    first_token_s: Optional[float]
+
+
+def _args_preview(part: Any) -> str:
+    args = getattr(part, 'args', None)
+    if args is None:
+        return ''
+    text = args if isinstance(args, str) else str(args)
+    text = ' '.join(text.split())
+    if len(text) > _ARGS_PREVIEW_CHARS:
+        text = text[:_ARGS_PREVIEW_CHARS - 3] + '...'
+    return text
+
+
+class _Printer:
+    """Writes streamed text and keeps tool progress lines on their own lines."""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.at_line_start = True
+
+    def text(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self.out.write(chunk)
+        self.out.flush()
+        self.at_line_start = chunk.endswith('\n')
+
+    def line(self, text: str) -> None:
+        if not self.at_line_start:
+            self.out.write('\n')
+        self.out.write(text + '\n')
+        self.out.flush()
+        self.at_line_start = True
+
+    def finish(self) -> None:
+        if not self.at_line_start:
+            self.out.write('\n')
+            self.out.flush()
+            self.at_line_start = True
+
+
+async def run_streaming(agent: Agent, user_text: str, history: list, deps: Any,
+                        out: Optional[TextIO] = None) -> StreamedTurn:
+    """Run one agent turn, rendering model text as it arrives plus live tool-call progress.
+
+    Returns the finished run result (same `all_messages()` / `usage()` as
+    `agent.run`) and the time to the first streamed text token.
+    """
+    printer = _Printer(out or sys.stdout)
+    started = time.perf_counter()
+    first_token_s: Optional[float] = None
+    tool_started: Dict[str, float] = {}
+
+    def on_text(chunk: str) -> None:
+        nonlocal first_token_s
+        if chunk and first_token_s is None:
+            first_token_s = time.perf_counter() - started
+        printer.text(chunk)
+
+    async with agent.iter(user_text, message_history=history, deps=deps) as run:
+        async for node in run:
+            if Agent.is_model_request_node(node):
+                async with node.stream(run.ctx) as request_stream:
+                    async for event in request_stream:
+                        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+                            on_text(event.part.content)
+                        elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                            on_text(event.delta.content_delta)
+            elif Agent.is_call_tools_node(node):
+                async with node.stream(run.ctx) as tool_stream:
+                    async for event in tool_stream:
+                        if isinstance(event, FunctionToolCallEvent):
+                            part = event.part
+                            tool_started[part.tool_call_id] = time.perf_counter()
+                            printer.line(f"  [tool] {part.tool_name}({_args_preview(part)}) ...")
+                        elif isinstance(event, FunctionToolResultEvent):
+                            # `part` on newer pydantic-ai, `result` on older releases
+                            part = getattr(event, 'part', None) or getattr(event, 'result', None)
+                            call_id = getattr(part, 'tool_call_id', None)
+                            t0 = tool_started.pop(call_id, None)
+                            elapsed = f" {time.perf_counter() - t0:.2f}s" if t0 is not None else ''
+                            status = 'retry' if type(part).__name__ == 'RetryPromptPart' else 'done'
+                            printer.line(f"  [tool] {getattr(part, 'tool_name', '?')} {status}{elapsed}")
+        printer.finish()
+        return StreamedTurn(result=run.result, first_token_s=first_token_s)
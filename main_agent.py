@@ -4,11 +4,32 @@ from models.provider_config import build_chat_model
 from models.model_state import load_last_selection
 
 from toolsets.common_agent_toolset import common_agent_toolset, common_agent_tool_definitions
-from toolsets.root_agent_toolset import root_agent_toolset, root_agent_tool_definitions
+from toolsets.root_agent_toolset import get_root_agent_toolset, get_root_agent_tool_definitions
 from prompts import MAIN_SYSTEM_PROMPT
 from models.agent_deps import AgentDeps
 
-def create_main_agent(provider_name: str | None = None, model_name: str | None = None) -> Agent[AgentDeps]:
+# Opt-in "cache-stable prompt" layout (see create_main_agent)
+CACHE_STABLE_PROMPT_ENV = 'COGENT_CACHE_STABLE_PROMPT'
+
+
+def cache_stable_prompt_enabled() -> bool:
+    return os.environ.get(CACHE_STABLE_PROMPT_ENV, '').strip().lower() in {'1', 'true', 'yes', 'on'}
+
+
+def create_main_agent(
+    provider_name: str | None = None,
+    model_name: str | None = None,
+    cache_stable_prompt: bool | None = None,
+) -> Agent[AgentDeps]:
+    """Build the root agent.
+
+    With `cache_stable_prompt` (default: COGENT_CACHE_STABLE_PROMPT env var) the
+    system prompt is rendered once per agent and laid out static-first
+    (MAIN_SYSTEM_PROMPT, tool docs, then the cwd line) so the request prefix is
+    byte-identical across runs and provider-side prefix/KV caches can reuse it.
+    """
+    if cache_stable_prompt is None:
+        cache_stable_prompt = cache_stable_prompt_enabled()
     # If not explicitly provided and no environment override, attempt to load last persisted selection
     if not provider_name and not model_name and 'MODEL_PROVIDER' not in os.environ and 'MODEL_NAME' not in os.environ:
         try:
@@ -20,13 +41,16 @@ def create_main_agent(provider_name: str | None = None, model_name: str | None =
             pass
     model = build_chat_model(provider_name=provider_name, model_name=model_name)
 
+    if cache_stable_prompt:
+        return _create_cache_stable_agent(model)
+
     agent = Agent(
         model=model,
         system_prompt=MAIN_SYSTEM_PROMPT,
         deps_type=AgentDeps,
         toolsets=[
             common_agent_toolset,
-            root_agent_toolset,
+            get_root_agent_toolset(),
         ])
     
     @agent.system_prompt
@@ -35,16 +59,45 @@ def create_main_agent(provider_name: str | None = None, model_name: str | None =
 
     @agent.system_prompt
     def add_tool_usage(ctx: RunContext[AgentDeps]) -> str:
-        def render_tool_defs(defs) -> str:
-            parts = [
-            f"Tool name: {d.fn.__name__}\nTool description: {d.usage_system_prompt}"
-            for d in defs
-            ]
-            return "---\n\n" + "\n---\n\n".join(parts) if parts else ""
+        return render_tool_usage()
 
-        tool_usage = render_tool_defs(common_agent_tool_definitions)
-        tool_usage += render_tool_defs(root_agent_tool_definitions)
+    return agent
+
+
+def _create_cache_stable_agent(model) -> Agent[AgentDeps]:
+    # Static content is frozen at construction; only the trailing cwd line depends on deps.
+    static_prompt = MAIN_SYSTEM_PROMPT + "\n\n" + render_tool_usage()
+    agent = Agent(
+        model=model,
+        system_prompt=static_prompt,
+        deps_type=AgentDeps,
+        toolsets=[
+            common_agent_toolset,
+            get_root_agent_toolset(),
+        ])
 
-        return tool_usage
+    @agent.system_prompt
+    def add_cwd(ctx: RunContext[AgentDeps]) -> str:
+        return f"The current working directory is: {ctx.deps.cwd}"
 
     return agent
+
+
+def _render_tool_defs(defs) -> str:
+    parts = [
+        f"Tool name: {d.fn.__name__}\nTool description: {d.usage_system_prompt}"
+        for d in defs
+    ]
+    return "---\n\n" + "\n---\n\n".join(parts) if parts else ""
+
+
+def render_tool_usage() -> str:
+    return _render_tool_defs(common_agent_tool_definitions) + _render_tool_defs(get_root_agent_tool_definitions())
+
+
+def main_system_prompts(deps: AgentDeps, cache_stable_prompt: bool = False) -> list[str]:
+    """System prompt texts the main agent sends on the first turn (used for local token estimates)."""
+    cwd_line = f"The current working directory is: {deps.cwd}"
+    if cache_stable_prompt:
+        return [MAIN_SYSTEM_PROMPT + "\n\n" + render_tool_usage(), cwd_line]
+    return [MAIN_SYSTEM_PROMPT, cwd_line, render_tool_usage()]
@@ -1,28 +1,45 @@
 import warnings
 from models.agent_deps import AgentDeps  # noqa: F401
+from models.file_edit import FileEdit  # noqa: F401
+from models.file_read_request import FileReadRequest  # noqa: F401
 from models.model_state import load_last_selection, save_last_selection  # noqa: F401
 from models.provider_config import (  # noqa: F401
     build_chat_model,
     list_available_models,
     load_providers_config,
+    reload_providers_config,
     resolve_provider,
 )
 from models.session_recorder import SessionRecorder  # noqa: F401
+from models.task_request import TaskRequest  # noqa: F401
 from models.todo_item import TodoItem, TodoState  # noqa: F401
+from models.todo_patch import TodoPatch  # noqa: F401
+from models.todo_store import TodoStore  # noqa: F401
+from models.token_estimator import TokenEstimator, get_token_estimator  # noqa: F401
 from models.tool_definition import ToolDefinition  # noqa: F401
+from models.usage_account import UsageAccount  # noqa: F401
 
 __all__ = [
     'AgentDeps',
+    'FileEdit',
+    'FileReadRequest',
     'load_last_selection',
     'save_last_selection',
     'build_chat_model',
     'list_available_models',
     'load_providers_config',
+    'reload_providers_config',
     'resolve_provider',
     'SessionRecorder',
+    'TaskRequest',
     'TodoItem',
     'TodoState',
+    'TodoPatch',
+    'TodoStore',
+    'TokenEstimator',
+    'get_token_estimator',
     'ToolDefinition',
+    'UsageAccount',
 ]
 
 warnings.warn("Import 'Models' is deprecated; use 'models' instead.", DeprecationWarning, stacklevel=2)
@@ -1,8 +1,32 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Dict, Any
 
+from models.todo_store import TodoStore
+from models.usage_account import UsageAccount
+
 @dataclass
 class AgentDeps:
     cwd: str
     # Each agent instance gets its own bash session state to avoid cross-run leakage.
-    bash_session: Dict[str, Any] = field(default_factory=lambda: {"cwd": None})
\ No newline at end of file
+    bash_session: Dict[str, Any] = field(default_factory=lambda: {"cwd": None})
+    # Free-form per-agent state for tools; never shared with forked sub-agents.
+    scratch: Dict[str, Any] = field(default_factory=dict)
+    # Usage of sub-agents spawned from this agent (merged back after each run).
+    usage: UsageAccount = field(default_factory=UsageAccount)
+    # TODO list maintained through todo_write (persisted per session by the CLI).
+    todos: TodoStore = field(default_factory=TodoStore)
+
+    def fork(self) -> "AgentDeps":
+        """Copy-on-spawn deps for a sub-agent.
+
+        The child starts in the parent's current bash directory but gets its own
+        bash session, scratch state, usage account and TODO list, so concurrent
+        sub-agents cannot change each other's (or the parent's) state.
+        """
+        return replace(
+            self,
+            bash_session=dict(self.bash_session),
+            scratch={},
+            usage=UsageAccount(),
+            todos=TodoStore(),
+        )
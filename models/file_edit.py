@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+
+
+class FileEdit(BaseModel):
+    """One exact string replacement requested through the multi_edit tool.
+
+    Example:
+        {
+            "file_path": "/repo/src/app.py",
+            "old_string": "def load(path):",
+            "new_string": "def load(path, *, strict=False):",
+            "replace_all": false
+        }
+    """
+
+    file_path: str = Field(..., description="Absolute path to an existing file")
+    old_string: str = Field(..., description="The exact text to replace")
+    new_string: str = Field(..., description="The text to replace it with (must differ from old_string)")
+    replace_all: bool = Field(False, description="Replace every occurrence of old_string instead of exactly one")
+
+    model_config = {
+        "extra": "forbid"
+    }
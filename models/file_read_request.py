@@ -0,0 +1,23 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class FileReadRequest(BaseModel):
+    """One file (or line range) requested through the read_many tool.
+
+    Example:
+        {
+            "file_path": "/repo/src/app.py",
+            "offset": 120,
+            "limit": 80
+        }
+    """
+
+    file_path: str = Field(..., description="Absolute path to the file to read")
+    offset: Optional[int] = Field(None, description="1-based starting line number (>=1)")
+    limit: Optional[int] = Field(None, description="Max number of lines to return (>=1)")
+
+    model_config = {
+        "extra": "forbid"
+    }
@@ -0,0 +1,186 @@
+"""Process-wide cache of provider clients and model objects.
+
+`build_chat_model` is called for the main agent, on every `/model` switch and
+for every `task` sub-agent. Creating a fresh `OpenAIProvider` each time means
+a fresh HTTP client, connection pool and TLS handshake. The registry keeps one
+provider per (provider, base_url, api_key) and one model object per
+(provider, type, model, base_url, api_key), all sharing a single keep-alive
+`httpx.AsyncClient`. Pooled connections are bound to the event loop that
+opened them, so that client hands each request to a per-loop pool and
+survives repeated `asyncio.run`.
+
+Pool limits are tunable through environment variables:
+- COGENT_HTTP_MAX_CONNECTIONS (default 100)
+- COGENT_HTTP_MAX_KEEPALIVE (default 20)
+- COGENT_HTTP_KEEPALIVE_EXPIRY seconds (default 30)
+- COGENT_HTTP2: '1' to force HTTP/2, '0' to disable; by default it is used when `h2` is installed.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Tuple
+
+from pydantic_ai.providers.openai import OpenAIProvider
+
+try:  # httpx ships with the openai SDK; keep the registry usable without it
+    import httpx
+except ImportError:  # pragma: no cover - depends on installed SDK
+    httpx = None  # type: ignore[assignment]
+
+# Match the OpenAI SDK defaults: long read timeout for slow generations, short connect timeout.
+_READ_TIMEOUT_S = 600.0
+_CONNECT_TIMEOUT_S = 5.0
+
+_lock = threading.Lock()
+_shared_client: Any = None
+_providers: Dict[Tuple[str, str, str], OpenAIProvider] = {}
+_models: Dict[Tuple[str, ...], Any] = {}
+_stats = {'provider_hits': 0, 'provider_misses': 0, 'model_hits': 0, 'model_misses': 0}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _http2_enabled() -> bool:
+    flag = os.environ.get('COGENT_HTTP2', '').strip().lower()
+    if flag in {'0', 'false', 'no', 'off'}:
+        return False
+    try:
+        import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    except ImportError:
+        return False
+    return True
+
+
+def _new_http_client() -> Any:
+    limits = httpx.Limits(
+        max_connections=_env_int('COGENT_HTTP_MAX_CONNECTIONS', 100),
+        max_keepalive_connections=_env_int('COGENT_HTTP_MAX_KEEPALIVE', 20),
+        keepalive_expiry=_env_float('COGENT_HTTP_KEEPALIVE_EXPIRY', 30.0),
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(_READ_TIMEOUT_S, connect=_CONNECT_TIMEOUT_S),
+        http2=_http2_enabled(),
+    )
+
+
+if httpx is not None:
+    class _LoopLocalClient(httpx.AsyncClient):
+        """AsyncClient that sends through one keep-alive pool per event loop.
+
+        Providers hold on to this object for their whole life, while the
+        connections underneath are only usable from the loop that opened them.
+        """
+
+        def __init__(self) -> None:
+            super().__init__(timeout=httpx.Timeout(_READ_TIMEOUT_S, connect=_CONNECT_TIMEOUT_S))
+            self._pools: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = weakref.WeakKeyDictionary()
+            self._pools_lock = threading.Lock()
+
+        def pool_for_running_loop(self) -> 'httpx.AsyncClient':
+            loop = asyncio.get_running_loop()
+            with self._pools_lock:
+                pool = self._pools.get(loop)
+                if pool is None or pool.is_closed:
+                    pool = _new_http_client()
+                    self._pools[loop] = pool
+                return pool
+
+        async def send(self, request: 'httpx.Request', **kwargs: Any) -> 'httpx.Response':
+            return await self.pool_for_running_loop().send(request, **kwargs)
+
+        async def aclose(self) -> None:
+            """Close the running loop's pool; pools of finished loops are dropped."""
+            loop = asyncio.get_running_loop()
+            with self._pools_lock:
+                pool = self._pools.pop(loop, None)
+                self._pools.clear()
+            if pool is not None:
+                await pool.aclose()
+            await super().aclose()
+
+
+def get_shared_http_client() -> Any:
+    """Return the shared keep-alive client, or None if httpx is unavailable."""
+    global _shared_client
+    if httpx is None:
+        return None
+    with _lock:
+        if _shared_client is None or getattr(_shared_client, 'is_closed', False):
+            _shared_client = _LoopLocalClient()
+        return _shared_client
+
+
+def get_openai_provider(provider_name: str, base_url: str, api_key: str) -> OpenAIProvider:
+    key = (provider_name, base_url, api_key)
+    with _lock:
+        cached = _providers.get(key)
+        if cached is not None:
+            _stats['provider_hits'] += 1
+            return cached
+    http_client = get_shared_http_client()
+    if http_client is not None:
+        created = OpenAIProvider(api_key=api_key, base_url=base_url, http_client=http_client)
+    else:  # pragma: no cover - depends on installed SDK
+        created = OpenAIProvider(api_key=api_key, base_url=base_url)
+    with _lock:
+        # Another thread may have raced us; keep the first instance
+        existing = _providers.setdefault(key, created)
+        _stats['provider_misses'] += 1
+    return existing
+
+
+def get_model(key: Tuple[str, ...], factory: Callable[[], Any]) -> Any:
+    """Return the cached model for `key`, creating it with `factory()` on first use."""
+    with _lock:
+        cached = _models.get(key)
+        if cached is not None:
+            _stats['model_hits'] += 1
+            return cached
+    created = factory()
+    with _lock:
+        existing = _models.setdefault(key, created)
+        _stats['model_misses'] += 1
+    return existing
+
+
+def registry_stats() -> Dict[str, int]:
+    with _lock:
+        out = dict(_stats)
+        out['providers'] = len(_providers)
+        out['models'] = len(_models)
+    return out
+
+
+def clear_model_registry() -> None:
+    """Drop cached providers and models (e.g. after providers.json changes).
+
+    The shared HTTP client is kept: its per-loop pools stay valid for any
+    base_url and are reused by the next providers created.
+    """
+    with _lock:
+        _providers.clear()
+        _models.clear()
+        for k in _stats:
+            _stats[k] = 0
+
+
+async def aclose_shared_http_client() -> None:
+    global _shared_client
+    with _lock:
+        client, _shared_client = _shared_client, None
+    if client is not None:
+        await client.aclose()
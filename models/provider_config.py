@@ -1,10 +1,29 @@
 import json
 import os
+import threading
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Any
-from pydantic import BaseModel, Field, ValidationError, field_validator, ConfigDict
+from typing import Dict, List, Optional, Tuple, Any
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator, ConfigDict
 from pydantic_ai.models.openai import Model, OpenAIChatModel, OpenAIResponsesModel
-from pydantic_ai.providers.openai import OpenAIProvider
+
+from models.model_registry import clear_model_registry, get_model, get_openai_provider
+from models.rate_limiter import RateLimitedModel, get_scheduler, scheduler_metrics
+from models.replay_model import ReplayModel
+from models.routing_model import RoutingModel, router_metrics
+
+ROUTER_TYPE = 'router'
+# Pseudo model name for router providers: route across all targets
+ROUTER_MODEL = 'auto'
+REPLAY_TYPE = 'replay'
+REPLAY_MODEL = 'replay'
+# Provider types that wrap other providers instead of talking to an endpoint
+_VIRTUAL_TYPES = {ROUTER_TYPE: ROUTER_MODEL, REPLAY_TYPE: REPLAY_MODEL}
+
+
+@dataclass
+class RouteTarget:
+    provider: str
+    model: Optional[str] = None
 
 
 @dataclass
@@ -16,6 +35,18 @@ class ProviderSpec:
     api_key_optional: bool = False
     models: List[str] = field(default_factory=list)
     default_model: Optional[str] = None
+    # Client-side rate limits enforced by models.rate_limiter (None = unlimited)
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    # Router-only settings (type == 'router')
+    targets: List[RouteTarget] = field(default_factory=list)
+    strategy: str = 'latency'
+    failure_threshold: int = 3
+    cooldown_s: float = 30.0
+    # Replay-only settings (type == 'replay')
+    replay_dir: str = '.cogent/replay'
+    replay_mode: str = 'replay'
+    target: Optional[RouteTarget] = None
 
     def choose_model(self, override: Optional[str]) -> str:
         if override:
@@ -69,31 +100,40 @@ _DEFAULT_CONFIG_JSON = {
 }
 
 
+class _RouteTargetModel(BaseModel):
+    provider: str
+    model: Optional[str] = None
+
+    model_config = ConfigDict(extra='forbid')
+
+
 class _ProviderSpecModel(BaseModel):
     name: str
     type: str = Field(default="openai")
-    base_url: str
-    api_key_env: str
+    base_url: str = ""
+    api_key_env: str = ""
     api_key_optional: bool = False
     models: List[str] = Field(default_factory=list)
     default_model: Optional[str] = None
+    requests_per_minute: Optional[int] = Field(default=None, ge=1)
+    tokens_per_minute: Optional[int] = Field(default=None, ge=1)
+    targets: List[_RouteTargetModel] = Field(default_factory=list)
+    strategy: str = "latency"
+    failure_threshold: int = Field(default=3, ge=1)
+    cooldown_s: float = Field(default=30.0, ge=0)
+    replay_dir: str = ".cogent/replay"
+    replay_mode: str = "replay"
+    target: Optional[_RouteTargetModel] = None
 
     model_config = ConfigDict(extra='forbid')
 
     @field_validator('type')
     @classmethod
     def _valid_type(cls, v: str) -> str:
-        if v not in {"openai", "openai-compatible"}:
+        if v not in {"openai", "openai-compatible", ROUTER_TYPE, REPLAY_TYPE}:
             raise ValueError(f"Unsupported provider type '{v}'")
         return v
 
-    @field_validator('api_key_env')
-    @classmethod
-    def _env_name(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("api_key_env must be non-empty")
-        return v
-
     @field_validator('default_model')
     @classmethod
     def _default_in_models(cls, v: Optional[str], info):  # info will have data in .data in v2 after previous validators
@@ -101,19 +141,56 @@ class _ProviderSpecModel(BaseModel):
         models = models or []
         if v and models and v not in models:
             raise ValueError(f"default_model '{v}' not present in models list")
-        if not models and not v:
+        if not models and not v and info.data.get('type') not in _VIRTUAL_TYPES:
             raise ValueError("Provider must specify either models list or default_model")
         return v
 
+    @model_validator(mode='after')
+    def _type_specific_fields(self):
+        if self.type == ROUTER_TYPE:
+            if not self.targets:
+                raise ValueError(f"Router provider '{self.name}' must list at least one target")
+            if self.strategy not in {"latency", "failover"}:
+                raise ValueError(f"Unsupported routing strategy '{self.strategy}'")
+            return self
+        if self.targets:
+            raise ValueError(f"'targets' is only valid for provider type '{ROUTER_TYPE}'")
+        if self.type == REPLAY_TYPE:
+            if self.replay_mode not in {"replay", "record", "auto"}:
+                raise ValueError(f"Unsupported replay_mode '{self.replay_mode}'")
+            if self.replay_mode != "replay" and self.target is None:
+                raise ValueError(f"Replay provider '{self.name}' needs a 'target' to record from")
+            return self
+        if self.target is not None:
+            raise ValueError(f"'target' is only valid for provider type '{REPLAY_TYPE}'")
+        if not self.base_url:
+            raise ValueError(f"Provider '{self.name}' requires base_url")
+        if not self.api_key_env or not self.api_key_env.strip():
+            raise ValueError("api_key_env must be non-empty")
+        return self
+
     def to_dataclass(self) -> ProviderSpec:
+        models = list(self.models)
+        default_model = self.default_model
+        if self.type in _VIRTUAL_TYPES and not models and not default_model:
+            models, default_model = [_VIRTUAL_TYPES[self.type]], _VIRTUAL_TYPES[self.type]
         return ProviderSpec(
             name=self.name,
             type=self.type,
             base_url=self.base_url,
             api_key_env=self.api_key_env,
             api_key_optional=self.api_key_optional,
-            models=list(self.models),
-            default_model=self.default_model,
+            models=models,
+            default_model=default_model,
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+            targets=[RouteTarget(provider=t.provider, model=t.model) for t in self.targets],
+            strategy=self.strategy,
+            failure_threshold=self.failure_threshold,
+            cooldown_s=self.cooldown_s,
+            replay_dir=self.replay_dir,
+            replay_mode=self.replay_mode,
+            target=RouteTarget(provider=self.target.provider, model=self.target.model) if self.target else None,
         )
 
 
@@ -121,6 +198,24 @@ class _ProvidersConfigModel(BaseModel):
     providers: List[_ProviderSpecModel]
     model_config = ConfigDict(extra='forbid')
 
+    @model_validator(mode='after')
+    def _router_targets_exist(self):
+        by_name = {p.name: p for p in self.providers}
+        for p in self.providers:
+            for t in p.targets:
+                target = by_name.get(t.provider)
+                if target is None:
+                    raise ValueError(f"Router '{p.name}' targets unknown provider '{t.provider}'")
+                if target.type == ROUTER_TYPE:
+                    raise ValueError(f"Router '{p.name}' cannot target another router ('{t.provider}')")
+            if p.target is not None:
+                target = by_name.get(p.target.provider)
+                if target is None:
+                    raise ValueError(f"Replay provider '{p.name}' targets unknown provider '{p.target.provider}'")
+                if target.type == REPLAY_TYPE:
+                    raise ValueError(f"Replay provider '{p.name}' cannot target another replay provider")
+        return self
+
     def to_dataclass(self) -> ProvidersConfig:
         return ProvidersConfig(providers=[p.to_dataclass() for p in self.providers])
 
@@ -133,15 +228,26 @@ def _parse_with_validation(obj: dict) -> ProvidersConfig:
     return model.to_dataclass()
 
 
-def load_providers_config(path: Optional[str] = None) -> ProvidersConfig:
-    """Load providers configuration from JSON file or fallback to defaults.
+_CONFIG_LOCK = threading.Lock()
+# abs path -> ((mtime_ns, size) or None when missing, parsed config)
+_CONFIG_CACHE: Dict[str, Tuple[Optional[Tuple[int, int]], ProvidersConfig]] = {}
 
-    If the file is missing, returns embedded defaults and prints a one-line warning.
-    """
-    if path is None:
-        path = os.path.join(os.getcwd(), 'providers.json')
+
+def _default_config_path() -> str:
+    return os.path.join(os.getcwd(), 'providers.json')
+
+
+def _config_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_providers_config(path: str, exists: bool) -> ProvidersConfig:
     data = None
-    if os.path.exists(path):
+    if exists:
         try:
             with open(path, 'r') as f:
                 data = json.load(f)
@@ -156,6 +262,64 @@ def load_providers_config(path: Optional[str] = None) -> ProvidersConfig:
     return _parse_with_validation(data)
 
 
+def load_providers_config(path: Optional[str] = None) -> ProvidersConfig:
+    """Load providers configuration from JSON file or fallback to defaults.
+
+    If the file is missing, returns embedded defaults and prints a one-line warning.
+    Parsed configs are cached per path and revalidated with a single `stat`
+    (mtime_ns + size), so edits take effect on the next call without paying
+    JSON/pydantic costs on every model or sub-agent creation.
+    """
+    path = os.path.abspath(path or _default_config_path())
+    signature = _config_signature(path)
+    with _CONFIG_LOCK:
+        cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    cfg = _read_providers_config(path, signature is not None)
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE[path] = (signature, cfg)
+    if cached is not None:
+        # Config changed on disk: drop models built from the previous version
+        clear_model_registry()
+    return cfg
+
+
+def reload_providers_config(path: Optional[str] = None) -> ProvidersConfig:
+    """Discard the cached config for `path` and load it again."""
+    abs_path = os.path.abspath(path or _default_config_path())
+    with _CONFIG_LOCK:
+        had_cached = _CONFIG_CACHE.pop(abs_path, None) is not None
+    cfg = load_providers_config(abs_path)
+    if had_cached:
+        clear_model_registry()
+    return cfg
+
+
+def watch_providers_config(path: Optional[str] = None, interval_s: float = 2.0) -> threading.Event:
+    """Opt-in hot reload: revalidate the config from a daemon thread every `interval_s`.
+
+    Edits are then parsed off the request path. Returns an Event; `set()` it to stop watching.
+    Invalid edits are reported once by the watcher.
+    """
+    abs_path = os.path.abspath(path or _default_config_path())
+    stop = threading.Event()
+
+    def _poll() -> None:
+        last_error = None
+        while not stop.wait(interval_s):
+            try:
+                load_providers_config(abs_path)
+                last_error = None
+            except Exception as e:  # pragma: no cover - depends on user edits
+                if str(e) != last_error:
+                    print(f"[providers] ignoring invalid providers.json edit: {e}")
+                    last_error = str(e)
+
+    threading.Thread(target=_poll, name='providers-config-watch', daemon=True).start()
+    return stop
+
+
 def resolve_provider(provider_name: Optional[str] = None, model_name: Optional[str] = None) -> Tuple[ProviderSpec, str]:
     # Allow environment fallbacks here for symmetry with build_chat_model
     provider_name = provider_name or os.environ.get('MODEL_PROVIDER')
@@ -214,13 +378,8 @@ def _resolve_api_key(provider: ProviderSpec) -> str:
     raise RuntimeError(f"Provider '{provider.name}' requires env var {provider.api_key_env} (not set)")
 
 
-def build_chat_model(provider_name: Optional[str] = None, model_name: Optional[str] = None) -> Model:
-    provider, chosen_model = resolve_provider(
-        provider_name or os.environ.get('MODEL_PROVIDER'),
-        model_name or os.environ.get('MODEL_NAME'),
-    )
-    api_key = _resolve_api_key(provider)
-    openai_provider = OpenAIProvider(api_key=api_key, base_url=provider.base_url)
+def _create_model(provider: ProviderSpec, chosen_model: str, api_key: str) -> Model:
+    openai_provider = get_openai_provider(provider.name, provider.base_url, api_key)
 
     if provider.type == 'openai':
         model_obj: Model = OpenAIResponsesModel(chosen_model, provider=openai_provider)
@@ -228,6 +387,9 @@ def build_chat_model(provider_name: Optional[str] = None, model_name: Optional[s
         model_obj = OpenAIChatModel(chosen_model, provider=openai_provider)
     else:
         raise RuntimeError(f"Unsupported provider type '{provider.type}' for provider '{provider.name}'")
+    if provider.requests_per_minute or provider.tokens_per_minute:
+        scheduler = get_scheduler(provider.name, provider.requests_per_minute, provider.tokens_per_minute)
+        model_obj = RateLimitedModel(model_obj, scheduler)
     try:
         setattr(model_obj, '_cogent_provider_name', provider.name)
         setattr(model_obj, '_cogent_model_name', chosen_model)
@@ -236,6 +398,86 @@ def build_chat_model(provider_name: Optional[str] = None, model_name: Optional[s
     return model_obj
 
 
+def _build_router_model(provider: ProviderSpec) -> Model:
+    cfg = load_providers_config()
+    targets = []
+    for t in provider.targets:
+        # Resolve the target's model here so MODEL_NAME (meant for the router) does not leak into targets
+        target_model = cfg.get(t.provider).choose_model(t.model)
+        targets.append((f"{t.provider}:{target_model}", build_chat_model(t.provider, target_model)))
+    key = (ROUTER_TYPE, provider.name, provider.strategy, str(provider.failure_threshold),
+           str(provider.cooldown_s)) + tuple(f"{label}@{id(m)}" for label, m in targets)
+
+    def _factory() -> Model:
+        router = RoutingModel(
+            provider.name,
+            targets,
+            strategy=provider.strategy,
+            failure_threshold=provider.failure_threshold,
+            cooldown_s=provider.cooldown_s,
+        )
+        setattr(router, '_cogent_provider_name', provider.name)
+        setattr(router, '_cogent_model_name', ROUTER_MODEL)
+        return router
+
+    return get_model(key, _factory)
+
+
+def _build_replay_model(provider: ProviderSpec) -> Model:
+    upstream = None
+    if provider.target is not None:
+        target_spec = load_providers_config().get(provider.target.provider)
+        upstream = build_chat_model(target_spec.name, target_spec.choose_model(provider.target.model))
+    # Relative replay dirs are resolved against the cwd, like providers.json itself
+    replay_dir = os.path.abspath(provider.replay_dir)
+    key = (REPLAY_TYPE, provider.name, provider.replay_mode, replay_dir, str(id(upstream)))
+
+    def _factory() -> Model:
+        model_obj = ReplayModel(replay_dir, mode=provider.replay_mode, upstream=upstream, name=provider.name)
+        setattr(model_obj, '_cogent_provider_name', provider.name)
+        setattr(model_obj, '_cogent_model_name', REPLAY_MODEL)
+        return model_obj
+
+    return get_model(key, _factory)
+
+
+def build_chat_model(provider_name: Optional[str] = None, model_name: Optional[str] = None) -> Model:
+    """Return a (cached) model for the resolved provider/model pair.
+
+    Model objects are stateless between requests, so one instance per
+    (provider, type, model, base_url, api_key) is shared by the main agent and
+    all sub-agents, together with its provider and pooled HTTP client.
+    """
+    provider, chosen_model = resolve_provider(
+        provider_name or os.environ.get('MODEL_PROVIDER'),
+        model_name or os.environ.get('MODEL_NAME'),
+    )
+    if provider.type == ROUTER_TYPE:
+        # Health and latency stats live on the router instance, so it is shared like any other model
+        return _build_router_model(provider)
+    if provider.type == REPLAY_TYPE:
+        return _build_replay_model(provider)
+    api_key = _resolve_api_key(provider)
+    key = (provider.name, provider.type, chosen_model, provider.base_url, api_key,
+           str(provider.requests_per_minute), str(provider.tokens_per_minute))
+    return get_model(key, lambda: _create_model(provider, chosen_model, api_key))
+
+
+
+def provider_stats() -> Dict[str, Any]:
+    """Rate-limit queues and router target health, for /stats and the session transcript.
+
+    Empty when no provider sets limits and no router is in use.
+    """
+    stats: Dict[str, Any] = {}
+    schedulers = scheduler_metrics()
+    if schedulers:
+        stats['rate_limits'] = schedulers
+    routers = router_metrics()
+    if routers:
+        stats['routers'] = routers
+    return stats
+
 
 def list_available_models() -> list[tuple[str, str]]:
     cfg = load_providers_config()
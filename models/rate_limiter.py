@@ -0,0 +1,212 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from pydantic_ai.models.wrapper import WrapperModel
+
+from models.token_estimator import get_token_estimator
+
+# Lower value = served first
+PRIORITY_MAIN = 0
+PRIORITY_SUBAGENT = 10
+
+_request_priority: contextvars.ContextVar[int] = contextvars.ContextVar('cogent_request_priority', default=PRIORITY_MAIN)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Run model requests issued inside this block (and tasks spawned from it) at `priority`."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def current_request_priority() -> int:
+    return _request_priority.get()
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute / 60` per second.
+
+    The level may go negative when actual usage exceeds what was reserved
+    (e.g. output tokens); later requests then wait for the debt to refill.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate_per_s = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # Requests larger than the whole bucket would never fit; let them through at full bucket
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate_per_s
+
+    def consume(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+
+class ProviderScheduler:
+    """Queue model requests for one provider and release them within its rate limits.
+
+    Waiters are served strictly by (priority, arrival order), so a queued
+    main-agent request overtakes queued sub-agent requests but never starves
+    behind a later one.
+    """
+
+    def __init__(self, name: str, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._queue: List[Tuple[int, int, int, asyncio.Future, float]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.granted = 0
+        self.max_queue_depth = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for entry in self._queue if not entry[3].done())
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        wait = 0.0
+        if self._requests is not None:
+            wait = max(wait, self._requests.wait_time(1, now))
+        if self._tokens is not None and tokens:
+            wait = max(wait, self._tokens.wait_time(tokens, now))
+        return wait
+
+    def _pump(self) -> None:
+        self._timer = None
+        while self._queue:
+            _, _, tokens, fut, enqueued = self._queue[0]
+            if fut.done() or fut.get_loop().is_closed():  # cancelled while waiting
+                heapq.heappop(self._queue)
+                continue
+            now = time.monotonic()
+            wait = self._wait_time(tokens, now)
+            if wait > 0:
+                self._timer_loop = fut.get_loop()
+                self._timer = self._timer_loop.call_later(wait, self._pump)
+                return
+            heapq.heappop(self._queue)
+            if self._requests is not None:
+                self._requests.consume(1, now)
+            if self._tokens is not None and tokens:
+                self._tokens.consume(tokens, now)
+            waited = now - enqueued
+            self.granted += 1
+            self.total_wait_s += waited
+            self.max_wait_s = max(self.max_wait_s, waited)
+            fut.set_result(waited)
+
+    async def acquire(self, tokens: int = 0, priority: Optional[int] = None) -> float:
+        """Wait for a request slot (and `tokens` of budget); returns seconds spent queued."""
+        if priority is None:
+            priority = current_request_priority()
+        loop = asyncio.get_running_loop()
+        if self._timer is not None and self._timer_loop is not loop:
+            # Timer left behind by a previous event loop (e.g. an earlier asyncio.run)
+            self._timer.cancel()
+            self._timer = None
+        fut = loop.create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), tokens, fut, time.monotonic()))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        if self._timer is None:
+            self._pump()
+        return await fut
+
+    def settle(self, reserved_tokens: int, actual_tokens: int) -> None:
+        """Charge the difference between reserved and provider-reported tokens."""
+        if self._tokens is not None and actual_tokens > reserved_tokens:
+            self._tokens.consume(actual_tokens - reserved_tokens, time.monotonic())
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'provider': self.name,
+            'requests_per_minute': self.requests_per_minute,
+            'tokens_per_minute': self.tokens_per_minute,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'granted': self.granted,
+            'avg_wait_s': round(self.total_wait_s / self.granted, 3) if self.granted else 0.0,
+            'max_wait_s': round(self.max_wait_s, 3),
+        }
+
+
+_SCHEDULERS: Dict[str, ProviderScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(name: str, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]) -> ProviderScheduler:
+    """One scheduler per provider, shared by every model built for it."""
+    with _SCHEDULERS_LOCK:
+        sched = _SCHEDULERS.get(name)
+        if (sched is None or sched.requests_per_minute != requests_per_minute
+                or sched.tokens_per_minute != tokens_per_minute):
+            sched = ProviderScheduler(name, requests_per_minute, tokens_per_minute)
+            _SCHEDULERS[name] = sched
+        return sched
+
+
+def scheduler_metrics() -> List[Dict[str, Any]]:
+    with _SCHEDULERS_LOCK:
+        return [s.metrics() for s in _SCHEDULERS.values()]
+
+
+class RateLimitedModel(WrapperModel):
+    """Model wrapper that waits for its provider's scheduler before every request."""
+
+    def __init__(self, wrapped, scheduler: ProviderScheduler):
+        super().__init__(wrapped)
+        self.scheduler = scheduler
+
+    def _reserve(self, messages) -> int:
+        if self.scheduler.tokens_per_minute is None:
+            return 0
+        return get_token_estimator().count_messages(messages)
+
+    def _settle(self, reserved: int, usage: Any) -> None:
+        if usage is None:
+            return
+        actual = (getattr(usage, 'input_tokens', 0) or 0) + (getattr(usage, 'output_tokens', 0) or 0)
+        self.scheduler.settle(reserved, actual)
+
+    async def request(self, messages, model_settings, model_request_parameters):
+        reserved = self._reserve(messages)
+        await self.scheduler.acquire(reserved)
+        response = await self.wrapped.request(messages, model_settings, model_request_parameters)
+        self._settle(reserved, getattr(response, 'usage', None))
+        return response
+
+    @asynccontextmanager
+    async def request_stream(self, messages, model_settings, model_request_parameters,
+                             run_context=None) -> AsyncIterator[Any]:
+        reserved = self._reserve(messages)
+        await self.scheduler.acquire(reserved)
+        async with self.wrapped.request_stream(messages, model_settings, model_request_parameters,
+                                               run_context) as stream:
+            yield stream
+        self._settle(reserved, stream.usage() if callable(getattr(stream, 'usage', None)) else None)
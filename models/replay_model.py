@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from pydantic_ai.messages import ModelMessagesTypeAdapter, ModelResponse
+from pydantic_ai.models import Model, StreamedResponse
+
+REPLAY_MODES = ('replay', 'record', 'auto')
+
+# Message- and part-level fields that differ between otherwise identical conversations
+# (clock, ids, provider metadata). Tool args and content are hashed as-is.
+_VOLATILE_KEYS = frozenset({
+    'timestamp', 'tool_call_id', 'id', 'run_id', 'conversation_id', 'provider_response_id',
+    'provider_details', 'provider_name', 'provider_url', 'model_name', 'usage', 'finish_reason',
+    'metadata',
+})
+
+
+# The system prompt names the absolute cwd; recordings must replay from any checkout
+_CWD_LINE = re.compile(r'^(The current working directory is: ).*$', re.MULTILINE)
+
+
+def _strip_volatile(d: dict) -> dict:
+    return {k: v for k, v in d.items() if k not in _VOLATILE_KEYS}
+
+
+def _normalize_part(part: dict) -> dict:
+    part = _strip_volatile(part)
+    if part.get('part_kind') == 'system-prompt' and isinstance(part.get('content'), str):
+        part['content'] = _CWD_LINE.sub(r'\1<cwd>', part['content'])
+    return part
+
+
+def _normalize(messages: list) -> list:
+    out = []
+    for message in messages:
+        message = _strip_volatile(message)
+        message['parts'] = [_normalize_part(p) for p in message.get('parts', [])]
+        out.append(message)
+    return out
+
+
+def request_key(messages: list, model_request_parameters: Any = None) -> str:
+    """Stable hash of a model request: message contents plus the offered tool names.
+
+    The cwd line of the system prompt is masked, so the key does not depend on
+    where the checkout lives.
+    """
+    payload = {'messages': _normalize(ModelMessagesTypeAdapter.dump_python(messages, mode='json'))}
+    tools = getattr(model_request_parameters, 'function_tools', None) or []
+    payload['tools'] = sorted(getattr(t, 'name', str(t)) for t in tools)
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class _ReplayStreamedResponse(StreamedResponse):
+    """A recorded response re-emitted as a stream, one event per part."""
+
+    _response: ModelResponse = field(default=None)
+    _model_name: str = 'replay'
+
+    async def _get_event_iterator(self) -> AsyncIterator[Any]:
+        if self._response.usage is not None:
+            self._usage = self._response.usage
+        for i, part in enumerate(self._response.parts):
+            yield self._parts_manager.handle_part(vendor_part_id=i, part=part)
+
+    async def close_stream(self) -> None:
+        pass
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    @property
+    def provider_name(self) -> None:
+        return None
+
+    @property
+    def provider_url(self) -> None:
+        return None
+
+    @property
+    def timestamp(self) -> datetime:
+        return self._response.timestamp
+
+
+class ReplayModel(Model):
+    """Deterministic stand-in model backed by recorded request/response pairs on disk.
+
+    Modes:
+    - `replay`: serve only recorded responses; unknown requests raise RuntimeError (no network).
+    - `record`: always call the upstream model and (over)write the recording.
+    - `auto`: replay when a recording exists, otherwise call upstream and record.
+
+    Each pair is stored as `<replay_dir>/<sha256>.json`, keyed by `request_key()`.
+    Streamed requests share the recordings: a recorded response is replayed
+    as a stream, and a streamed upstream response is saved once complete.
+    """
+
+    def __init__(self, replay_dir: str, mode: str = 'replay', upstream: Optional[Model] = None,
+                 name: str = 'replay'):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unsupported replay mode '{mode}'")
+        if mode != 'replay' and upstream is None:
+            raise ValueError(f"Replay mode '{mode}' requires an upstream model to record from")
+        super().__init__(profile=upstream.profile if upstream is not None else None)
+        self.replay_dir = Path(replay_dir)
+        self.mode = mode
+        self.upstream = upstream
+        self._name = name
+        self.hits = 0
+        self.recorded = 0
+
+    @property
+    def model_name(self) -> str:
+        return f'replay:{self._name}'
+
+    @property
+    def system(self) -> str:
+        return self.upstream.system if self.upstream is not None else 'replay'
+
+    def _path(self, key: str) -> Path:
+        return self.replay_dir / f'{key}.json'
+
+    def _load(self, path: Path) -> ModelResponse:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return ModelMessagesTypeAdapter.validate_python([data['response']])[0]
+
+    def _save(self, path: Path, key: str, response: ModelResponse) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'key': key,
+            'response': ModelMessagesTypeAdapter.dump_python([response], mode='json')[0],
+        }
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def _missing(self, key: str) -> RuntimeError:
+        return RuntimeError(
+            f"No recorded response for request {key[:12]} in '{self.replay_dir}'. "
+            "Record it first with replay_mode 'record' or 'auto'."
+        )
+
+    async def request(self, messages, model_settings, model_request_parameters) -> ModelResponse:
+        key = request_key(messages, model_request_parameters)
+        path = self._path(key)
+        if self.mode != 'record' and path.exists():
+            self.hits += 1
+            return self._load(path)
+        if self.mode == 'replay':
+            raise self._missing(key)
+        response = await self.upstream.request(messages, model_settings, model_request_parameters)
+        self._save(path, key, response)
+        self.recorded += 1
+        return response
+
+    @asynccontextmanager
+    async def request_stream(self, messages, model_settings, model_request_parameters,
+                             run_context=None) -> AsyncIterator[StreamedResponse]:
+        key = request_key(messages, model_request_parameters)
+        path = self._path(key)
+        if self.mode != 'record' and path.exists():
+            self.hits += 1
+            yield _ReplayStreamedResponse(model_request_parameters=model_request_parameters,
+                                          _response=self._load(path), _model_name=self.model_name)
+            return
+        if self.mode == 'replay':
+            raise self._missing(key)
+        async with self.upstream.request_stream(messages, model_settings, model_request_parameters,
+                                                run_context) as stream:
+            yield stream
+        self._save(path, key, stream.get())
+        self.recorded += 1
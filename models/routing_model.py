@@ -0,0 +1,224 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from pydantic_ai.exceptions import ModelAPIError, ModelHTTPError
+from pydantic_ai.models import Model
+from pydantic_ai.models.wrapper import WrapperModel
+
+ROUTING_STRATEGIES = ('latency', 'failover')
+
+# Weight of the newest sample in the latency moving average
+_EWMA_ALPHA = 0.3
+_ERROR_WINDOW = 20
+
+
+@dataclass
+class EndpointStats:
+    """Rolling health of one routing target."""
+
+    label: str
+    latency_ewma_s: Optional[float] = None
+    requests: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    in_flight: int = 0
+    consecutive_failures: int = 0
+    open_until: float = 0.0  # circuit breaker: skip the endpoint until this monotonic time
+    recent: Deque[bool] = field(default_factory=lambda: deque(maxlen=_ERROR_WINDOW))
+
+    @property
+    def error_rate(self) -> float:
+        if not self.recent:
+            return 0.0
+        return sum(1 for ok in self.recent if not ok) / len(self.recent)
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+    def score(self) -> float:
+        """Lower is better: expected latency inflated by load and recent errors.
+
+        Endpoints without samples score 0 so they get probed once.
+        """
+        if self.latency_ewma_s is None:
+            return 0.0
+        return self.latency_ewma_s * (1 + self.in_flight) * (1 + 4 * self.error_rate)
+
+    def record_success(self, latency_s: float) -> None:
+        self.requests += 1
+        self.recent.append(True)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        if self.latency_ewma_s is None:
+            self.latency_ewma_s = latency_s
+        else:
+            self.latency_ewma_s = _EWMA_ALPHA * latency_s + (1 - _EWMA_ALPHA) * self.latency_ewma_s
+
+    def record_failure(self, now: float, failure_threshold: int, cooldown_s: float,
+                       rate_limited: bool = False, retry_after_s: Optional[float] = None) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.recent.append(False)
+        self.consecutive_failures += 1
+        if rate_limited:
+            self.rate_limited += 1
+            # A 429 means "saturated right now": back off immediately
+            self.open_until = now + (retry_after_s if retry_after_s is not None else cooldown_s)
+        elif self.consecutive_failures >= failure_threshold:
+            self.open_until = now + cooldown_s
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'target': self.label,
+            'latency_ewma_s': round(self.latency_ewma_s, 3) if self.latency_ewma_s is not None else None,
+            'requests': self.requests,
+            'failures': self.failures,
+            'rate_limited': self.rate_limited,
+            'error_rate': round(self.error_rate, 3),
+            'in_flight': self.in_flight,
+            'circuit_open': self.is_open(time.monotonic()),
+        }
+
+
+def _retry_after_seconds(exc: ModelHTTPError) -> Optional[float]:
+    headers = getattr(exc, 'headers', None) or {}
+    value = headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _classify(exc: BaseException) -> Tuple[bool, bool]:
+    """Return (should_fail_over, rate_limited) for a request error.
+
+    Rate limits, server errors, timeouts and connection failures are
+    endpoint problems; other 4xx responses are problems with the request
+    itself and would fail on every target, so they are raised unchanged.
+    """
+    if isinstance(exc, ModelHTTPError):
+        if exc.status_code == 429:
+            return True, True
+        return exc.status_code >= 500 or exc.status_code in (408, 409), False
+    if isinstance(exc, (ModelAPIError, asyncio.TimeoutError, ConnectionError, OSError)):
+        return True, False
+    # httpx / openai transport errors surface under several class names
+    return type(exc).__name__.endswith(('ConnectError', 'ConnectionError', 'TimeoutException', 'Timeout')), False
+
+
+# Keyed by id(): pydantic-ai models are dataclasses and not hashable
+_ROUTERS: 'weakref.WeakValueDictionary[int, RoutingModel]' = weakref.WeakValueDictionary()
+_ROUTERS_LOCK = threading.Lock()
+
+
+def router_metrics() -> List[Dict[str, Any]]:
+    """Per-target stats of every live router, sorted by router name."""
+    with _ROUTERS_LOCK:
+        routers = list(_ROUTERS.values())
+    return [{'router': r.router_name, 'strategy': r.strategy, 'targets': r.endpoint_stats()}
+            for r in sorted(routers, key=lambda r: r.router_name)]
+
+
+class RoutingModel(WrapperModel):
+    """Send each request to the healthiest target, failing over on endpoint errors.
+
+    `latency` strategy: order targets by `EndpointStats.score()` (rolling latency,
+    in-flight load and error rate). `failover` strategy: keep configured order.
+    Targets whose circuit is open (after a 429 or `failure_threshold`
+    consecutive failures) are tried last, once every healthy target has failed.
+    Streamed requests only fail over while opening the stream.
+    """
+
+    def __init__(self, name: str, targets: List[Tuple[str, Model]], strategy: str = 'latency',
+                 failure_threshold: int = 3, cooldown_s: float = 30.0):
+        if not targets:
+            raise ValueError(f"Router '{name}' has no targets")
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"Unknown routing strategy '{strategy}'")
+        super().__init__(targets[0][1])
+        self.router_name = name
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self._targets = [(model, EndpointStats(label=label)) for label, model in targets]
+        with _ROUTERS_LOCK:
+            _ROUTERS[id(self)] = self
+
+    @property
+    def model_name(self) -> str:
+        return f'router:{self.router_name}'
+
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        return [stats.snapshot() for _, stats in self._targets]
+
+    def _candidates(self) -> List[Tuple[Model, EndpointStats]]:
+        now = time.monotonic()
+        closed = [t for t in self._targets if not t[1].is_open(now)]
+        opened = [t for t in self._targets if t[1].is_open(now)]
+        if self.strategy == 'latency':
+            # sorted() is stable, so ties keep the configured order
+            closed = sorted(closed, key=lambda t: t[1].score())
+        opened.sort(key=lambda t: t[1].open_until)
+        return closed + opened
+
+    def _on_failure(self, stats: EndpointStats, exc: BaseException) -> bool:
+        fail_over, rate_limited = _classify(exc)
+        if not fail_over:
+            return False
+        retry_after = _retry_after_seconds(exc) if isinstance(exc, ModelHTTPError) else None
+        stats.record_failure(time.monotonic(), self.failure_threshold, self.cooldown_s,
+                             rate_limited=rate_limited, retry_after_s=retry_after)
+        return True
+
+    async def request(self, messages, model_settings, model_request_parameters):
+        last_exc: Optional[BaseException] = None
+        for model, stats in self._candidates():
+            started = time.perf_counter()
+            stats.in_flight += 1
+            try:
+                response = await model.request(messages, model_settings, model_request_parameters)
+            except Exception as e:
+                if not self._on_failure(stats, e):
+                    raise
+                last_exc = e
+                continue
+            finally:
+                stats.in_flight -= 1
+            stats.record_success(time.perf_counter() - started)
+            return response
+        assert last_exc is not None
+        raise last_exc
+
+    @asynccontextmanager
+    async def request_stream(self, messages, model_settings, model_request_parameters,
+                             run_context=None) -> AsyncIterator[Any]:
+        last_exc: Optional[BaseException] = None
+        for model, stats in self._candidates():
+            started = time.perf_counter()
+            stats.in_flight += 1
+            try:
+                async with AsyncExitStack() as stack:
+                    try:
+                        stream = await stack.enter_async_context(
+                            model.request_stream(messages, model_settings, model_request_parameters, run_context))
+                    except Exception as e:
+                        # Only failures to open count against the target: once tokens were
+                        # handed to the caller the stream cannot be replayed elsewhere, and
+                        # errors raised by the caller while consuming it are not the target's
+                        if not self._on_failure(stats, e):
+                            raise
+                        last_exc = e
+                        continue
+                    yield stream
+                stats.record_success(time.perf_counter() - started)
+                return
+            finally:
+                stats.in_flight -= 1
+        assert last_exc is not None
+        raise last_exc
@@ -6,6 +6,10 @@ from pathlib import Path
 from typing import Any, List, Dict
 
 
+# Provider-reported prompt cache counters (pydantic-ai RequestUsage / RunUsage)
+_CACHE_USAGE_ATTRS = ('cache_read_tokens', 'cache_write_tokens')
+
+
 class SessionRecorder:
     """Persist a single chat session transcript to a JSON file.
 
@@ -24,11 +28,36 @@ class SessionRecorder:
         self._base = Path(base_cwd) / '.cogent' / 'sessions'
         self._base.mkdir(parents=True, exist_ok=True)
         self._path = self._base / f'{self.session_id}.json'
+        self._turns: List[Dict[str, Any]] = []
 
     @property
     def path(self) -> Path:  # exposed for tests
         return self._path
 
+    def record_turn(self, estimated_input_tokens: int | None, usage: Any = None, elapsed_s: float | None = None,
+                    first_token_s: float | None = None,
+                    subagent_usage: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        """Append per-turn telemetry (local estimate vs. provider-reported usage).
+
+        Written out with the next `record()` call under the `turns` key.
+        """
+        turn: Dict[str, Any] = {
+            'turn': len(self._turns) + 1,
+            'estimated_input_tokens': estimated_input_tokens,
+        }
+        if usage is not None:
+            for attr in ('requests', 'tool_calls', 'input_tokens', 'output_tokens') + _CACHE_USAGE_ATTRS:
+                if hasattr(usage, attr):
+                    turn[attr] = getattr(usage, attr)
+        if elapsed_s is not None:
+            turn['elapsed_s'] = round(elapsed_s, 3)
+        if first_token_s is not None:
+            turn['first_token_s'] = round(first_token_s, 3)
+        if subagent_usage:
+            turn['subagents'] = subagent_usage
+        self._turns.append(turn)
+        return turn
+
     def _flatten_model_request(self, obj: Any) -> List[Dict[str, Any]]:
         parts_out: List[Dict[str, Any]] = []
         parts = getattr(obj, 'parts', None)
@@ -81,6 +110,10 @@ class SessionRecorder:
                     for attr in ('input_tokens', 'output_tokens'):
                         if hasattr(usage, attr):
                             u[attr] = getattr(usage, attr)
+                    # Prompt-cache counters are only recorded when the provider reports them
+                    for attr in _CACHE_USAGE_ATTRS:
+                        if getattr(usage, attr, 0):
+                            u[attr] = getattr(usage, attr)
                     if u:
                         flattened[0]['usage'] = u
                 return flattened
@@ -92,18 +125,23 @@ class SessionRecorder:
             'content': content,
         }]
 
-    def record(self, messages: List[Any]) -> None:
+    def record(self, messages: List[Any], tool_stats: Dict[str, Any] | None = None,
+               provider_stats: Dict[str, Any] | None = None) -> None:
         flat_messages: List[Dict[str, Any]] = []
         for m in messages:
             flat_messages.extend(self._serialize_message(m))
         # Derive aggregate token counts
         total_input = 0
         total_output = 0
+        total_cache_read = 0
+        total_cache_write = 0
         for fm in flat_messages:
             usage = fm.get('usage') if isinstance(fm, dict) else None
             if usage:
                 total_input += usage.get('input_tokens', 0)
                 total_output += usage.get('output_tokens', 0)
+                total_cache_read += usage.get('cache_read_tokens', 0)
+                total_cache_write += usage.get('cache_write_tokens', 0)
         data = {
             'schema_version': 1,
             'session_id': self.session_id,
@@ -113,8 +151,16 @@ class SessionRecorder:
             'entry_count': len(flat_messages),  # flattened entries
             'total_input_tokens': total_input,
             'total_output_tokens': total_output,
+            'total_cache_read_tokens': total_cache_read,
+            'total_cache_write_tokens': total_cache_write,
             'messages': flat_messages,
         }
+        if self._turns:
+            data['turns'] = self._turns
+        if tool_stats:
+            data['tool_stats'] = tool_stats
+        if provider_stats:
+            data['provider_stats'] = provider_stats
         tmp_path = self._path.with_suffix('.json.tmp')
         with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+
+class TaskRequest(BaseModel):
+    """One sub-agent run requested through the task_batch tool.
+
+    Example:
+        {
+            "description": "Find auth handlers",
+            "prompt": "Locate every HTTP handler that checks credentials and report file:line",
+            "subagent_type": "general-purpose"
+        }
+    """
+
+    description: str = Field(..., description="A short (3-5 word) description of the task")
+    prompt: str = Field(..., description="The detailed task for the sub-agent to perform autonomously")
+    subagent_type: str = Field("general-purpose", description="The type of specialized agent to use for this task")
+
+    model_config = {
+        "extra": "forbid"
+    }
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from models.todo_item import TodoState
+
+
+class TodoPatch(BaseModel):
+    """A change to one todo item, addressed by id, sent through todo_write's `updates`.
+
+    Fields left out keep their current value. An unknown id creates a new item
+    (a description is then required; the state defaults to pending).
+
+    Example:
+        {
+            "id": 2,
+            "state": "completed"
+        }
+    """
+
+    id: int = Field(..., description="Identifier of the todo item to change or create")
+    description: Optional[str] = Field(None, description="New description (required when creating an item)")
+    state: Optional[TodoState] = Field(None, description="New state of the todo item")
+
+    model_config = {
+        "extra": "forbid"
+    }
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from models.todo_item import TodoItem, TodoState
+from models.todo_patch import TodoPatch
+
+
+class TodoStore:
+    """The agent's TODO list for one session, kept in memory and mirrored to disk.
+
+    Items are keyed by id and keep their insertion order. Every mutation
+    returns the list of changes it made (one line per item) so the tool reply
+    only carries the diff. When a `path` is given, the list is loaded from it
+    on construction and rewritten atomically after each change, which makes
+    the state inspectable and resumable
+    (`.cogent/sessions/<session_id>.todos.json`).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = Path(path) if path is not None else None
+        self._items: Dict[int, TodoItem] = {}
+        self._lock = threading.Lock()
+        if self._path is not None and self._path.exists():
+            self._load()
+
+    @classmethod
+    def for_session(cls, base_cwd: str | os.PathLike[str], session_id: str,
+                    resume_from: Optional[str] = None) -> "TodoStore":
+        """The store of `session_id`, optionally starting from the list an earlier session left.
+
+        Raises FileNotFoundError when `resume_from` has no saved list.
+        """
+        sessions = Path(base_cwd) / '.cogent' / 'sessions'
+        store = cls(sessions / f'{session_id}.todos.json')
+        if resume_from is not None:
+            earlier = sessions / f'{resume_from}.todos.json'
+            if not earlier.exists():
+                raise FileNotFoundError(f"no TODO list saved for session '{resume_from}' ({earlier})")
+            store.replace_all(cls(earlier).items())
+        return store
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def items(self) -> List[TodoItem]:
+        with self._lock:
+            return list(self._items.values())
+
+    def counts(self) -> Dict[str, int]:
+        out = {s.value: 0 for s in TodoState}
+        for item in self.items():
+            out[item.state.value] += 1
+        return out
+
+    def replace_all(self, todos: Iterable[TodoItem]) -> List[str]:
+        """Make the list exactly `todos`; returns the changes relative to the current list."""
+        new = {t.id: t for t in todos}
+        with self._lock:
+            changes = [f"- [{i}] {old.description}" for i, old in self._items.items() if i not in new]
+            for i, item in new.items():
+                changes.extend(self._diff(self._items.get(i), item))
+            self._items = new
+            self._save(changes)
+        return changes
+
+    def patch(self, updates: Iterable[TodoPatch] = (), remove: Iterable[int] = ()) -> List[str]:
+        """Apply per-id updates and removals; raises ValueError (changing nothing) on a bad patch."""
+        with self._lock:
+            items = dict(self._items)
+            changes: List[str] = []
+            for i in remove:
+                old = items.pop(i, None)
+                if old is None:
+                    raise ValueError(f"no todo with id {i}")
+                changes.append(f"- [{i}] {old.description}")
+            for p in updates:
+                old = items.get(p.id)
+                if old is None:
+                    if not p.description:
+                        raise ValueError(f"todo {p.id} does not exist; a description is required to create it")
+                    item = TodoItem(id=p.id, description=p.description, state=p.state or TodoState.pending)
+                else:
+                    item = old.model_copy(update={
+                        'description': p.description if p.description is not None else old.description,
+                        'state': p.state if p.state is not None else old.state,
+                    })
+                changes.extend(self._diff(old, item))
+                items[p.id] = item
+            self._items = items
+            self._save(changes)
+        return changes
+
+    @staticmethod
+    def _diff(old: Optional[TodoItem], new: TodoItem) -> List[str]:
+        if old is None:
+            return [f"+ [{new.id}] {new.state.value}: {new.description}"]
+        changes = []
+        if old.description != new.description:
+            changes.append(f"~ [{new.id}] {old.description!r} -> {new.description!r}")
+        if old.state != new.state:
+            changes.append(f"~ [{new.id}] {old.state.value} -> {new.state.value}: {new.description}")
+        return changes
+
+    def _load(self) -> None:
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._items = {t.id: t for t in (TodoItem(**d) for d in data.get('todos', []))}
+        except (OSError, ValueError):
+            # Unreadable or corrupt file: start empty rather than failing the session
+            self._items = {}
+
+    def _save(self, changes: List[str]) -> None:
+        if self._path is None or not changes:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'todos': [t.model_dump(mode='json') for t in self._items.values()]}
+        tmp_path = self._path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path)
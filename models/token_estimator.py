@@ -0,0 +1,183 @@
+import json
+import math
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Protocol
+
+# Environment override for tokenizer selection: 'auto' (default), 'tiktoken' or 'heuristic'.
+TOKENIZER_ENV = 'COGENT_TOKENIZER'
+
+# Approximate framing overhead added by chat APIs around each message / part.
+MESSAGE_OVERHEAD_TOKENS = 4
+PART_OVERHEAD_TOKENS = 3
+
+_DEFAULT_ENCODING = 'o200k_base'
+_MEMO_MAX_ENTRIES = 8192
+
+
+class Tokenizer(Protocol):
+    name: str
+
+    def count(self, text: str) -> int:
+        ...
+
+
+class HeuristicTokenizer:
+    """Dependency-free estimate calibrated against BPE tokenizers on code and prose.
+
+    Words are charged one token per ~4 characters, every punctuation character
+    counts as its own token and runs of whitespace beyond a single space cost
+    one token per ~4 characters (indentation in code).
+    """
+
+    name = 'heuristic'
+
+    _WORD = re.compile(r"[A-Za-z0-9_]+|[^\sA-Za-z0-9_]|\s{2,}")
+    CHARS_PER_TOKEN = 4.0
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        total = 0
+        for piece in self._WORD.findall(text):
+            first = piece[0]
+            if first.isalnum() or first == '_' or first.isspace():
+                total += max(1, math.ceil(len(piece) / self.CHARS_PER_TOKEN))
+            else:
+                total += 1
+        return total
+
+
+class TiktokenTokenizer:
+    """Exact counts via `tiktoken` when it is installed and its encoding can be loaded."""
+
+    def __init__(self, model_name: Optional[str] = None):
+        import tiktoken  # optional dependency
+
+        encoding = None
+        if model_name:
+            try:
+                encoding = tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                encoding = None
+        if encoding is None:
+            encoding = tiktoken.get_encoding(_DEFAULT_ENCODING)
+        self._encoding = encoding
+        self.name = f'tiktoken:{encoding.name}'
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def get_tokenizer(model_name: Optional[str] = None, kind: Optional[str] = None) -> Tokenizer:
+    """Return the best available tokenizer.
+
+    `kind` (or the COGENT_TOKENIZER env var) may force 'tiktoken' or 'heuristic'.
+    In 'auto' mode tiktoken is tried first and any failure (not installed, encoding
+    file not cached and no network) falls back to the heuristic.
+    """
+    kind = (kind or os.environ.get(TOKENIZER_ENV) or 'auto').lower()
+    if kind == 'heuristic':
+        return HeuristicTokenizer()
+    try:
+        return TiktokenTokenizer(model_name)
+    except Exception:
+        if kind == 'tiktoken':
+            raise
+        return HeuristicTokenizer()
+
+
+def _stringify(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return '\n'.join(_stringify(v) for v in value)
+    try:
+        return json.dumps(value, ensure_ascii=False, default=str)
+    except Exception:
+        return str(value)
+
+
+def _part_text(part: Any) -> str:
+    p_type = type(part).__name__.lower()
+    if p_type.endswith('toolcallpart'):
+        return f"{getattr(part, 'tool_name', '')} {_stringify(getattr(part, 'args', None))}"
+    if p_type.endswith('toolreturnpart'):
+        return f"{getattr(part, 'tool_name', '')} {_stringify(getattr(part, 'content', None))}"
+    return _stringify(getattr(part, 'content', None))
+
+
+class TokenEstimator:
+    """Local token counting for prompts and message histories.
+
+    Counts are memoized per text (bounded LRU), so re-estimating a growing
+    history only pays for the newly appended parts.
+    """
+
+    def __init__(self, tokenizer: Optional[Tokenizer] = None, max_entries: int = _MEMO_MAX_ENTRIES):
+        self.tokenizer = tokenizer or get_tokenizer()
+        self._memo: 'OrderedDict[str, int]' = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def count_text(self, text: str) -> int:
+        if not text:
+            return 0
+        cached = self._memo.get(text)
+        if cached is not None:
+            self._memo.move_to_end(text)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        n = self.tokenizer.count(text)
+        self._memo[text] = n
+        if len(self._memo) > self._max_entries:
+            self._memo.popitem(last=False)
+        return n
+
+    def count_message(self, message: Any) -> int:
+        parts = getattr(message, 'parts', None)
+        if parts is None:
+            # Plain objects with a `content` attribute (tests / fallbacks)
+            return MESSAGE_OVERHEAD_TOKENS + self.count_text(_stringify(getattr(message, 'content', message)))
+        total = MESSAGE_OVERHEAD_TOKENS
+        for part in parts:
+            total += PART_OVERHEAD_TOKENS + self.count_text(_part_text(part))
+        return total
+
+    def count_messages(self, messages: Iterable[Any]) -> int:
+        return sum(self.count_message(m) for m in messages)
+
+    def estimate_prompt(self, history: List[Any], user_text: str = '', system_prompts: Iterable[str] = ()) -> int:
+        """Estimate input tokens for the next request.
+
+        System prompts only need to be passed for the first turn; afterwards
+        they are already part of `history`.
+        """
+        total = self.count_messages(history)
+        for sp in system_prompts:
+            total += PART_OVERHEAD_TOKENS + self.count_text(sp)
+        if user_text:
+            total += MESSAGE_OVERHEAD_TOKENS + PART_OVERHEAD_TOKENS + self.count_text(user_text)
+        return total
+
+
+_DEFAULT_ESTIMATOR: Optional[TokenEstimator] = None
+
+
+def get_token_estimator() -> TokenEstimator:
+    """Process-wide estimator sharing one memo table."""
+    global _DEFAULT_ESTIMATOR
+    if _DEFAULT_ESTIMATOR is None:
+        _DEFAULT_ESTIMATOR = TokenEstimator()
+    return _DEFAULT_ESTIMATOR
+
+
+def estimate_tokens(text: str) -> int:
+    return get_token_estimator().count_text(text)
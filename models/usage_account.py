@@ -0,0 +1,42 @@
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict
+
+
+@dataclass
+class UsageAccount:
+    """Resources consumed by sub-agent runs, merged into the spawning agent's deps."""
+
+    runs: int = 0
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    tool_calls: int = 0
+    wall_time_s: float = 0.0
+
+    def add_run(self, usage: Any = None, wall_time_s: float = 0.0) -> None:
+        """Account one finished (or failed) run; `usage` is a pydantic-ai RunUsage or None."""
+        self.runs += 1
+        self.wall_time_s += wall_time_s
+        if usage is None:
+            return
+        for name in ('requests', 'input_tokens', 'output_tokens', 'cache_read_tokens',
+                     'cache_write_tokens', 'tool_calls'):
+            setattr(self, name, getattr(self, name) + (getattr(usage, name, 0) or 0))
+
+    def merge(self, other: 'UsageAccount') -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    def since(self, earlier: 'UsageAccount') -> 'UsageAccount':
+        """Usage accumulated after the `earlier` snapshot was taken."""
+        return UsageAccount(**{f.name: getattr(self, f.name) - getattr(earlier, f.name) for f in fields(self)})
+
+    def snapshot(self) -> 'UsageAccount':
+        return UsageAccount(**asdict(self))
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['wall_time_s'] = round(self.wall_time_s, 3)
+        return data
@@ -1,9 +1,23 @@
+import asyncio
+import os
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
 from pydantic_ai import Agent, RunContext
 from models.provider_config import build_chat_model
 
 from toolsets.common_agent_toolset import common_agent_toolset
 from models.agent_deps import AgentDeps
 
+T = TypeVar('T')
+
+MAX_PARALLEL_SUBAGENTS_ENV = 'COGENT_MAX_PARALLEL_SUBAGENTS'
+SUBAGENT_TIMEOUT_ENV = 'COGENT_SUBAGENT_TIMEOUT_S'
+
+DEFAULT_MAX_PARALLEL_SUBAGENTS = 4
+DEFAULT_SUBAGENT_TIMEOUT_S = 600.0
+
+
 def create_sub_agent(system_prompt: str, provider_name: str | None = None, model_name: str | None = None) -> Agent[AgentDeps]:
     model = build_chat_model(provider_name=provider_name, model_name=model_name)
 
@@ -19,8 +33,92 @@ def create_sub_agent(system_prompt: str, provider_name: str | None = None, model
     def add_cwd(ctx: RunContext[AgentDeps]) -> str:
         return f"The current working directory is: {ctx.deps.cwd}"
 
-    @agent.system_prompt
-    def add_customization(ctx: RunContext[AgentDeps]) -> str:
-        return system_prompt
+    return agent
+
+
+class SubAgentTimeout(Exception):
+    """Raised when a sub-agent run exceeds its deadline."""
+
+    def __init__(self, timeout_s: float):
+        super().__init__(f"sub-agent did not finish within {timeout_s:g}s")
+        self.timeout_s = timeout_s
+
+
+class SubAgentExecutor:
+    """Bounds how many sub-agents run at once and how long each may take.
+
+    Runs beyond `max_parallel` wait for a free slot; the deadline only starts
+    once a run holds a slot, so queued runs are not penalized. One semaphore
+    is kept per event loop so the executor survives repeated `asyncio.run`.
+    """
+
+    def __init__(self, max_parallel: int = DEFAULT_MAX_PARALLEL_SUBAGENTS,
+                 timeout_s: Optional[float] = DEFAULT_SUBAGENT_TIMEOUT_S):
+        self.max_parallel = max(1, max_parallel)
+        self.timeout_s = timeout_s if timeout_s and timeout_s > 0 else None
+        self._semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = weakref.WeakKeyDictionary()
+        self.running = 0
+        self.max_running = 0
+        self.completed = 0
+        self.timed_out = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_parallel)
+            self._semaphores[loop] = sem
+        return sem
+
+    async def run(self, fn: Callable[[], Awaitable[T]], timeout_s: Optional[float] = None) -> T:
+        """Await `fn()` inside a concurrency slot, raising SubAgentTimeout past the deadline."""
+        deadline = timeout_s if timeout_s is not None else self.timeout_s
+        async with self._semaphore():
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                if deadline is None:
+                    return await fn()
+                try:
+                    return await asyncio.wait_for(fn(), timeout=deadline)
+                except asyncio.TimeoutError:
+                    self.timed_out += 1
+                    raise SubAgentTimeout(deadline) from None
+            finally:
+                self.running -= 1
+                self.completed += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'max_parallel': self.max_parallel,
+            'timeout_s': self.timeout_s,
+            'running': self.running,
+            'max_running': self.max_running,
+            'completed': self.completed,
+            'timed_out': self.timed_out,
+        }
+
+
+_executor: Optional[SubAgentExecutor] = None
+
+
+def get_subagent_executor() -> SubAgentExecutor:
+    """Process-wide executor configured from COGENT_MAX_PARALLEL_SUBAGENTS / COGENT_SUBAGENT_TIMEOUT_S."""
+    global _executor
+    if _executor is None:
+        try:
+            max_parallel = int(os.environ.get(MAX_PARALLEL_SUBAGENTS_ENV, DEFAULT_MAX_PARALLEL_SUBAGENTS))
+        except ValueError:
+            max_parallel = DEFAULT_MAX_PARALLEL_SUBAGENTS
+        try:
+            timeout_s = float(os.environ.get(SUBAGENT_TIMEOUT_ENV, DEFAULT_SUBAGENT_TIMEOUT_S))
+        except ValueError:
+            timeout_s = DEFAULT_SUBAGENT_TIMEOUT_S
+        _executor = SubAgentExecutor(max_parallel=max_parallel, timeout_s=timeout_s)
+    return _executor
+
 
-    return agent
\ No newline at end of file
+def reset_subagent_executor() -> None:
+    """Drop the shared executor so the next call re-reads the environment."""
+    global _executor
+    _executor = None
@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+
+from models.agent_deps import AgentDeps
+from tools import task_tool
+from tools.bash_tool import bash
+from models.task_request import TaskRequest
+
+
+def test_fork_isolates_mutable_state(tmp_path):
+    parent = AgentDeps(cwd=str(tmp_path))
+    parent.bash_session['cwd'] = str(tmp_path)
+    parent.scratch['note'] = 'parent only'
+    child = parent.fork()
+
+    assert child.cwd == parent.cwd
+    assert child.bash_session == {'cwd': str(tmp_path)}
+    child.bash_session['cwd'] = '/elsewhere'
+    child.usage.add_run(SimpleNamespace(input_tokens=5), 0.1)
+    assert parent.bash_session['cwd'] == str(tmp_path)
+    assert child.scratch == {}
+    assert parent.usage.runs == 0
+
+
+def test_concurrent_sub_agents_keep_own_bash_cwd_and_merge_usage(monkeypatch, tmp_path):
+    for name in ('a', 'b'):
+        tmp_path.joinpath(name).mkdir()
+
+    def fake_create_sub_agent(system_prompt, provider_name=None, model_name=None):
+        async def fn(messages, info):
+            returns = [p for m in messages for p in m.parts if isinstance(p, ToolReturnPart)]
+            if not returns:
+                target = messages[-1].parts[-1].content
+                return ModelResponse(parts=[ToolCallPart('bash', {'command': f'cd {tmp_path / target}'})])
+            await asyncio.sleep(0.05)  # let the other branch run its cd first
+            return ModelResponse(parts=[TextPart(returns[-1].content)])
+        return Agent(FunctionModel(fn), deps_type=AgentDeps, tools=[bash])
+
+    monkeypatch.setattr(task_tool, 'create_sub_agent', fake_create_sub_agent)
+    task_tool.get_sub_agent_registry().clear()
+    parent = AgentDeps(cwd=str(tmp_path))
+    ctx = SimpleNamespace(deps=parent)
+
+    out = asyncio.run(task_tool.task_batch(ctx, [
+        TaskRequest(description='first', prompt='a'),
+        TaskRequest(description='second', prompt='b'),
+    ]))
+
+    assert f"Changed directory to {tmp_path / 'a'}" in out
+    assert f"Changed directory to {tmp_path / 'b'}" in out
+    assert parent.bash_session['cwd'] is None
+    assert parent.usage.runs == 2
+    assert parent.usage.requests == 4
+    assert parent.usage.tool_calls == 2
+    assert parent.usage.wall_time_s > 0
@@ -0,0 +1,49 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.synthetic_repo import NEEDLE, RepoSpec, generate_repo
+from benchmarks.tool_benchmarks import compare, run_benchmarks
+
+TINY = RepoSpec(files=30, depth=2, fanout=2, max_lines=40, big_file_mb=0.2, ignored_files=10, needle_ratio=0.2)
+
+
+def test_generated_repo_is_deterministic(tmp_path):
+    a = generate_repo(str(tmp_path / 'a'), TINY)
+    b = generate_repo(str(tmp_path / 'b'), TINY)
+    assert {k: v for k, v in a.items() if k not in ('root', 'big_file')} == \
+        {k: v for k, v in b.items() if k not in ('root', 'big_file')}
+    assert (tmp_path / 'a' / '.gitignore').read_text().count('\n') == TINY.gitignore_rules
+    assert NEEDLE in (tmp_path / 'a' / 'node_modules' / 'dep' / 'lib' / 'ignored_2.py').read_text()
+
+
+def test_runner_reports_every_benchmark(tmp_path):
+    report = run_benchmarks(TINY, repeat=1, history_turns=3, workdir=str(tmp_path))
+    expected = {'search_count', 'search_lines', 'search_context', 'search_full', 'glob_recursive',
+                'ls_flat', 'read_offset_cold', 'edit_big_file', 'session_record'}
+    assert expected <= set(report['results'])
+    assert all(r['min_ms'] >= 0 and r['repeats'] == 1 for r in report['results'].values())
+    assert report['results']['session_record']['messages'] == 12
+    table = compare(report, report)
+    assert table.splitlines()[1].split()[-1] == '1.00'
+
+
+def test_agent_loop_benchmark_reports_turns_and_memory(tmp_path, monkeypatch):
+    from benchmarks.agent_loop_benchmark import run_agent_loop_benchmark
+    monkeypatch.setenv('PYDANTIC_AI_NO_BANNER', '1')
+    cwd = os.getcwd()
+    report = run_agent_loop_benchmark(turns=3, rounds=1, workdir=str(tmp_path))
+    assert os.getcwd() == cwd
+    timing = report['timing']
+    assert [r['turn'] for r in timing] == [1, 2, 3]
+    # user prompt, tool calls, tool returns, answer per turn
+    assert [r['history_messages'] for r in timing] == [4, 8, 12]
+    assert all(r['tool_ms'] > 0 and r['harness_ms'] > 0 for r in timing)
+    assert set(report['summary']['harness_ms']) == {'median', 'first_decile_median', 'last_decile_median'}
+    assert len(report['memory']) == 3 and report['memory'][-1]['traced_kb'] > 0
+    assert report['top_allocations']
+    todos = list((tmp_path / '.cogent' / 'sessions').glob('*.todos.json'))
+    assert todos
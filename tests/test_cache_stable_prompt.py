@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai.messages import ModelResponse, TextPart, SystemPromptPart
+from pydantic_ai.models.function import FunctionModel
+
+from models.agent_deps import AgentDeps
+from models.session_recorder import SessionRecorder
+from prompts import MAIN_SYSTEM_PROMPT
+
+_PROVIDERS = '{"providers":[{"name":"lmstudio","type":"openai-compatible","base_url":"http://localhost:1234/v1","api_key_env":"LMSTUDIO_API_KEY","api_key_optional":true,"models":["model-x"],"default_model":"model-x"}]}'
+
+
+def _system_parts(messages):
+    return [p.content for p in messages[0].parts if isinstance(p, SystemPromptPart)]
+
+
+def test_cache_stable_prompt_layout_is_static_first_and_stable(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('providers.json').write_text(_PROVIDERS)
+    monkeypatch.delenv('MODEL_PROVIDER', raising=False)
+    monkeypatch.delenv('MODEL_NAME', raising=False)
+    from main_agent import create_main_agent, main_system_prompts
+
+    agent = create_main_agent(cache_stable_prompt=True)
+    model = FunctionModel(lambda messages, info: ModelResponse(parts=[TextPart('ok')]))
+    deps = AgentDeps(cwd=str(tmp_path))
+    with agent.override(model=model):
+        first = agent.run_sync('hi', deps=deps).all_messages()
+        second = agent.run_sync('hi again', deps=deps).all_messages()
+
+    parts = _system_parts(first)
+    assert parts == _system_parts(second)
+    assert parts[0].startswith(MAIN_SYSTEM_PROMPT)
+    assert 'Tool name: read' in parts[0]
+    assert parts[-1] == f"The current working directory is: {tmp_path}"
+    assert parts == main_system_prompts(deps, cache_stable_prompt=True)
+
+
+def test_recorder_keeps_cache_token_counts(tmp_path):
+    class Usage:
+        input_tokens = 100
+        output_tokens = 10
+        cache_read_tokens = 80
+        cache_write_tokens = 0
+
+    class StubTextPart:
+        content = 'reply'
+        timestamp = None
+
+    class Response:
+        parts = [StubTextPart()]
+        usage = Usage()
+        timestamp = None
+
+    rec = SessionRecorder(tmp_path)
+    rec.record([Response()])
+    data = json.loads(rec.path.read_text())
+    assert data['messages'][0]['usage'] == {'input_tokens': 100, 'output_tokens': 10, 'cache_read_tokens': 80}
+    assert data['total_cache_read_tokens'] == 80
+    assert data['total_cache_write_tokens'] == 0
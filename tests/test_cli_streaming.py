@@ -0,0 +1,43 @@
+import asyncio
+import io
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ToolReturnPart
+from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+from cli.streaming import run_streaming
+
+
+async def _stream(messages, info):
+    # First request: call the tool; second request: stream the answer in chunks
+    if not any(isinstance(p, ToolReturnPart) for m in messages for p in getattr(m, 'parts', [])):
+        yield {0: DeltaToolCall(name='lookup', json_args='{"key": "x"}', tool_call_id='call-1')}
+        return
+    for chunk in ['The ', 'answer ', 'is 42.']:
+        yield chunk
+
+
+def test_streaming_renders_tokens_and_tool_progress():
+    agent = Agent(FunctionModel(stream_function=_stream))
+
+    @agent.tool_plain
+    def lookup(key: str) -> str:
+        return f'value for {key}'
+
+    out = io.StringIO()
+    turn = asyncio.run(run_streaming(agent, 'question', [], None, out=out))
+
+    text = out.getvalue()
+    assert '[tool] lookup({"key": "x"}) ...' in text
+    assert '[tool] lookup done' in text
+    assert text.rstrip().endswith('The answer is 42.')
+    assert turn.result.output == 'The answer is 42.'
+    assert turn.first_token_s is not None
+    # Full message list is available for SessionRecorder
+    assert any(isinstance(p, ToolReturnPart) for m in turn.result.all_messages() for p in m.parts)
@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tools.edit_matcher import find_matches, fuzzy_candidates, line_numbers, replace_at
+from tools.edit_tool import edit
+
+
+def test_find_and_replace_in_one_pass():
+    content = 'aXbXXc'
+    offsets = find_matches(content, 'X')
+    assert offsets == [1, 3, 4]
+    assert find_matches(content, 'X', max_matches=2) == [1, 3]
+    assert replace_at(content, offsets, 1, '--') == 'a--b----c'
+    assert find_matches('aaaa', 'aa') == [0, 2]  # non-overlapping, like str.count/replace
+    assert line_numbers('a\nb\nX\nX', [4, 6]) == [3, 4]
+
+
+def test_whitespace_only_difference_is_ranked_first():
+    content = 'def f():\n    x = 1\n    return x\n\ndef g():\n    y = 1\n    return y\n'
+    cands = fuzzy_candidates(content, 'def g():\n  y = 1\n  return y')
+    assert cands[0].line == 5
+    assert cands[0].whitespace_only and cands[0].score == 1.0
+    assert all(c.line != 5 for c in cands[1:])
+
+
+def test_candidates_in_large_file_use_anchor_lines():
+    lines = [f'value_{i} = compute({i})' for i in range(200_000)]
+    lines[150_000] = 'result = compute_total(items, tax=0.2)'
+    content = '\n'.join(lines)
+    cands = fuzzy_candidates(content, 'value_149999 = compute(149999)\nresult = compute_total(items, tax=0.25)')
+    assert cands and cands[0].line == 150_000
+
+
+def test_edit_error_points_at_near_matches(tmp_path):
+    path = tmp_path / 'm.py'
+    path.write_text('class A:\n    def run(self):\n        return 1\n')
+    out = edit(str(path), 'def run(self):\n    return 1', 'def run(self):\n    return 2')
+    assert out.startswith("Error: 'old_string' not found in the file.")
+    assert 'line 2 (similarity 1.00, differs only in whitespace): def run(self):' in out
+
+
+def test_near_miss_on_large_file_finishes_in_bounded_time():
+    # No needle line occurs verbatim and every word is shared by hundreds of lines:
+    # the worst case for the anchor vote and for window scoring.
+    lines = [f'    result_{i % 97} = transform(value_{i % 89}, option={i % 5})' for i in range(20_000)]
+    needle = '\n'.join(l + '  # x' for l in lines[1000:1040])
+    started = time.perf_counter()
+    cands = fuzzy_candidates('\n'.join(lines), needle)
+    assert time.perf_counter() - started < 3.0
+    assert cands and cands[0].score > 0.8
+
+    # Small files fall back to scoring every window, still within the budget
+    small = '\n'.join(f'entry {i} = lookup(key_{i}, default=None)' for i in range(300))
+    started = time.perf_counter()
+    fuzzy_candidates(small, '\n'.join(f'entyr {i} = lookup(kye_{i})' for i in range(40)))
+    assert time.perf_counter() - started < 3.0
@@ -0,0 +1,98 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tools import file_cache
+from tools.edit_tool import edit
+from tools.file_cache import FileContentCache
+from tools.read_tool import read
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    c = FileContentCache(1024 * 1024)
+    monkeypatch.setattr(file_cache, '_cache', c)
+    return c
+
+
+def _settle(path):
+    # Push mtime into the past so the entry is not treated as racy
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+
+def _uncached_read(monkeypatch, *args, **kwargs):
+    with monkeypatch.context() as m:
+        m.setattr(file_cache, '_cache', FileContentCache(0))
+        return read(*args, **kwargs)
+
+
+def test_repeated_reads_hit_and_match_uncached_output(cache, monkeypatch, tmp_path):
+    path = tmp_path / 'mod.py'
+    path.write_bytes(b'first\r\nsecond\n' + b'x' * 2500 + b'\nlast')
+    _settle(path)
+
+    expected = _uncached_read(monkeypatch, str(path), offset=2, limit=3)
+    assert read(str(path), offset=2, limit=3) == expected
+    assert read(str(path), offset=2, limit=3) == expected
+    assert read(str(path)) == _uncached_read(monkeypatch, str(path))
+    assert read(str(path), offset=50).startswith('<system-reminder>no lines read')
+    stats = cache.stats()
+    assert stats['misses'] == 1 and stats['hits'] == 3
+
+
+def test_external_change_is_detected(cache, tmp_path):
+    path = tmp_path / 'a.txt'
+    path.write_text('one\n')
+    _settle(path)
+    assert read(str(path)) == '     1\tone'
+    path.write_text('one\ntwo\n')
+    assert read(str(path)) == '     1\tone\n     2\ttwo'
+    assert cache.stats()['hits'] == 0
+
+
+def test_racy_entry_is_reread(cache, tmp_path):
+    path = tmp_path / 'fresh.txt'
+    path.write_text('aaa\n')  # mtime is "now": same-size rewrites could keep it
+    read(str(path))
+    read(str(path))
+    assert cache.stats()['hits'] == 0
+
+
+def test_edit_shares_cache_and_updates_it(cache, tmp_path):
+    path = tmp_path / 'b.py'
+    path.write_text('x = 1\ny = 2\n')
+    _settle(path)
+    read(str(path))
+    assert edit(str(path), 'y = 2', 'y = 3') == f'Replaced 1 occurrence(s) in {path}'
+    assert cache.stats()['hits'] == 1
+    assert read(str(path)) == '     1\tx = 1\n     2\ty = 3'
+    assert cache.stats()['hits'] == 2
+    assert path.read_text() == 'x = 1\ny = 3\n'
+
+
+def test_invalid_utf8_reads_lossy_but_edit_still_fails(cache, tmp_path):
+    path = tmp_path / 'bin.dat'
+    path.write_bytes(b'ok \xff\n')
+    _settle(path)
+    assert read(str(path)) == '     1\tok �'
+    assert edit(str(path), 'ok', 'no').startswith('Error: failed to open file for editing')
+
+
+def test_evicts_least_recently_used_by_size(monkeypatch, tmp_path):
+    c = FileContentCache(8 * 300)
+    monkeypatch.setattr(file_cache, '_cache', c)
+    paths = []
+    for name in 'abc':
+        p = tmp_path / name
+        p.write_text(name * 299 + '\n')
+        _settle(p)
+        paths.append(p)
+    for p in paths:
+        read(str(p))
+    assert c.stats()['evictions'] >= 1
+    assert c.stats()['bytes'] <= c.max_bytes
@@ -0,0 +1,52 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tools import glob_tool
+from tools.glob_tool import glob
+
+
+def _tree(root):
+    for d in ('src/pkg', 'node_modules/x', '.hidden', 'ignored'):
+        (root / d).mkdir(parents=True)
+    files = ['src/a.py', 'src/pkg/b.py', 'node_modules/x/c.py', '.hidden/d.py', 'top.py', 'ignored/f.py', 'src/notes.md']
+    for i, f in enumerate(files):
+        (root / f).write_text('')
+        os.utime(root / f, (1000 + i, 1000 + i))
+    (root / '.gitignore').write_text('ignored/\n')
+
+
+def test_recursive_glob_prunes_skip_dirs_hidden_and_gitignored(tmp_path):
+    _tree(tmp_path)
+    out = glob('**/*.py', path=str(tmp_path))
+    # Newest first
+    assert out.split('\n') == [str(tmp_path / 'top.py'), str(tmp_path / 'src/pkg/b.py'), str(tmp_path / 'src/a.py')]
+
+
+def test_literal_prefix_reaches_skipped_dirs(tmp_path):
+    _tree(tmp_path)
+    assert glob('node_modules/**/*.py', path=str(tmp_path)) == str(tmp_path / 'node_modules/x/c.py')
+    assert glob('.hidden/*.py', path=str(tmp_path)) == str(tmp_path / '.hidden/d.py')
+    assert glob(str(tmp_path / 'src' / '*.md')) == str(tmp_path / 'src/notes.md')
+    assert glob('src/*/b.py', path=str(tmp_path)) == str(tmp_path / 'src/pkg/b.py')
+    assert glob('nope/**/*.py', path=str(tmp_path)) == 'No matches found'
+
+
+def test_results_are_capped_with_marker(monkeypatch, tmp_path):
+    _tree(tmp_path)
+    monkeypatch.setattr(glob_tool, 'GLOB_MAX_RESULTS', 2)
+    lines = glob('**/*.*', path=str(tmp_path)).split('\n')
+    assert lines[:2] == [str(tmp_path / 'src/notes.md'), str(tmp_path / 'top.py')]
+    assert lines[2].startswith('[truncated: showing the 2 most recently modified of ')
+
+
+def test_trailing_slash_matches_directories_only(tmp_path):
+    _tree(tmp_path)
+    assert glob('src/*/', path=str(tmp_path)) == str(tmp_path / 'src/pkg') + '/'
+    # Hidden and gitignored directories are left out; skip-listed ones are listed but not entered
+    assert sorted(glob('**/', path=str(tmp_path)).split('\n')) == [
+        str(tmp_path / d) + '/' for d in ('node_modules', 'src', 'src/pkg')]
+    assert glob('src/*.py/', path=str(tmp_path)) == 'No matches found'
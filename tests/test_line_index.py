@@ -0,0 +1,100 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tools import file_cache, line_index
+from tools.file_cache import FileContentCache
+from tools.line_index import LineIndex, clear_line_indexes, get_line_index, line_index_stats
+from tools.read_tool import read
+
+N_LINES = 120_000  # ~1.3 MB, above LINE_INDEX_MIN_BYTES
+
+
+@pytest.fixture(autouse=True)
+def _no_file_cache(monkeypatch):
+    # Files this size would otherwise be served whole from the content cache
+    monkeypatch.setattr(file_cache, '_cache', FileContentCache(0))
+
+
+def _write_big(path, newline='\n'):
+    newlines = newline if isinstance(newline, tuple) else (newline,)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for i in range(1, N_LINES + 1):
+            f.write(f"line {i} é{newlines[i % len(newlines)]}")
+
+
+def _expected(offset, limit):
+    return "\n".join(f"{j:6}\tline {offset + j - 1} é" for j in range(1, limit + 1)
+                     if offset + j - 1 <= N_LINES)
+
+
+def test_checkpoints_point_at_line_starts(tmp_path):
+    path = tmp_path / 'big.log'
+    _write_big(path)
+    st = os.stat(path)
+    index = LineIndex(str(path), (st.st_mtime_ns, st.st_size), stride=1000)
+    byte_offset, lineno = index.seek_point(54_321)
+    assert lineno == 54_001
+    with open(path, 'rb') as f:
+        f.seek(byte_offset)
+        assert f.readline() == 'line 54001 é\n'.encode('utf-8')
+    # Only the prefix needed so far was scanned
+    assert not index.complete
+
+
+def test_read_with_index_matches_linear_scan(tmp_path):
+    clear_line_indexes()
+    path = tmp_path / 'big.log'
+    _write_big(path)
+    for offset in (2, 999, 1000, 1001, 77_777, N_LINES - 2):
+        assert read(str(path), offset=offset, limit=5) == _expected(offset, 5)
+    assert read(str(path), offset=N_LINES + 10).startswith('<system-reminder>no lines read')
+    stats = line_index_stats()
+    assert stats['builds'] == 1 and stats['hits'] >= 6
+
+
+def test_crlf_and_rebuild_on_change(tmp_path):
+    clear_line_indexes()
+    path = tmp_path / 'big.txt'
+    _write_big(path, newline='\r\n')
+    assert read(str(path), offset=65_432, limit=2) == _expected(65_432, 2)
+
+    with open(path, 'r+b') as f:
+        f.write(b'LINE')  # same size, new mtime
+    os.utime(path, ns=(1, 1))
+    assert read(str(path), offset=65_432, limit=1) == _expected(65_432, 1)
+    assert line_index_stats()['builds'] == 2
+
+
+def test_lone_cr_breaks_lines_like_the_decoder(monkeypatch, tmp_path):
+    clear_line_indexes()
+    path = tmp_path / 'progress.log'
+    _write_big(path, newline=('\r', '\r\n'))
+    assert read(str(path), offset=N_LINES - 2, limit=5) == _expected(N_LINES - 2, 5)
+    # Served from the content cache instead, the same lines come back
+    cache = FileContentCache(64 * 1024 * 1024)
+    monkeypatch.setattr(file_cache, '_cache', cache)
+    assert read(str(path), offset=N_LINES - 2, limit=5) == _expected(N_LINES - 2, 5)
+    assert cache.stats()['entries'] == 1
+
+
+def test_crlf_split_across_chunks_is_one_break(monkeypatch, tmp_path):
+    monkeypatch.setattr(line_index, '_CHUNK_BYTES', 2)
+    path = tmp_path / 'mixed.txt'
+    path.write_bytes(b'a\r\nb\rc\r\nd\ne')
+    st = os.stat(path)
+    index = LineIndex(str(path), (st.st_mtime_ns, st.st_size), stride=1)
+    starts = [index.seek_point(n)[0] for n in range(1, 6)]
+    assert starts == [0, 3, 5, 8, 10]
+
+
+def test_small_files_are_not_indexed(tmp_path):
+    path = tmp_path / 'small.py'
+    path.write_text('a\nb\nc\n')
+    assert get_line_index(str(path)) is None
+    assert read(str(path), offset=2, limit=1) == "     1\tb"
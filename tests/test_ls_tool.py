@@ -0,0 +1,51 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tools.ls_tool import ls
+
+
+def _tree(root):
+    for d in ('src/pkg', 'node_modules/x', 'build'):
+        (root / d).mkdir(parents=True)
+    for f in ('src/a.py', 'src/pkg/b.py', 'node_modules/x/c.js', 'build/out.o', 'README.md', 'z.txt'):
+        (root / f).write_text('')
+
+
+def test_flat_listing_marks_dirs_and_applies_ignores(tmp_path):
+    _tree(tmp_path)
+    assert ls(str(tmp_path)).split('\n') == ['README.md', 'build/', 'node_modules/', 'src/', 'z.txt']
+    # Patterns match the basename or the absolute path
+    out = ls(str(tmp_path), ignore=['*.md', str(tmp_path / 'build')])
+    assert out.split('\n') == ['node_modules/', 'src/', 'z.txt']
+
+
+def test_depth_recurses_but_does_not_expand_skip_dirs(tmp_path):
+    _tree(tmp_path)
+    out = ls(str(tmp_path), ignore=['build'], depth=3)
+    assert out.split('\n') == [
+        'README.md', 'node_modules/', 'src/', 'src/a.py', 'src/pkg/', 'src/pkg/b.py', 'z.txt',
+    ]
+    assert 'src/pkg/b.py' not in ls(str(tmp_path), depth=2)
+
+
+def test_paging_reports_totals_and_next_offset(tmp_path):
+    for i in range(25):
+        (tmp_path / f'f{i:02d}').write_text('')
+    first = ls(str(tmp_path), limit=10).split('\n')
+    assert first[:10] == [f'f{i:02d}' for i in range(10)]
+    assert first[-1] == '[showing entries 1-10 of 25; pass offset=10 to see more]'
+    last = ls(str(tmp_path), offset=20, limit=10).split('\n')
+    assert last[-1] == '[showing entries 21-25 of 25]'
+    assert 'No entries at offset 30' in ls(str(tmp_path), offset=30)
+
+
+def test_validation_errors(tmp_path):
+    assert ls('relative') == "Error: 'path' must be an absolute path"
+    assert ls(str(tmp_path), ignore='*.py') == "Error: 'ignore' must be an array of glob patterns"
+    assert ls(str(tmp_path), depth=0).startswith("Error: 'depth' must be between 1")
+    assert ls(str(tmp_path), limit=0) == "Error: 'limit' must be >= 1"
+    assert ls(str(tmp_path)) == 'No files or directories found'
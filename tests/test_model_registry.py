@@ -0,0 +1,74 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from models import model_registry
+from models.provider_config import build_chat_model
+
+_PROVIDERS = '{"providers":[{"name":"lmstudio","type":"openai-compatible","base_url":"http://localhost:1234/v1","api_key_env":"LMSTUDIO_API_KEY","api_key_optional":true,"models":["model-x","model-y"],"default_model":"model-x"}]}'
+
+
+def _setup(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('providers.json').write_text(_PROVIDERS)
+    monkeypatch.delenv('MODEL_PROVIDER', raising=False)
+    monkeypatch.delenv('MODEL_NAME', raising=False)
+    monkeypatch.delenv('LMSTUDIO_API_KEY', raising=False)
+    model_registry.clear_model_registry()
+
+
+def test_models_and_providers_are_reused(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path)
+    m1 = build_chat_model('lmstudio', 'model-x')
+    m2 = build_chat_model('lmstudio', 'model-x')
+    m3 = build_chat_model('lmstudio', 'model-y')
+    assert m1 is m2
+    assert m3 is not m1
+    assert getattr(m3, '_cogent_model_name') == 'model-y'
+    stats = model_registry.registry_stats()
+    assert stats['models'] == 2 and stats['model_hits'] == 1
+    # Both models share one provider (and therefore one HTTP client / pool)
+    assert stats['providers'] == 1
+
+
+def test_api_key_change_creates_new_model(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path)
+    m1 = build_chat_model('lmstudio', 'model-x')
+    monkeypatch.setenv('LMSTUDIO_API_KEY', 'rotated')
+    m2 = build_chat_model('lmstudio', 'model-x')
+    assert m1 is not m2
+
+
+def test_clear_registry(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path)
+    m1 = build_chat_model('lmstudio', 'model-x')
+    model_registry.clear_model_registry()
+    assert build_chat_model('lmstudio', 'model-x') is not m1
+
+
+def test_shared_client_uses_one_pool_per_event_loop():
+    httpx = pytest.importorskip('httpx')
+    seen = []
+
+    def handler(request):
+        return httpx.Response(200, text='ok')
+
+    async def fetch(client):
+        pool = client.pool_for_running_loop()
+        pool._transport = httpx.MockTransport(handler)
+        seen.append(pool)
+        resp = await client.get('http://localhost:1234/v1/models')
+        assert resp.text == 'ok'
+        assert client.pool_for_running_loop() is pool
+
+    client = model_registry.get_shared_http_client()
+    asyncio.run(fetch(client))
+    asyncio.run(fetch(client))
+    assert model_registry.get_shared_http_client() is client
+    assert seen[0] is not seen[1]
@@ -0,0 +1,103 @@
+import os
+import stat
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from models.file_edit import FileEdit
+from tools import atomic_io
+from tools.atomic_io import atomic_write_many
+from tools.edit_tool import edit, multi_edit
+
+
+def _files(tmp_path):
+    a = tmp_path / 'a.py'
+    a.write_text('def load(path):\n    return open(path)\n\nload("x")\nload("y")\n')
+    b = tmp_path / 'b.py'
+    b.write_text('from a import load\nload("z")\n')
+    return a, b
+
+
+def test_applies_ordered_edits_across_files(tmp_path):
+    a, b = _files(tmp_path)
+    out = multi_edit([
+        FileEdit(file_path=str(a), old_string='def load(path):', new_string='def read_file(path):'),
+        FileEdit(file_path=str(a), old_string='load(', new_string='read_file(', replace_all=True),
+        FileEdit(file_path=str(b), old_string='load', new_string='read_file', replace_all=True),
+    ])
+    assert out == (f"Applied 3 edit(s) to 2 file(s):\n- {a}: 3 replacement(s)\n- {b}: 2 replacement(s)")
+    assert a.read_text() == 'def read_file(path):\n    return open(path)\n\nread_file("x")\nread_file("y")\n'
+    assert b.read_text() == 'from a import read_file\nread_file("z")\n'
+    assert not [p for p in os.listdir(tmp_path) if p.endswith('.tmp')]
+
+
+def test_any_failing_edit_changes_nothing(tmp_path):
+    a, b = _files(tmp_path)
+    before = (a.read_text(), b.read_text())
+    out = multi_edit([
+        FileEdit(file_path=str(a), old_string='def load(path):', new_string='def read_file(path):'),
+        FileEdit(file_path=str(b), old_string='load("q")', new_string='load("r")'),
+    ])
+    assert out.startswith(f"Error in edit #2 ({b}), no files were changed: 'old_string' not found in the file.")
+    assert (a.read_text(), b.read_text()) == before
+
+    out = multi_edit([FileEdit(file_path=str(a), old_string='load', new_string='read')])
+    assert 'not unique in the file (found 3 occurrences, at lines 1, 4, 5)' in out
+
+
+def test_rolls_back_when_a_replace_fails(monkeypatch, tmp_path):
+    a, b = _files(tmp_path)
+    os.chmod(a, 0o640)
+    before = (a.read_text(), b.read_text())
+    real_replace = os.replace
+    calls = []
+
+    def flaky_replace(src, dst):
+        calls.append(dst)
+        if dst == str(b) and len(calls) == 2:
+            raise OSError('disk full')
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(atomic_io.os, 'replace', flaky_replace)
+    with pytest.raises(OSError):
+        atomic_write_many({str(a): 'new a\n', str(b): 'new b\n'})
+    assert (a.read_text(), b.read_text()) == before
+    assert stat.S_IMODE(os.stat(a).st_mode) == 0o640
+    assert not [p for p in os.listdir(tmp_path) if p.endswith('.tmp')]
+
+
+def test_edit_writes_atomically_and_keeps_mode(tmp_path):
+    script = tmp_path / 'run.sh'
+    script.write_text('echo old\n')
+    os.chmod(script, 0o750)
+    assert edit(str(script), 'old', 'new') == f'Replaced 1 occurrence(s) in {script}'
+    assert script.read_text() == 'echo new\n'
+    assert stat.S_IMODE(os.stat(script).st_mode) == 0o750
+
+
+def test_edit_through_symlink_keeps_the_link(tmp_path):
+    target = tmp_path / 'real.txt'
+    target.write_text('one\n')
+    link = tmp_path / 'link.txt'
+    link.symlink_to(target)
+    edit(str(link), 'one', 'two')
+    assert link.is_symlink() and target.read_text() == 'two\n'
+    atomic_write_many({str(link): 'three\n'})
+    assert link.is_symlink() and target.read_text() == 'three\n'
+
+
+def test_multi_edit_through_link_and_target_edits_one_file(tmp_path):
+    target = tmp_path / 'real.txt'
+    target.write_text('alpha beta\n')
+    link = tmp_path / 'link.txt'
+    link.symlink_to(target)
+    out = multi_edit([
+        FileEdit(file_path=str(link), old_string='alpha', new_string='gamma'),
+        FileEdit(file_path=str(target), old_string='beta', new_string='delta'),
+    ])
+    assert out == f"Applied 2 edit(s) to 1 file(s):\n- {link}: 2 replacement(s)"
+    assert link.is_symlink() and target.read_text() == 'gamma delta\n'
@@ -108,3 +108,30 @@ def test_persist_last_selection(monkeypatch, tmp_path):
     agent = create_main_agent()
     assert hasattr(agent.model, '_cogent_provider_name')
     assert getattr(agent.model, '_cogent_model_name') == 'model-x'
+
+
+def test_providers_config_cached_until_file_changes(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    from models import provider_config as pc
+    cfg_path = tmp_path.joinpath('providers.json')
+    cfg_path.write_text('{"providers":[{"name":"lmstudio","type":"openai-compatible","base_url":"http://localhost:1234/v1","api_key_env":"LMSTUDIO_API_KEY","api_key_optional":true,"models":["model-x"],"default_model":"model-x"}]}')
+    first = pc.load_providers_config()
+    assert pc.load_providers_config() is first
+
+    # Parsing is skipped entirely on a cache hit
+    calls = []
+    real_parse = pc._parse_with_validation
+    monkeypatch.setattr(pc, '_parse_with_validation', lambda obj: calls.append(obj) or real_parse(obj))
+    pc.load_providers_config()
+    assert calls == []
+
+    cfg_path.write_text('{"providers":[{"name":"lmstudio","type":"openai-compatible","base_url":"http://localhost:1234/v1","api_key_env":"LMSTUDIO_API_KEY","api_key_optional":true,"models":["model-x","model-y"],"default_model":"model-y"}]}')
+    os.utime(cfg_path, ns=(1, 1))  # guarantee a distinct mtime on coarse filesystems
+    updated = pc.load_providers_config()
+    assert updated is not first
+    assert updated.get('lmstudio').default_model == 'model-y'
+    assert len(calls) == 1
+
+    reloaded = pc.reload_providers_config()
+    assert reloaded is not updated
+    assert len(calls) == 2
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from models.rate_limiter import (
+    PRIORITY_MAIN,
+    PRIORITY_SUBAGENT,
+    ProviderScheduler,
+    RateLimitedModel,
+    request_priority,
+)
+
+
+def test_main_agent_requests_jump_the_queue():
+    async def scenario():
+        sched = ProviderScheduler('p', requests_per_minute=600)  # one slot per 0.1s
+        sched._requests.level = 0  # bucket drained: everything queues
+        order = []
+
+        async def req(label, priority):
+            await sched.acquire(priority=priority)
+            order.append(label)
+
+        sub1 = asyncio.create_task(req('sub1', PRIORITY_SUBAGENT))
+        sub2 = asyncio.create_task(req('sub2', PRIORITY_SUBAGENT))
+        await asyncio.sleep(0)
+        main = asyncio.create_task(req('main', PRIORITY_MAIN))
+        await asyncio.sleep(0)
+        assert sched.queue_depth == 3
+        await asyncio.gather(sub1, sub2, main)
+        return sched, order
+
+    sched, order = asyncio.run(scenario())
+    assert order == ['main', 'sub1', 'sub2']
+    m = sched.metrics()
+    assert m['granted'] == 3 and m['max_queue_depth'] == 3 and m['queue_depth'] == 0
+    assert m['max_wait_s'] > 0
+
+
+def test_token_budget_and_settlement():
+    sched = ProviderScheduler('p', tokens_per_minute=6000)
+
+    async def scenario():
+        await sched.acquire(tokens=5000)
+        # Provider reported more than reserved: the debt is charged to the bucket
+        sched.settle(5000, 5900)
+        return sched._tokens.wait_time(1000, sched._tokens._updated)
+
+    wait = asyncio.run(scenario())
+    assert wait > 8  # ~900 tokens short at 100 tokens/s
+
+
+def test_priority_context_reaches_wrapped_model():
+    from pydantic_ai import Agent
+    from pydantic_ai.messages import ModelResponse, TextPart
+    from pydantic_ai.models.function import FunctionModel
+
+    seen = []
+    sched = ProviderScheduler('p', requests_per_minute=1000)
+    real_acquire = sched.acquire
+
+    async def spy(tokens=0, priority=None):
+        from models.rate_limiter import current_request_priority
+        seen.append(current_request_priority())
+        return await real_acquire(tokens, priority)
+
+    sched.acquire = spy
+    model = RateLimitedModel(FunctionModel(lambda m, i: ModelResponse(parts=[TextPart('ok')])), sched)
+    agent = Agent(model)
+
+    async def scenario():
+        await agent.run('main')
+        with request_priority(PRIORITY_SUBAGENT):
+            await agent.run('sub')
+
+    asyncio.run(scenario())
+    assert seen == [PRIORITY_MAIN, PRIORITY_SUBAGENT]
+    assert sched.granted == 2
+
+
+def test_provider_limits_from_config(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('providers.json').write_text('{"providers":[{"name":"lmstudio","type":"openai-compatible","base_url":"http://localhost:1234/v1","api_key_env":"LMSTUDIO_API_KEY","api_key_optional":true,"models":["model-x"],"requests_per_minute":30,"tokens_per_minute":40000}]}')
+    from models.provider_config import build_chat_model
+    from models.rate_limiter import scheduler_metrics
+    model = build_chat_model('lmstudio', 'model-x')
+    assert isinstance(model, RateLimitedModel)
+    assert getattr(model, '_cogent_model_name') == 'model-x'
+    metrics = {m['provider']: m for m in scheduler_metrics()}
+    assert metrics['lmstudio']['requests_per_minute'] == 30
+    assert metrics['lmstudio']['tokens_per_minute'] == 40000
+    # Queue depth and waits are visible in /stats and saved with the session
+    from cli.prompt import _render_stats
+    from models.provider_config import provider_stats
+    from models.session_recorder import SessionRecorder
+    assert '[rate limit] provider=lmstudio requests_per_minute=30' in _render_stats()
+    recorder = SessionRecorder(str(tmp_path))
+    recorder.record([], provider_stats=provider_stats())
+    saved = json.loads(recorder.path.read_text())
+    assert any(s['provider'] == 'lmstudio' for s in saved['provider_stats']['rate_limits'])
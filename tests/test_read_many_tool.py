@@ -0,0 +1,53 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from models.file_read_request import FileReadRequest
+from tools.read_many_tool import read_many
+from tools.read_tool import read
+
+
+def test_reads_in_order_with_per_file_ranges_and_errors(tmp_path):
+    a = tmp_path / 'a.py'
+    a.write_text('a1\na2\na3\n')
+    b = tmp_path / 'b.py'
+    b.write_text('b1\nb2\n')
+    out = read_many([
+        FileReadRequest(file_path=str(b)),
+        FileReadRequest(file_path=str(a), offset=2, limit=1),
+        FileReadRequest(file_path=str(tmp_path / 'missing.py')),
+        FileReadRequest(file_path='relative.py'),
+    ])
+    assert out == (
+        f"==> {b} <==\n{read(str(b))}\n\n"
+        f"==> {a} <==\n     1\ta2\n\n"
+        f"==> {tmp_path / 'missing.py'} <==\nError: file not found: {tmp_path / 'missing.py'}\n\n"
+        f"==> relative.py <==\nError: 'file_path' must be an absolute path"
+    )
+
+
+def test_budget_truncates_on_line_boundary_and_skips_rest(tmp_path):
+    big = tmp_path / 'big.txt'
+    big.write_text(''.join(f'line {i}\n' for i in range(1, 101)))
+    small = tmp_path / 'small.txt'
+    small.write_text('tail\n')
+    out = read_many([
+        FileReadRequest(file_path=str(big), offset=11),
+        FileReadRequest(file_path=str(small)),
+    ], max_total_chars=100)
+
+    first, second = out.split('\n\n')
+    body = first.split('\n')[1:]
+    shown = len(body) - 1
+    assert body[-2].endswith(f'line {10 + shown}')
+    assert f'offset={11 + shown} to continue' in body[-1]
+    assert second == f"==> {small} <==\n<system-reminder>skipped: output budget exhausted</system-reminder>"
+
+
+def test_rejects_empty_and_oversized_batches(tmp_path):
+    assert read_many([]).startswith('Error:')
+    too_many = [FileReadRequest(file_path=str(tmp_path / f'{i}.txt')) for i in range(51)]
+    assert read_many(too_many).startswith('Error: at most 50 files')
@@ -0,0 +1,127 @@
+import asyncio
+import io
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    ModelRequest, ModelResponse, SystemPromptPart, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart,
+)
+from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+from cli.streaming import run_streaming
+from models.replay_model import ReplayModel, request_key
+
+
+def _scripted_upstream(calls):
+    def fn(messages, info):
+        calls.append(len(messages))
+        if not any(isinstance(p, ToolReturnPart) for m in messages for p in m.parts):
+            return ModelResponse(parts=[ToolCallPart('double', {'n': 21})])
+        return ModelResponse(parts=[TextPart('done: 42')])
+    return FunctionModel(fn)
+
+
+def _scripted_stream_upstream(calls):
+    async def stream(messages, info):
+        calls.append(len(messages))
+        if not any(isinstance(p, ToolReturnPart) for m in messages for p in m.parts):
+            yield {0: DeltaToolCall(name='double', json_args='{"n": 21}')}
+        else:
+            yield 'done: '
+            yield '42'
+    return FunctionModel(stream_function=stream)
+
+
+def _agent(model):
+    agent = Agent(model)
+
+    @agent.tool_plain
+    def double(n: int) -> int:
+        return n * 2
+
+    return agent
+
+
+def test_record_then_replay_without_upstream(tmp_path):
+    calls = []
+    recorder = ReplayModel(str(tmp_path), mode='record', upstream=_scripted_upstream(calls))
+    assert _agent(recorder).run_sync('compute').output == 'done: 42'
+    assert len(calls) == 2 and recorder.recorded == 2
+    assert len(list(tmp_path.glob('*.json'))) == 2
+
+    replay = ReplayModel(str(tmp_path), mode='replay')
+    result = _agent(replay).run_sync('compute')
+    assert result.output == 'done: 42'
+    assert replay.hits == 2
+    assert len(calls) == 2  # upstream untouched
+
+
+def test_replay_miss_raises(tmp_path):
+    replay = ReplayModel(str(tmp_path), mode='replay')
+    with pytest.raises(RuntimeError) as e:
+        _agent(replay).run_sync('never recorded')
+    assert 'No recorded response' in str(e.value)
+
+
+def test_auto_mode_records_only_misses(tmp_path):
+    calls = []
+    model = ReplayModel(str(tmp_path), mode='auto', upstream=_scripted_upstream(calls))
+    _agent(model).run_sync('compute')
+    _agent(model).run_sync('compute')
+    assert len(calls) == 2 and model.hits == 2
+
+
+def test_replay_provider_from_config(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('providers.json').write_text('{"providers":[{"name":"offline","type":"replay","replay_dir":"fixtures/replay"}]}')
+    from models.provider_config import build_chat_model
+    model = build_chat_model('offline')
+    assert isinstance(model, ReplayModel)
+    assert model.replay_dir == tmp_path / 'fixtures' / 'replay'
+    assert getattr(model, '_cogent_model_name') == 'replay'
+
+
+def test_request_key_ignores_ids_only_at_message_and_part_level():
+    def history(args, call_id):
+        return [
+            ModelRequest(parts=[UserPromptPart('update the record')]),
+            ModelResponse(parts=[ToolCallPart('update', args, call_id)]),
+        ]
+
+    assert request_key(history({'id': 1}, 'call_a')) == request_key(history({'id': 1}, 'call_b'))
+    assert request_key(history({'id': 1}, 'call_a')) != request_key(history({'id': 2}, 'call_a'))
+
+
+def test_streamed_turns_record_and_replay(tmp_path):
+    calls = []
+    recorder = ReplayModel(str(tmp_path), mode='record', upstream=_scripted_stream_upstream(calls))
+    turn = asyncio.run(run_streaming(_agent(recorder), 'compute', [], None, out=io.StringIO()))
+    assert turn.result.output == 'done: 42'
+    assert len(calls) == 2 and recorder.recorded == 2
+
+    replay = ReplayModel(str(tmp_path), mode='replay')
+    out = io.StringIO()
+    turn = asyncio.run(run_streaming(_agent(replay), 'compute', [], None, out=out))
+    assert turn.result.output == 'done: 42' and 'done: 42' in out.getvalue()
+    assert replay.hits == 2 and len(calls) == 2
+    # The same recordings serve non-streamed requests
+    assert _agent(replay).run_sync('compute').output == 'done: 42'
+
+
+def test_request_key_ignores_the_cwd_line():
+    def history(cwd, prompt='list the files'):
+        return [ModelRequest(parts=[
+            SystemPromptPart('You are cogent.'),
+            SystemPromptPart(f'The current working directory is: {cwd}'),
+            UserPromptPart(prompt),
+        ])]
+
+    assert request_key(history('/home/a/cogent')) == request_key(history('/tmp/ci/cogent'))
+    assert request_key(history('/home/a/cogent')) != request_key(history('/home/a/cogent', 'list the tests'))
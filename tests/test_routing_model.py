@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.function import FunctionModel
+
+from models.routing_model import RoutingModel
+
+
+def _model(name, calls, fail_with=None):
+    def fn(messages, info):
+        calls.append(name)
+        if fail_with is not None:
+            raise fail_with
+        return ModelResponse(parts=[TextPart(f'from {name}')])
+    return FunctionModel(fn, model_name=name)
+
+
+def test_fails_over_on_rate_limit_and_opens_circuit():
+    calls = []
+    primary = _model('primary', calls, fail_with=ModelHTTPError(429, 'primary', headers={'retry-after': '60'}))
+    spill = _model('spill', calls)
+    router = RoutingModel('pool', [('a', primary), ('b', spill)], strategy='failover')
+    agent = Agent(router)
+
+    assert agent.run_sync('hi').output == 'from spill'
+    assert calls == ['primary', 'spill']
+    stats = {s['target']: s for s in router.endpoint_stats()}
+    assert stats['a']['rate_limited'] == 1 and stats['a']['circuit_open']
+    # Circuit is open: the saturated endpoint is skipped entirely
+    assert agent.run_sync('again').output == 'from spill'
+    assert calls == ['primary', 'spill', 'spill']
+
+
+def test_request_errors_are_not_retried_elsewhere():
+    calls = []
+    bad = _model('bad', calls, fail_with=ModelHTTPError(400, 'bad', body='invalid request'))
+    other = _model('other', calls)
+    agent = Agent(RoutingModel('pool', [('a', bad), ('b', other)]))
+    with pytest.raises(ModelHTTPError):
+        agent.run_sync('hi')
+    assert calls == ['bad']
+
+
+def test_stream_fails_over_only_while_opening():
+    calls = []
+
+    async def unavailable(messages, info):
+        calls.append('a')
+        raise ModelHTTPError(503, 'a')
+        yield ''  # pragma: no cover - makes this an async generator
+
+    async def healthy(messages, info):
+        calls.append('b')
+        yield 'hello'
+
+    router = RoutingModel('pool', [('a', FunctionModel(stream_function=unavailable, model_name='a')),
+                                   ('b', FunctionModel(stream_function=healthy, model_name='b'))],
+                          strategy='failover', failure_threshold=5)
+    messages = [ModelRequest(parts=[UserPromptPart('hi')])]
+
+    async def scenario():
+        async with router.request_stream(messages, None, ModelRequestParameters()) as stream:
+            async for _ in stream:
+                pass
+        # An error raised by the caller while consuming is neither retried nor held against the target
+        with pytest.raises(asyncio.TimeoutError):
+            async with router.request_stream(messages, None, ModelRequestParameters()):
+                raise asyncio.TimeoutError
+
+    asyncio.run(scenario())
+    assert calls == ['a', 'b', 'a', 'b']
+    stats = {s['target']: s for s in router.endpoint_stats()}
+    assert stats['a']['failures'] == 2 and stats['b']['failures'] == 0
+    assert stats['a']['in_flight'] == stats['b']['in_flight'] == 0
+
+
+def test_latency_strategy_prefers_fastest_target():
+    calls = []
+    router = RoutingModel('pool', [('slow', _model('slow', calls)), ('fast', _model('fast', calls))])
+    stats = {s.label: s for _, s in router._targets}
+    stats['slow'].record_success(2.0)
+    stats['fast'].record_success(0.2)
+    assert Agent(router).run_sync('hi').output == 'from fast'
+
+
+def test_router_provider_from_config(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('MODEL_PROVIDER', raising=False)
+    monkeypatch.delenv('MODEL_NAME', raising=False)
+    tmp_path.joinpath('providers.json').write_text('''{"providers":[
+      {"name":"local","type":"router","strategy":"failover",
+       "targets":[{"provider":"lm1"},{"provider":"lm2","model":"m2"}]},
+      {"name":"lm1","type":"openai-compatible","base_url":"http://localhost:1234/v1","api_key_env":"LM1_KEY","api_key_optional":true,"models":["m1"]},
+      {"name":"lm2","type":"openai-compatible","base_url":"http://localhost:1235/v1","api_key_env":"LM2_KEY","api_key_optional":true,"models":["m2"]}
+    ]}''')
+    from models.provider_config import build_chat_model, list_available_models
+    router = build_chat_model('local')
+    assert isinstance(router, RoutingModel)
+    assert [s['target'] for s in router.endpoint_stats()] == ['lm1:m1', 'lm2:m2']
+    assert build_chat_model('local') is router
+    assert ('local', 'auto') in list_available_models()
+    # Target health is visible in /stats and saved with the session
+    from cli.prompt import _render_stats
+    from models.provider_config import provider_stats
+    assert '[router local] target=lm1:m1' in _render_stats()
+    assert any(r['router'] == 'local' and len(r['targets']) == 2 for r in provider_stats()['routers'])
+
+
+def test_router_with_unknown_target_is_rejected(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('providers.json').write_text('{"providers":[{"name":"local","type":"router","targets":[{"provider":"nope"}]}]}')
+    from models.provider_config import load_providers_config
+    with pytest.raises(RuntimeError) as e:
+        load_providers_config()
+    assert "unknown provider 'nope'" in str(e.value)
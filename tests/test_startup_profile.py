@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from cli.startup_profile import parse_importtime, profile_startup, summarize
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     openai.types
+import time:       400 |        500 |   openai
+import time:        50 |         50 |   pathspec.util
+import time:        20 |        570 | cli.runner
+"""
+
+
+def test_parse_and_summarize_importtime_report():
+    rows = parse_importtime(SAMPLE)
+    assert rows[0] == ('openai.types', 100, 100)
+    assert len(rows) == 4
+    report = summarize(rows, top=2)
+    assert report.startswith('Startup imports: 1 ms across 4 modules')
+    by_package = report.split('Self time by top-level package:\n')[1].split('\n\n')[0].split('\n')
+    assert by_package[0].split()[-1] == 'openai' and '87.7%' in by_package[0]
+    assert report.rstrip().split('\n')[-1].split()[-1] == 'openai'
+
+
+def test_heavy_optional_modules_are_not_imported_eagerly():
+    code = ("import sys, cli.prompt, tools.search_tool, tools.glob_tool, toolsets.root_agent_toolset\n"
+            "from tools import task_tool\n"
+            "loaded = [m for m in ('pathspec', 'prompt_toolkit') if m in sys.modules]\n"
+            "assert not loaded, loaded\n"
+            "assert task_tool.get_sub_agent_registry().loads == 0\n")
+    proc = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_profile_runs_from_outside_the_checkout(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    report = profile_startup(modules=('cli.startup_profile',), top=3)
+    assert '[import failed]' not in report
+    assert 'cli' in report
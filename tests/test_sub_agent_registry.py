@@ -0,0 +1,72 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai.messages import ModelResponse, SystemPromptPart, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from models.agent_deps import AgentDeps
+from sub_agents import create_sub_agent
+from tools.task_tool import SubAgentDefinition, SubAgentRegistry
+
+PROVIDERS_JSON = '{"providers":[{"name":"offline","type":"replay","replay_dir":"rec"},{"name":"other","type":"replay","replay_dir":"rec2"}]}'
+
+
+def test_definitions_reload_only_when_agents_dir_changes(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    agents = tmp_path / 'Agents'
+    agents.mkdir()
+    (agents / 'reviewer.md').write_text('# Reviews code\nBe strict.')
+    registry = SubAgentRegistry()
+
+    assert [d.type for d in registry.definitions()] == ['reviewer']
+    registry.definitions()
+    assert registry.loads == 1
+
+    (agents / 'reviewer.md').write_text('# Reviews code carefully\nBe strict.')
+    (agents / 'greeter.md').write_text('# Says hello')
+    defs = registry.definitions()
+    assert registry.loads == 2
+    assert [d.type for d in defs] == ['greeter', 'reviewer']
+    assert defs[1].description == 'Reviews code carefully'
+
+
+def test_agents_memoized_per_type_provider_and_model(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('MODEL_PROVIDER', raising=False)
+    monkeypatch.delenv('MODEL_NAME', raising=False)
+    tmp_path.joinpath('providers.json').write_text(PROVIDERS_JSON)
+    registry = SubAgentRegistry()
+    general = SubAgentDefinition(type='general-purpose', description='', prompt='')
+    reviewer = SubAgentDefinition(type='reviewer', description='', prompt='Be strict.')
+
+    first = registry.agent_for(general)
+    assert registry.agent_for(general) is first
+    assert registry.agent_for(reviewer) is not first
+    assert registry.agent_for(general, provider_name='other') is not first
+    assert registry.agent_builds == 3
+
+    # An edited definition gets a fresh agent
+    edited = SubAgentDefinition(type='reviewer', description='', prompt='Be lenient.')
+    assert registry.agent_for(edited) is not registry.agent_for(reviewer)
+
+
+def test_sub_agent_sends_system_prompt_once(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('MODEL_PROVIDER', raising=False)
+    monkeypatch.delenv('MODEL_NAME', raising=False)
+    tmp_path.joinpath('providers.json').write_text(PROVIDERS_JSON)
+    seen = []
+
+    def fn(messages, info):
+        seen.extend(p.content for m in messages for p in m.parts if isinstance(p, SystemPromptPart))
+        return ModelResponse(parts=[TextPart('ok')])
+
+    agent = create_sub_agent('You are a careful reviewer.')
+    with agent.override(model=FunctionModel(fn)):
+        agent.run_sync('review', deps=AgentDeps(cwd=str(tmp_path)))
+    assert seen.count('You are a careful reviewer.') == 1
+    assert any(s.startswith('The current working directory is:') for s in seen)
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+import sub_agents
+from models.agent_deps import AgentDeps
+from models.task_request import TaskRequest
+from sub_agents import SubAgentExecutor, SubAgentTimeout
+from tools import task_tool
+
+
+def test_executor_bounds_parallelism():
+    executor = SubAgentExecutor(max_parallel=2, timeout_s=None)
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return executor.running
+
+    async def main():
+        return await asyncio.gather(*(executor.run(work) for _ in range(5)))
+
+    assert max(asyncio.run(main())) <= 2
+    assert executor.max_running == 2
+    assert executor.completed == 5
+    # A fresh event loop gets its own semaphore
+    assert asyncio.run(executor.run(work)) == 1
+
+
+def test_executor_deadline():
+    executor = SubAgentExecutor(max_parallel=1, timeout_s=0.05)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(SubAgentTimeout):
+        asyncio.run(executor.run(slow))
+    assert executor.timed_out == 1
+    assert executor.running == 0
+
+
+def test_task_batch_runs_branches_concurrently(monkeypatch, tmp_path):
+    monkeypatch.setattr(sub_agents, '_executor', SubAgentExecutor(max_parallel=5, timeout_s=5))
+
+    def fake_create_sub_agent(system_prompt, provider_name=None, model_name=None):
+        async def fn(messages, info):
+            prompt = messages[-1].parts[-1].content
+            await asyncio.sleep(0.2)
+            return ModelResponse(parts=[TextPart(f'done: {prompt}')])
+        return Agent(FunctionModel(fn), deps_type=AgentDeps)
+
+    monkeypatch.setattr(task_tool, 'create_sub_agent', fake_create_sub_agent)
+    task_tool.get_sub_agent_registry().clear()
+    ctx = SimpleNamespace(deps=AgentDeps(cwd=str(tmp_path)))
+    tasks = [TaskRequest(description=f'branch {i}', prompt=f'explore {i}') for i in range(5)]
+    tasks.append(TaskRequest(description='bad', prompt='x', subagent_type='missing'))
+
+    started = time.perf_counter()
+    out = asyncio.run(task_tool.task_batch(ctx, tasks))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.8
+    assert out.index('done: explore 0') < out.index('done: explore 4')
+    assert "## Task 6: bad (missing)\nUnknown subagent_type 'missing'" in out
+
+
+def test_task_reports_timeout(monkeypatch, tmp_path):
+    monkeypatch.setattr(sub_agents, '_executor', SubAgentExecutor(max_parallel=1, timeout_s=0.05))
+
+    def fake_create_sub_agent(system_prompt, provider_name=None, model_name=None):
+        async def fn(messages, info):
+            await asyncio.sleep(1)
+            return ModelResponse(parts=[TextPart('late')])
+        return Agent(FunctionModel(fn), deps_type=AgentDeps)
+
+    monkeypatch.setattr(task_tool, 'create_sub_agent', fake_create_sub_agent)
+    task_tool.get_sub_agent_registry().clear()
+    ctx = SimpleNamespace(deps=AgentDeps(cwd=str(tmp_path)))
+    out = asyncio.run(task_tool.task(ctx, 'slow', 'take forever', 'general-purpose'))
+    assert out.startswith('Error: sub-agent did not finish within 0.05s')
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from models.agent_deps import AgentDeps
+from tools import task_tool
+from tools.task_cache import TaskResultCache, agent_fingerprint, normalize_prompt
+
+
+def test_normalized_prompt_and_persistence(tmp_path):
+    cache = TaskResultCache(str(tmp_path))
+    cache.put('general-purpose', 'Find where  Foo is defined.', 'in foo.py')
+    assert normalize_prompt('find where foo is DEFINED') == normalize_prompt('Find where  Foo is defined.')
+    assert cache.get('general-purpose', 'find where foo is DEFINED') == 'in foo.py'
+    assert cache.get('other-type', 'Find where Foo is defined.') is None
+    # Survives a new process / instance
+    assert TaskResultCache(str(tmp_path)).get('general-purpose', 'find where foo is defined') == 'in foo.py'
+
+
+def test_referenced_file_change_invalidates(tmp_path):
+    src = tmp_path / 'mod.py'
+    src.write_text('def foo(): pass\n')
+    cache = TaskResultCache(str(tmp_path))
+    cache.put('general-purpose', 'Summarize mod.py', 'summary v1')
+    assert cache.get('general-purpose', 'Summarize mod.py') == 'summary v1'
+    src.write_text('def foo(): return 1\n')
+    assert cache.get('general-purpose', 'Summarize mod.py') is None
+
+
+def test_other_definition_or_model_misses(tmp_path):
+    cache = TaskResultCache(str(tmp_path))
+    original = agent_fingerprint('You review code.', 'local', 'model-a')
+    cache.put('reviewer', 'Review the parser', 'looks fine', original)
+    assert cache.get('reviewer', 'Review the parser', original) == 'looks fine'
+    assert cache.get('reviewer', 'Review the parser', agent_fingerprint('You review code strictly.', 'local', 'model-a')) is None
+    assert cache.get('reviewer', 'Review the parser', agent_fingerprint('You review code.', 'local', 'model-b')) is None
+    assert cache.get('reviewer', 'Review the parser', agent_fingerprint('You review code.', 'remote', 'model-a')) is None
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    cache = TaskResultCache(str(tmp_path), ttl_s=60, max_entries=2)
+    cache.put('t', 'a', '1')
+    cache.put('t', 'b', '2')
+    cache.get('t', 'a')  # 'a' becomes most recently used
+    cache.put('t', 'c', '3')
+    assert cache.get('t', 'b') is None
+    assert cache.get('t', 'a') == '1'
+    cache._entries[cache.key('t', 'c')]['created_at'] = time.time() - 120
+    assert cache.get('t', 'c') is None
+
+
+def test_task_tool_serves_repeat_prompt_from_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv('COGENT_TASK_CACHE', '1')
+    runs = []
+
+    def fake_create_sub_agent(system_prompt, provider_name=None, model_name=None):
+        def fn(messages, info):
+            runs.append(1)
+            return ModelResponse(parts=[TextPart('sub-agent answer')])
+        return Agent(FunctionModel(fn), deps_type=AgentDeps)
+
+    monkeypatch.setattr(task_tool, 'create_sub_agent', fake_create_sub_agent)
+    task_tool.get_sub_agent_registry().clear()
+    ctx = SimpleNamespace(deps=AgentDeps(cwd=str(tmp_path)))
+    first = asyncio.run(task_tool.task(ctx, 'find', 'Find the entrypoint', 'general-purpose'))
+    second = asyncio.run(task_tool.task(ctx, 'find', 'find the entrypoint ', 'general-purpose'))
+    assert first == second == 'sub-agent answer'
+    assert len(runs) == 1
@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from models.agent_deps import AgentDeps
+from models.todo_item import TodoItem, TodoState
+from models.todo_patch import TodoPatch
+from models.todo_store import TodoStore
+from tools.todo_write_tool import todo_write
+
+
+def _ctx(store):
+    return SimpleNamespace(deps=AgentDeps(cwd='/', todos=store))
+
+
+def test_full_list_then_patches_reply_with_diff_only(tmp_path):
+    store = TodoStore.for_session(tmp_path, 'abc')
+    ctx = _ctx(store)
+    out = todo_write(ctx, todos=[
+        TodoItem(id=1, description='Write parser', state=TodoState.in_progress),
+        TodoItem(id=2, description='Add tests', state=TodoState.pending),
+    ])
+    assert out.split('\n') == [
+        'Updated TODO list',
+        '+ [1] in_progress: Write parser',
+        '+ [2] pending: Add tests',
+        '📊 1 pending, 1 in progress, 0 completed',
+    ]
+    out = todo_write(ctx, updates=[TodoPatch(id=1, state=TodoState.completed), TodoPatch(id=3, description='Docs')])
+    assert out.split('\n')[1:3] == ['~ [1] in_progress -> completed: Write parser', '+ [3] pending: Docs']
+    assert 'Add tests' not in out
+    out = todo_write(ctx, remove=[2])
+    assert '- [2] Add tests' in out
+    assert todo_write(ctx, updates=[TodoPatch(id=3, description='Docs')]).startswith('TODO list unchanged')
+
+
+def test_state_is_persisted_and_resumed(tmp_path):
+    store = TodoStore.for_session(tmp_path, 'abc')
+    store.patch([TodoPatch(id=7, description='Ship it', state=TodoState.in_progress)])
+    path = tmp_path / '.cogent' / 'sessions' / 'abc.todos.json'
+    assert json.loads(path.read_text())['todos'] == [{'id': 7, 'description': 'Ship it', 'state': 'in_progress'}]
+    resumed = TodoStore.for_session(tmp_path, 'abc')
+    assert resumed.items() == store.items()
+
+    # A new session can start from the list an earlier one left; the earlier file is untouched
+    follow_up = TodoStore.for_session(tmp_path, 'def', resume_from='abc')
+    assert follow_up.items() == store.items()
+    follow_up.patch([TodoPatch(id=7, state=TodoState.completed)])
+    assert TodoStore.for_session(tmp_path, 'abc').items() == store.items()
+    assert TodoStore.for_session(tmp_path, 'def').items()[0].state == TodoState.completed
+    with pytest.raises(FileNotFoundError):
+        TodoStore.for_session(tmp_path, 'ghi', resume_from='missing')
+
+
+def test_invalid_patch_changes_nothing(tmp_path):
+    store = TodoStore()
+    store.patch([TodoPatch(id=1, description='a')])
+    ctx = _ctx(store)
+    out = todo_write(ctx, updates=[TodoPatch(id=1, state=TodoState.completed), TodoPatch(id=2)])
+    assert out == 'Error: todo 2 does not exist; a description is required to create it'
+    assert store.items()[0].state == TodoState.pending
+    assert todo_write(ctx, remove=[9]) == 'Error: no todo with id 9'
+    assert todo_write(ctx, todos=[], remove=[1]).startswith("Error: pass either")
+
+
+def test_forked_deps_get_their_own_list():
+    parent = AgentDeps(cwd='/')
+    parent.todos.patch([TodoPatch(id=1, description='a')])
+    assert parent.fork().todos.items() == []
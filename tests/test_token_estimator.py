@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from models.token_estimator import HeuristicTokenizer, TokenEstimator, get_tokenizer
+from models.session_recorder import SessionRecorder
+
+
+class Part:
+    def __init__(self, content):
+        self.content = content
+
+
+class UserPromptPart(Part):
+    pass
+
+
+class ToolCallPart:
+    def __init__(self, tool_name, args):
+        self.tool_name = tool_name
+        self.args = args
+
+
+class Msg:
+    def __init__(self, parts):
+        self.parts = parts
+
+
+class CountingTokenizer(HeuristicTokenizer):
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text):
+        self.calls += 1
+        return super().count(text)
+
+
+def test_heuristic_counts_are_reasonable():
+    tok = HeuristicTokenizer()
+    assert tok.count('') == 0
+    text = 'def foo(bar):\n    return bar + 1\n'
+    n = tok.count(text)
+    # ~4 chars per token: allow a broad band around len/4
+    assert len(text) / 6 <= n <= len(text) / 2
+
+
+def test_forced_heuristic(monkeypatch):
+    monkeypatch.setenv('COGENT_TOKENIZER', 'heuristic')
+    assert get_tokenizer().name == 'heuristic'
+
+
+def test_message_counts_are_memoized():
+    tok = CountingTokenizer()
+    est = TokenEstimator(tokenizer=tok)
+    history = [
+        Msg([UserPromptPart('read the file please')]),
+        Msg([ToolCallPart('read', {'file_path': '/x.py'})]),
+    ]
+    first = est.count_messages(history)
+    calls = tok.calls
+    assert first > 0 and calls == 2
+    # Re-estimating the same history hits the memo only
+    assert est.count_messages(history) == first
+    assert tok.calls == calls
+    history.append(Msg([UserPromptPart('and another one')]))
+    est.count_messages(history)
+    assert tok.calls == calls + 1
+    assert est.estimate_prompt(history, 'next question') > est.count_messages(history)
+
+
+def test_recorder_writes_turn_telemetry(tmp_path):
+    class Usage:
+        requests = 2
+        tool_calls = 1
+        input_tokens = 120
+        output_tokens = 30
+
+    rec = SessionRecorder(tmp_path)
+    rec.record_turn(110, Usage(), 1.23456)
+    rec.record([Msg([UserPromptPart('hi')])])
+    data = json.loads(rec.path.read_text())
+    assert data['turns'] == [{
+        'turn': 1, 'estimated_input_tokens': 110, 'requests': 2, 'tool_calls': 1,
+        'input_tokens': 120, 'output_tokens': 30, 'elapsed_s': 1.235,
+    }]
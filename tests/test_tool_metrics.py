@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+
+from cli import prompt as prompt_mod
+from models.agent_deps import AgentDeps
+from tools import tool_metrics
+from tools.tool_metrics import LatencyHistogram, ToolMetricsRegistry, instrument_tool
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    registry = ToolMetricsRegistry()
+    monkeypatch.setattr(tool_metrics, '_registry', registry)
+    return registry
+
+
+def test_histogram_percentiles_are_within_a_bucket():
+    h = LatencyHistogram()
+    for ms in range(1, 101):
+        h.add(float(ms))
+    assert 50 <= h.percentile(50) <= 50 * 1.25
+    assert 95 <= h.percentile(95) <= 100
+    assert h.percentile(100) == 100.0
+    assert LatencyHistogram().percentile(50) == 0.0
+
+
+def test_busy_time_counts_overlapping_calls_once(fresh_registry):
+    registry = fresh_registry
+    registry.call_started(10.0)
+    registry.call_started(10.5)
+    registry.call_finished(11.0)
+    registry.call_finished(12.0)
+    registry.call_started(20.0)
+    registry.call_finished(20.5)
+    assert registry.busy_ms() == pytest.approx(2500.0)
+
+
+def test_instrumented_tool_records_payload_and_errors(tmp_path, fresh_registry):
+    data = tmp_path / 'blob.txt'
+    data.write_text('x' * 50_000)
+
+    def cat(file_path: str) -> str:
+        """Return a file's content."""
+        if not os.path.exists(file_path):
+            return "Error: missing"
+        with open(file_path) as f:
+            return f.read()
+
+    def boom() -> str:
+        raise RuntimeError('nope')
+
+    wrapped = instrument_tool(cat)
+    assert wrapped.__name__ == 'cat' and wrapped.__doc__ == cat.__doc__
+    assert wrapped(str(data)) == 'x' * 50_000
+    wrapped(str(tmp_path / 'absent'))
+    with pytest.raises(RuntimeError):
+        instrument_tool(boom)()
+
+    summary = fresh_registry.summary()
+    assert summary['cat']['calls'] == 2 and summary['cat']['errors'] == 1
+    assert summary['cat']['result_chars'] == 50_000 + len('Error: missing')
+    assert summary['cat']['result_tokens'] > 0
+    if os.path.exists('/proc/self/io'):
+        assert summary['cat']['bytes_read'] >= 50_000
+    assert (summary['boom']['calls'], summary['boom']['errors'], summary['boom']['result_chars']) == (1, 1, 0)
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/io'), reason='Linux only')
+def test_reads_on_helper_threads_are_counted(tmp_path, fresh_registry):
+    data = tmp_path / 'blob.txt'
+    data.write_text('y' * 80_000)
+
+    def cat_in_pool(file_path: str) -> str:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(data.read_text).result()
+
+    instrument_tool(cat_in_pool)(str(data))
+    assert fresh_registry.summary()['cat_in_pool']['bytes_read'] >= 80_000
+
+
+def test_agent_tool_calls_are_measured_and_shown_by_stats(tmp_path, fresh_registry, capsys):
+    from toolsets.common_agent_toolset import common_agent_toolset
+    (tmp_path / 'a.txt').write_text('hello')
+
+    def fn(messages, info):
+        if not any(isinstance(p, ToolReturnPart) for m in messages for p in getattr(m, 'parts', [])):
+            return ModelResponse(parts=[ToolCallPart('ls', {'path': str(tmp_path)})])
+        return ModelResponse(parts=[TextPart('done')])
+
+    agent = Agent(FunctionModel(fn), deps_type=AgentDeps, toolsets=[common_agent_toolset])
+    result = asyncio.run(agent.run('list', deps=AgentDeps(cwd=str(tmp_path))))
+    assert result.output == 'done'
+    assert fresh_registry.summary()['ls']['calls'] == 1
+
+    assert prompt_mod.process_slash_commands('/stats') == ''
+    out = capsys.readouterr().out
+    assert out.splitlines()[0].split()[:5] == ['tool', 'calls', 'err', 'p50', 'ms']
+    assert any(line.split()[:3] == ['ls', '1', '0'] for line in out.splitlines())
+    assert '[file cache]' in out and '[sub-agents]' in out
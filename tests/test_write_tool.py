@@ -0,0 +1,89 @@
+import os
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tools import atomic_io
+from tools.edit_tool import edit
+from tools.write_tool import write
+
+
+def test_write_reports_bytes_and_leaves_no_temp_files(tmp_path):
+    path = tmp_path / 'pkg' / 'new.txt'
+    out = write(str(path), 'héllo\n')
+    assert out.startswith(f'Wrote new file: {path} (7 bytes in ')
+    assert out.endswith(' ms)')
+    out = write(str(path), 'bye\n')
+    assert out.startswith(f'Overwrote file: {path} (4 bytes in ')
+    assert os.listdir(path.parent) == ['new.txt']
+
+
+def test_overwrite_keeps_mode_and_crlf(tmp_path):
+    path = tmp_path / 'run.bat'
+    path.write_bytes(b'@echo off\r\necho old\r\n')
+    os.chmod(path, 0o755)
+    write(str(path), '@echo off\necho new\n')
+    assert path.read_bytes() == b'@echo off\r\necho new\r\n'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o755
+    # Content that already carries CRLF is written verbatim
+    write(str(path), 'a\r\nb\r\n')
+    assert path.read_bytes() == b'a\r\nb\r\n'
+
+
+def test_new_file_gets_default_mode(tmp_path):
+    reference = tmp_path / 'reference.txt'
+    reference.write_text('x')
+    path = tmp_path / 'new.txt'
+    write(str(path), 'x')
+    assert stat.S_IMODE(os.stat(path).st_mode) == stat.S_IMODE(os.stat(reference).st_mode)
+
+
+def test_read_only_file_is_not_replaced(monkeypatch, tmp_path):
+    path = tmp_path / 'locked.txt'
+    path.write_text('keep\n')
+    os.chmod(path, 0o444)
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        # root passes access checks; deny as an unprivileged user would be
+        real_access = os.access
+        monkeypatch.setattr(atomic_io.os, 'access',
+                            lambda p, mode: False if mode == os.W_OK and p == os.path.realpath(path) else real_access(p, mode))
+    assert write(str(path), 'new\n').startswith('Error writing to file: [Errno 13]')
+    assert edit(str(path), 'keep', 'new').startswith('Error: failed to write changes to file: [Errno 13]')
+    assert path.read_text() == 'keep\n'
+
+
+def test_edit_keeps_crlf(tmp_path):
+    path = tmp_path / 'win.txt'
+    path.write_bytes(b'one\r\ntwo\r\n')
+    edit(str(path), 'two', 'three')
+    assert path.read_bytes() == b'one\r\nthree\r\n'
+
+
+def test_full_durability_fsyncs_file_and_directory(monkeypatch, tmp_path):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(atomic_io.os, 'fsync', lambda fd: (synced.append(fd), real_fsync(fd)))
+    monkeypatch.setenv('COGENT_WRITE_DURABILITY', 'none')
+    write(str(tmp_path / 'a.txt'), 'x')
+    assert synced == []
+    monkeypatch.setenv('COGENT_WRITE_DURABILITY', 'full')
+    write(str(tmp_path / 'a.txt'), 'y')
+    assert len(synced) == 2
+
+
+def test_concurrent_edits_do_not_lose_updates(tmp_path):
+    path = tmp_path / 'log.txt'
+    path.write_text('END\n')
+
+    def add(i):
+        return edit(str(path), 'END', f'entry {i}\nEND')
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(add, range(40)))
+    assert all(r.startswith('Replaced 1') for r in results)
+    lines = path.read_text().splitlines()
+    assert sorted(lines[:-1]) == sorted(f'entry {i}' for i in range(40))
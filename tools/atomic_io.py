@@ -0,0 +1,222 @@
+import errno
+import os
+import tempfile
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# none: rely on the rename alone; file: fsync the data before the rename;
+# full: additionally fsync the directory so the rename itself survives a crash
+WRITE_DURABILITY_ENV = 'COGENT_WRITE_DURABILITY'
+DURABILITY_LEVELS = ('none', 'file', 'full')
+DEFAULT_DURABILITY = 'none'
+
+# Large contents are encoded and written in slices rather than as one big copy
+_WRITE_CHUNK_CHARS = 1 << 20
+_NEWLINE_SNIFF_BYTES = 64 * 1024
+
+# Read once at import (os.umask can only be queried by setting it, which is not thread-safe)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_PATH_LOCKS: Dict[str, threading.RLock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def write_durability() -> str:
+    level = os.environ.get(WRITE_DURABILITY_ENV, DEFAULT_DURABILITY).strip().lower()
+    return level if level in DURABILITY_LEVELS else DEFAULT_DURABILITY
+
+
+def _lock_for(path: str) -> threading.RLock:
+    key = os.path.realpath(path)
+    with _PATH_LOCKS_GUARD:
+        lock = _PATH_LOCKS.get(key)
+        if lock is None:
+            lock = _PATH_LOCKS[key] = threading.RLock()
+        return lock
+
+
+@contextmanager
+def path_lock(*paths: str) -> Iterator[None]:
+    """Advisory in-process lock serializing writers (write/edit/multi_edit) of the same paths.
+
+    Locks are taken in a fixed order so callers locking several files cannot deadlock.
+    """
+    with ExitStack() as stack:
+        for key in sorted({os.path.realpath(p) for p in paths}):
+            stack.enter_context(_lock_for(key))
+        yield
+
+
+def detect_newline(path: str) -> Optional[str]:
+    """'\\r\\n' if the existing file uses CRLF line endings, '\\n' if LF, None if unknown/new."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(_NEWLINE_SNIFF_BYTES)
+    except OSError:
+        return None
+    first = head.find(b'\n')
+    if first == -1:
+        return None
+    return '\r\n' if first > 0 and head[first - 1:first] == b'\r' else '\n'
+
+
+def _newline_for(path: str, text: str) -> str:
+    """Newline translation for writing `text` over `path`, keeping the file's CRLF style.
+
+    Text that already contains CRLF is written verbatim.
+    """
+    if '\r\n' not in text and detect_newline(path) == '\r\n':
+        return '\r\n'
+    return ''
+
+
+def _temp_path_for(path: str) -> Tuple[int, str]:
+    """Create a temp file next to `path` (same filesystem, so os.replace is atomic)."""
+    directory = os.path.dirname(path) or "."
+    return tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+
+
+def _chunks(text: str) -> Iterable[str]:
+    for start in range(0, len(text), _WRITE_CHUNK_CHARS):
+        yield text[start:start + _WRITE_CHUNK_CHARS]
+
+
+def _write_temp(path: str, text: str, encoding: str, durability: str) -> Tuple[str, int]:
+    """Stream `text` into a sibling temp file; returns (temp_path, bytes_written)."""
+    newline = _newline_for(path, text)
+    fd, tmp_path = _temp_path_for(path)
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline=newline) as f:
+            for chunk in _chunks(text):
+                f.write(chunk)
+            f.flush()
+            if durability != 'none':
+                os.fsync(f.fileno())
+            written = f.buffer.tell()
+        try:
+            # Keep the permissions of the file being replaced
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            # mkstemp creates 0600; new files get what open() would have given them
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    return tmp_path, written
+
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:  # pragma: no cover - e.g. platforms without directory fds
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _check_writable(path: str) -> None:
+    """Refuse read-only targets, as an in-place open(path, "w") would.
+
+    The rename only needs write access to the directory, so without this a
+    0444 file would be silently replaced.
+    """
+    if os.path.exists(path) and not os.access(path, os.W_OK):
+        raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), path)
+
+
+def atomic_write_text(path: str, text: str, encoding: str = "utf-8", durability: Optional[str] = None) -> int:
+    """Replace `path` with `text` so readers see either the old or the new file, never a partial one.
+
+    Keeps the replaced file's mode and CRLF line endings; a symlink is followed
+    and its target replaced, so the link itself survives. Read-only files raise
+    PermissionError. The path gets a new inode, so other hard links to the old
+    file keep the old content. Returns the number of bytes written.
+    """
+    durability = durability or write_durability()
+    path = os.path.realpath(path)
+    _check_writable(path)
+    tmp_path, written = _write_temp(path, text, encoding, durability)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    if durability == 'full':
+        _fsync_dir(path)
+    return written
+
+
+def atomic_write_many(contents: Dict[str, str], encoding: str = "utf-8", durability: Optional[str] = None) -> int:
+    """Replace several files all-or-nothing; returns the total number of bytes written.
+
+    Every new version is first written to a temp file; if any of those writes
+    fails nothing is touched. Files are then swapped in with `os.replace`; if a
+    swap fails, the files already replaced are restored from their original bytes
+    before the error is re-raised. Symlinks, read-only files and hard links are
+    handled as in `atomic_write_text`.
+    """
+    durability = durability or write_durability()
+    contents = {os.path.realpath(p): text for p, text in contents.items()}
+    for path in contents:
+        _check_writable(path)
+    originals: Dict[str, Optional[Tuple[bytes, int]]] = {}
+    for path in contents:
+        try:
+            with open(path, "rb") as f:
+                originals[path] = (f.read(), os.fstat(f.fileno()).st_mode & 0o7777)
+        except FileNotFoundError:
+            originals[path] = None
+
+    staged: List[Tuple[str, str]] = []
+    total = 0
+    try:
+        for path, text in contents.items():
+            tmp_path, written = _write_temp(path, text, encoding, durability)
+            staged.append((path, tmp_path))
+            total += written
+    except BaseException:
+        for _, tmp_path in staged:
+            _remove_quietly(tmp_path)
+        raise
+
+    replaced: List[str] = []
+    try:
+        for path, tmp_path in staged:
+            os.replace(tmp_path, path)
+            replaced.append(path)
+    except BaseException:
+        for _, tmp_path in staged[len(replaced):]:
+            _remove_quietly(tmp_path)
+        for path in reversed(replaced):
+            original = originals[path]
+            try:
+                if original is None:
+                    os.unlink(path)
+                else:
+                    data, mode = original
+                    fd, tmp_path = _temp_path_for(path)
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(data)
+                    os.chmod(tmp_path, mode)
+                    os.replace(tmp_path, path)
+            except OSError:  # pragma: no cover - best effort rollback
+                pass
+        raise
+    if durability == 'full':
+        for directory in {os.path.dirname(p) for p in contents}:
+            _fsync_dir(os.path.join(directory, ''))
+    return total
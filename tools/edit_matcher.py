@@ -0,0 +1,169 @@
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+# Windows scored exactly after the cheap anchor vote
+_MAX_SCORED_WINDOWS = 25
+# Without any anchor line, fall back to scoring every window only in files up to this many lines
+_MAX_BRUTE_FORCE_LINES = 300
+# Hard cap on the time spent scoring windows for one failed edit
+_SCORING_BUDGET_S = 0.25
+# A needle line anchors on file lines sharing at least this fraction of its distinctive words...
+_ANCHOR_MIN_OVERLAP = 0.6
+# ...ignoring words found on more lines than this (too common to locate anything)
+_MAX_POSTINGS = 500
+_SNIPPET_CHARS = 120
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class FuzzyCandidate:
+    line: int  # 1-based line where the candidate region starts
+    score: float  # similarity of whitespace-normalized text, 0..1
+    snippet: str  # first line of the candidate region
+    whitespace_only: bool  # identical once whitespace is normalized
+
+
+def find_matches(content: str, needle: str, max_matches: Optional[int] = None) -> List[int]:
+    """Offsets of non-overlapping exact occurrences of `needle`, left to right, in one pass."""
+    offsets: List[int] = []
+    if not needle:
+        return offsets
+    pos = content.find(needle)
+    while pos != -1:
+        offsets.append(pos)
+        if max_matches is not None and len(offsets) >= max_matches:
+            break
+        pos = content.find(needle, pos + len(needle))
+    return offsets
+
+
+def replace_at(content: str, offsets: List[int], old_len: int, new_string: str) -> str:
+    """Splice `new_string` over the `old_len`-long matches at `offsets` (as returned by find_matches)."""
+    pieces: List[str] = []
+    last = 0
+    for pos in offsets:
+        pieces.append(content[last:pos])
+        pieces.append(new_string)
+        last = pos + old_len
+    pieces.append(content[last:])
+    return "".join(pieces)
+
+
+def line_numbers(content: str, offsets: List[int]) -> List[int]:
+    """1-based line numbers for increasing offsets, counting newlines incrementally."""
+    numbers: List[int] = []
+    line, last = 1, 0
+    for pos in offsets:
+        line += content.count("\n", last, pos)
+        last = pos
+        numbers.append(line)
+    return numbers
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.split())
+
+
+def _anchor_votes(normalized: List[str], needle_lines: List[str], width: int) -> Counter:
+    """Votes for window starts implied by needle lines that fuzzily match file lines.
+
+    A file line matches a needle line when it shares most of the needle line's
+    distinctive words (looked up in an inverted index), so lines that differ by
+    a trailing comment, a renamed argument or punctuation still anchor the window.
+    """
+    needle_words = [set(_WORD.findall(l)) for l in needle_lines]
+    wanted = set().union(*needle_words)
+    postings: Dict[str, List[int]] = {}
+    for i, text in enumerate(normalized):
+        for word in wanted.intersection(_WORD.findall(text)):
+            lst = postings.setdefault(word, [])
+            if len(lst) <= _MAX_POSTINGS:
+                lst.append(i)
+
+    votes: Counter = Counter()
+    last_start = len(normalized) - width
+    for j, words in enumerate(needle_words):
+        usable = [w for w in words if len(postings.get(w, ())) <= _MAX_POSTINGS]
+        if not usable:
+            continue
+        overlap: Counter = Counter()
+        for w in usable:
+            overlap.update(postings.get(w, ()))
+        need = max(1.0, _ANCHOR_MIN_OVERLAP * len(usable))
+        for i, n in overlap.items():
+            start = i - j
+            if n >= need and 0 <= start <= last_start:
+                votes[start] += 1
+    return votes
+
+
+def fuzzy_candidates(content: str, needle: str, k: int = 3, min_score: float = 0.5) -> List[FuzzyCandidate]:
+    """Top-k regions of `content` that resemble `needle` after whitespace normalization.
+
+    Windows of the needle's line count are shortlisted by anchor votes (see
+    `_anchor_votes`); only small files are scanned window by window. A window
+    is scored as the mean similarity of its lines to the needle's lines, which
+    keeps each comparison small, and windows whose cheap upper bounds
+    (`real_quick_ratio`/`quick_ratio`) fall below `min_score` are skipped.
+    Scoring stops after `_SCORING_BUDGET_S`, so a failed edit never stalls.
+    """
+    lines = content.split("\n")
+    needle_lines = [_normalize(l) for l in needle.strip("\n").split("\n")]
+    width = len(needle_lines)
+    if not any(needle_lines) or width > len(lines):
+        return []
+    normalized = [_normalize(l) for l in lines]
+
+    votes = _anchor_votes(normalized, needle_lines, width)
+    if votes:
+        starts = [s for s, _ in votes.most_common(_MAX_SCORED_WINDOWS)]
+    elif len(lines) <= _MAX_BRUTE_FORCE_LINES:
+        starts = range(len(lines) - width + 1)
+    else:
+        return []
+
+    matchers = []
+    for text in needle_lines:
+        m = SequenceMatcher(autojunk=False)
+        m.set_seq2(text)
+        matchers.append(m)
+
+    deadline = time.monotonic() + _SCORING_BUDGET_S
+    scored = []
+    for start in starts:
+        if time.monotonic() > deadline:
+            break
+        window = normalized[start:start + width]
+        for m, text in zip(matchers, window):
+            m.set_seq1(text)
+        if sum(m.real_quick_ratio() for m in matchers) / width < min_score:
+            continue
+        if sum(m.quick_ratio() for m in matchers) / width < min_score:
+            continue
+        score = sum(m.ratio() for m in matchers) / width
+        if score >= min_score:
+            scored.append((score, start, window == needle_lines))
+    scored.sort(key=lambda t: (-t[0], t[1]))
+
+    out: List[FuzzyCandidate] = []
+    for score, start, same in scored[:k]:
+        snippet = lines[start].strip()
+        if len(snippet) > _SNIPPET_CHARS:
+            snippet = snippet[:_SNIPPET_CHARS - 3] + "..."
+        out.append(FuzzyCandidate(line=start + 1, score=round(score, 2), snippet=snippet, whitespace_only=same))
+    return out
+
+
+def describe_candidates(candidates: List[FuzzyCandidate]) -> str:
+    """Human/model-readable hint block for an edit that found no exact match."""
+    if not candidates:
+        return ""
+    rows = []
+    for c in candidates:
+        note = ", differs only in whitespace" if c.whitespace_only else ""
+        rows.append(f"  line {c.line} (similarity {c.score:.2f}{note}): {c.snippet}")
+    return "\nClosest matches (re-read these lines and copy them exactly):\n" + "\n".join(rows)
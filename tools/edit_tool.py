@@ -1,4 +1,11 @@
+import os
+from typing import Dict, Optional, Tuple
+
+from models.file_edit import FileEdit
 from models.tool_definition import ToolDefinition
+from tools.atomic_io import atomic_write_many, atomic_write_text, path_lock
+from tools.edit_matcher import describe_candidates, find_matches, fuzzy_candidates, line_numbers, replace_at
+from tools.file_cache import get_file_cache
 
 EDIT_TOOL_SYSTEM_PROMPT = """Performs exact string replacements in files. 
 
@@ -12,26 +19,46 @@ Usage:
     """
 
 
-def edit(
-        file_path: str,
-        old_string: str,
-        new_string: str,
-        replace_all: bool = False,
-    ) -> str:
-    """
-    Perform exact string replacement in an existing file.
+_MAX_REPORTED_LINES = 10
 
-    Args:
-        file_path (str): Absolute path to an existing file.
-        old_string (str): The exact substring to replace.
-        new_string (str): The replacement string.
-        replace_all (bool): If True, replace all occurrences; otherwise replace a single occurrence.
+MULTI_EDIT_TOOL_SYSTEM_PROMPT = """Applies several exact string replacements, to one or more files, as a single all-or-nothing change.
 
-    Returns:
-        str: A success message indicating how many occurrences were replaced, or an error message on failure.
-    """
-    import os
+Usage:
+- Each entry in `edits` takes the same file_path / old_string / new_string / replace_all as the Edit tool
+- Edits are applied in the order given; an edit sees the result of the earlier edits to the same file
+- Every edit is validated before anything is written. If any edit fails (not found, not unique, ...), no file is changed and the error names the failing edit
+- Each file is written once, atomically (temp file + rename), so a crash never leaves a half-written file
+- Prefer this over many Edit calls for multi-hunk refactors or renames that touch several files
+"""
 
+
+def _looks_like_prefix(s: str) -> bool:
+    """Detect pasted Read output: optional spaces + digits + tab line-number prefixes."""
+    if not s:
+        return False
+    # If the string starts with something like "   12\t" or contains "\n   12\t",
+    # it's likely the user pasted Read tool output including the numbering.
+    if s.lstrip().startswith("\t"):
+        # weird but treat as prefix-present
+        return True
+    # check beginning of string
+    first_line = s.splitlines()[0]
+    # if there is a leading tab and what precedes it are digits (maybe with spaces)
+    if "\t" in first_line:
+        left, _ = first_line.split("\t", 1)
+        if left.strip().isdigit():
+            return True
+    # also detect occurrences of "\n<spaces><digits>\t" anywhere
+    for part in ("\\n", "\n"):
+        if part in s:
+            for line in s.splitlines():
+                if line.lstrip().split("\t", 1)[0].strip().isdigit():
+                    return True
+    return False
+
+
+def _validate_edit(file_path: str, old_string: str, new_string: str) -> Optional[str]:
+    """Return an error message for an invalid edit request, or None."""
     # Basic validation
     if not file_path or not str(file_path).strip():
         return "Error: 'file_path' is required"
@@ -46,75 +73,159 @@ def edit(
         return "Error: 'new_string' must be different from 'old_string'"
 
     # Reject accidental inclusion of line-number prefix in supplied strings.
-    # The prefix format to detect: optional spaces + digits + tab
-    def _looks_like_prefix(s: str) -> bool:
-        if not s:
-            return False
-        # If the string starts with something like "   12\t" or contains "\n   12\t",
-        # it's likely the user pasted Read tool output including the numbering.
-        if s.lstrip().startswith("\t"):
-            # weird but treat as prefix-present
-            return True
-        # check beginning of string
-        first_line = s.splitlines()[0]
-        # if there is a leading tab and what precedes it are digits (maybe with spaces)
-        if "\t" in first_line:
-            left, _ = first_line.split("\t", 1)
-            if left.strip().isdigit():
-                return True
-        # also detect occurrences of "\n<spaces><digits>\t" anywhere
-        for part in ("\\n", "\n"):
-            if part in s:
-                for line in s.splitlines():
-                    if line.lstrip().split("\t", 1)[0].strip().isdigit():
-                        return True
-        return False
-
     if _looks_like_prefix(old_string) or _looks_like_prefix(new_string):
         return (
             "Error: do not include the Read tool's line-number prefix in "
             "'old_string' or 'new_string'. Remove the leading '<spaces><line-number>\\t' "
             "from any pasted Read output and try again."
         )
+    return None
 
-    # Load raw file content for exact replacement (we called Read to comply with the requirement)
+
+def _load_for_edit(file_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (content, error) using the shared file cache when possible."""
+    content = get_file_cache().read_text(file_path)
+    if content is not None:
+        return content, None
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+            return f.read(), None
     except Exception as e:
-        return f"Error: failed to open file for editing: {e}"
+        return None, f"Error: failed to open file for editing: {e}"
+
 
-    # Count exact occurrences
-    occurrences = content.count(old_string)
+def _apply_edit(content: str, old_string: str, new_string: str, replace_all: bool) -> Tuple[Optional[str], int, Optional[str]]:
+    """Apply one replacement in memory; returns (new_content, replaced, error)."""
+    # Single pass over the content; the offsets are reused for the replacement
+    offsets = find_matches(content, old_string)
+    occurrences = len(offsets)
     if occurrences == 0:
-        return "Error: 'old_string' not found in the file. Make it more specific or check the exact indentation/whitespace."
+        return None, 0, (
+            "Error: 'old_string' not found in the file. Make it more specific or check the exact indentation/whitespace."
+            + describe_candidates(fuzzy_candidates(content, old_string))
+        )
 
     if occurrences > 1 and not replace_all:
-        return (
-            f"Error: 'old_string' is not unique in the file (found {occurrences} occurrences). "
+        shown = line_numbers(content, offsets[:_MAX_REPORTED_LINES])
+        where = ", ".join(str(n) for n in shown) + (", ..." if occurrences > len(shown) else "")
+        return None, 0, (
+            f"Error: 'old_string' is not unique in the file (found {occurrences} occurrences, at lines {where}). "
             "Provide more surrounding context in 'old_string' to make it unique, or set 'replace_all' to true to replace every instance."
         )
 
-    # Perform the replacement
+    return replace_at(content, offsets, len(old_string), new_string), occurrences, None
+
+
+def edit(
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool = False,
+    ) -> str:
+    """
+    Perform exact string replacement in an existing file.
+
+    Args:
+        file_path (str): Absolute path to an existing file.
+        old_string (str): The exact substring to replace.
+        new_string (str): The replacement string.
+        replace_all (bool): If True, replace all occurrences; otherwise replace a single occurrence.
+
+    Returns:
+        str: A success message indicating how many occurrences were replaced, or an error message on failure.
+    """
+    error = _validate_edit(file_path, old_string, new_string)
+    if error:
+        return error
+
+    # Hold the path lock across read-modify-write so concurrent edits/writes cannot lose updates
+    with path_lock(file_path):
+        return _edit_locked(file_path, old_string, new_string, replace_all)
+
+
+def _edit_locked(file_path: str, old_string: str, new_string: str, replace_all: bool) -> str:
+    # Load raw file content for exact replacement (we called Read to comply with the requirement)
+    content, error = _load_for_edit(file_path)
+    if error:
+        return error
+
+    new_content, replaced, error = _apply_edit(content, old_string, new_string, replace_all)
+    if error:
+        return error
+
+    # Write back to the same file (do not create new files); atomic so a crash never truncates it
     try:
-        if replace_all:
-            new_content = content.replace(old_string, new_string)
-            replaced = occurrences
-        else:
-            # replace a single occurrence
-            new_content = content.replace(old_string, new_string, 1)
-            replaced = 1
-        # Write back to the same file (do not create new files)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
+        atomic_write_text(file_path, new_content)
     except Exception as e:
+        get_file_cache().invalidate(file_path)
         return f"Error: failed to write changes to file: {e}"
+    get_file_cache().update(file_path, new_content)
 
     return f"Replaced {replaced} occurrence(s) in {file_path}"
 
 
+def multi_edit(edits: list[FileEdit]) -> str:
+    """
+    Apply an ordered list of exact string replacements across one or more files, all or nothing.
+
+    Args:
+        edits (list[FileEdit]): Edits to apply in order; each has file_path, old_string, new_string and replace_all.
+
+    Returns:
+        str: A summary of replacements per file, or an error naming the first failing edit (no files changed).
+    """
+    if not edits:
+        return "Error: 'edits' must contain at least one edit"
+
+    with path_lock(*[e.file_path for e in edits if e.file_path]):
+        return _multi_edit_locked(edits)
+
+
+def _multi_edit_locked(edits: list[FileEdit]) -> str:
+    # Apply every edit in memory first; files are only written once all of them succeed.
+    # Keyed on the resolved path so a file reached through a symlink and directly is edited once.
+    contents: Dict[str, str] = {}
+    replaced_per_file: Dict[str, int] = {}
+    aliases: Dict[str, list] = {}  # resolved path -> paths as given, first one used in the summary
+    for n, e in enumerate(edits, start=1):
+        error = _validate_edit(e.file_path, e.old_string, e.new_string)
+        if error is None:
+            key = os.path.realpath(e.file_path)
+            names = aliases.setdefault(key, [])
+            if e.file_path not in names:
+                names.append(e.file_path)
+            if key not in contents:
+                contents[key], error = _load_for_edit(e.file_path)
+        if error is None:
+            new_content, replaced, error = _apply_edit(contents[key], e.old_string, e.new_string, e.replace_all)
+        if error:
+            return f"Error in edit #{n} ({e.file_path}), no files were changed: {error[len('Error: '):]}"
+        contents[key] = new_content
+        replaced_per_file[key] = replaced_per_file.get(key, 0) + replaced
+
+    try:
+        atomic_write_many(contents)
+    except Exception as exc:
+        for key in contents:
+            for path in aliases[key]:
+                get_file_cache().invalidate(path)
+        return f"Error: failed to write changes, no files were changed: {exc}"
+    for key, text in contents.items():
+        for path in aliases[key]:
+            get_file_cache().update(path, text)
+
+    lines = [f"Applied {len(edits)} edit(s) to {len(contents)} file(s):"]
+    lines += [f"- {aliases[key][0]}: {count} replacement(s)" for key, count in replaced_per_file.items()]
+    return "\n".join(lines)
+
+
 # Export a ToolDefinition preserving the original detailed usage prompt
 edit_tool_def = ToolDefinition(
     fn=edit,
     usage_system_prompt=EDIT_TOOL_SYSTEM_PROMPT,
-)
\ No newline at end of file
+)
+
+multi_edit_tool_def = ToolDefinition(
+    fn=multi_edit,
+    usage_system_prompt=MULTI_EDIT_TOOL_SYSTEM_PROMPT,
+)
@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+FILE_CACHE_MB_ENV = 'COGENT_FILE_CACHE_MB'
+DEFAULT_FILE_CACHE_MB = 64
+# A single file may take at most this fraction of the cache
+_MAX_ENTRY_FRACTION = 8
+_MAX_CHUNKS_PER_FILE = 8
+# Files modified this close to when they were read may change again within the
+# same mtime tick without a size change; such entries are re-validated by re-reading.
+_RACY_WINDOW_NS = 1_000_000_000
+
+
+class _Entry:
+    __slots__ = ('signature', 'text', 'lossy', 'racy', '_lines', 'lines_counted', 'chunks', 'nbytes')
+
+    def __init__(self, signature: Tuple[int, int], text: str, lossy: bool, racy: bool):
+        self.signature = signature
+        self.text = text
+        self.lossy = lossy  # decoded with errors='replace' because the file is not valid UTF-8
+        self.racy = racy
+        self._lines: Optional[List[str]] = None
+        self.lines_counted = False
+        self.chunks: 'OrderedDict[Tuple[int, int], str]' = OrderedDict()
+        self.nbytes = len(text)
+
+    def lines(self) -> List[str]:
+        """Lines as `for line in open(...)` would yield them, without trailing newlines."""
+        if self._lines is None:
+            lines = self.text.split('\n')
+            if lines and lines[-1] == '':
+                lines.pop()
+            self._lines = lines
+        return self._lines
+
+
+class FileContentCache:
+    """In-process LRU of decoded file contents, bounded by total size.
+
+    Entries are validated on every access by `(mtime_ns, size)` from a single
+    `stat`, so edits made outside the agent are picked up immediately.
+    Text is decoded exactly like `open(path, 'r', encoding='utf-8')` (universal
+    newlines). Rendered `read` chunks are cached alongside the content.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // _MAX_ENTRY_FRACTION
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._entries:
+            _, old = self._entries.popitem(last=False)
+            self.total_bytes -= old.nbytes
+            self.evictions += 1
+
+    def _store(self, path: str, entry: _Entry) -> None:
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self.total_bytes -= previous.nbytes
+            self._entries[path] = entry
+            self.total_bytes += entry.nbytes
+            self._evict()
+
+    def _entry(self, path: str) -> Optional[_Entry]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not self.enabled or st.st_size > self.max_entry_bytes:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature and not entry.racy:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        filled_ns = time.time_ns()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text, lossy = f.read(), False
+        except UnicodeDecodeError:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text, lossy = f.read(), True
+        except OSError:
+            return None
+        entry = _Entry(signature, text, lossy, racy=st.st_mtime_ns >= filled_ns - _RACY_WINDOW_NS)
+        self._store(path, entry)
+        return entry
+
+    def read_text(self, path: str) -> Optional[str]:
+        """Strictly decoded content, or None when the file is not cacheable or not valid UTF-8."""
+        entry = self._entry(path)
+        if entry is None or entry.lossy:
+            return None
+        return entry.text
+
+    def read_chunk(self, path: str, offset: int, limit: int,
+                   render: Callable[[List[str]], str]) -> Optional[str]:
+        """`render(lines[offset-1:offset-1+limit])`, memoized per file version; None if not cacheable."""
+        entry = self._entry(path)
+        if entry is None:
+            return None
+        key = (offset, limit)
+        with self._lock:
+            chunk = entry.chunks.get(key)
+            if chunk is not None:
+                entry.chunks.move_to_end(key)
+                return chunk
+        chunk = render(entry.lines()[offset - 1:offset - 1 + limit])
+        with self._lock:
+            if self._entries.get(path) is entry:
+                entry.chunks[key] = chunk
+                added = len(chunk)
+                if not entry.lines_counted:
+                    # The split lines hold roughly another copy of the text
+                    entry.lines_counted = True
+                    added += len(entry.text)
+                while len(entry.chunks) > _MAX_CHUNKS_PER_FILE:
+                    _, dropped = entry.chunks.popitem(last=False)
+                    added -= len(dropped)
+                entry.nbytes += added
+                self.total_bytes += added
+                self._evict()
+        return chunk
+
+    def update(self, path: str, text: str) -> None:
+        """Record content the agent itself just wrote, so the next read is a hit."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return
+        if not self.enabled or st.st_size > self.max_entry_bytes:
+            self.invalidate(path)
+            return
+        # Normalize like universal-newline decoding; the content is known exactly,
+        # so the entry is trusted despite its fresh mtime.
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        self._store(path, _Entry((st.st_mtime_ns, st.st_size), text, lossy=False, racy=False))
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self.total_bytes -= entry.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_cache: Optional[FileContentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_file_cache() -> FileContentCache:
+    """Process-wide cache shared by read and edit (size from COGENT_FILE_CACHE_MB; 0 disables)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                mb = float(os.environ.get(FILE_CACHE_MB_ENV, DEFAULT_FILE_CACHE_MB))
+            except ValueError:
+                mb = DEFAULT_FILE_CACHE_MB
+            _cache = FileContentCache(int(max(mb, 0) * 1024 * 1024))
+        return _cache
+
+
+def file_cache_stats() -> Dict[str, int]:
+    return get_file_cache().stats()
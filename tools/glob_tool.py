@@ -2,15 +2,124 @@ from models.tool_definition import ToolDefinition
 
 GLOB_TOOL_SYSTEM_PROMPT = """- Fast file pattern matching tool that works with any codebase size
 - Supports glob patterns like "**/*.js" or "src/**/*.ts"
-- Returns matching file paths sorted by modification time
+- Returns matching file paths sorted by modification time (newest first), capped at the 500 most recent; a trailing [truncated: ...] line means there were more matches, so narrow the pattern or path
+- Skips .git, node_modules, virtualenvs, build output and .gitignore'd directories unless the pattern names them explicitly (e.g. "node_modules/pkg/**/*.js")
 - Use this tool when you need to find files by name patterns
 - When you are doing an open ended search that may require multiple rounds of globbing and searching, use the Agent tool instead
 - You have the capability to call multiple tools in a single response. It is always better to speculatively perform multiple searches as a batch that are potentially useful.
 """
 
 
-import glob as glob_
+import fnmatch
+import heapq
 import os
+import re
+from typing import Iterator, List, Pattern, Tuple, Union
+
+from tools.search_tool import DEFAULT_SKIP_DIRS, _compile_gitignore
+
+GLOB_MAX_RESULTS = 500
+
+_Segment = Union[str, Pattern[str], None]  # literal name, compiled wildcard, or None for `**`
+
+
+def _compile_segments(pattern: str) -> List[_Segment]:
+    segments: List[_Segment] = []
+    for part in pattern.replace(os.sep, "/").split("/"):
+        if part in ("", "."):
+            continue
+        if part == "**":
+            if not segments or segments[-1] is not None:  # collapse repeated **
+                segments.append(None)
+        elif any(ch in part for ch in "*?["):
+            segments.append(re.compile(fnmatch.translate(part)))
+        else:
+            segments.append(part)
+    return segments
+
+
+def _closure(states: set, segments: List[_Segment]) -> set:
+    """Add the states reachable by letting a `**` match zero directories."""
+    out = set(states)
+    for i in sorted(states):
+        while i < len(segments) and segments[i] is None:
+            i += 1
+            out.add(i)
+    return out
+
+
+def _advance(states: set, segments: List[_Segment], name: str) -> set:
+    """Pattern positions reached after consuming one path component `name`.
+
+    Like glob.glob, wildcards and `**` do not match names starting with '.',
+    unless the pattern segment itself starts with '.'.
+    """
+    hidden = name.startswith(".")
+    nxt = set()
+    for i in states:
+        if i >= len(segments):
+            continue
+        seg = segments[i]
+        if seg is None:
+            if not hidden:
+                nxt.add(i)
+        elif isinstance(seg, str):
+            if seg == name:
+                nxt.add(i + 1)
+        elif (not hidden or seg.pattern.startswith(r"(?s:\.")) and seg.match(name):
+            nxt.add(i + 1)
+    return _closure(nxt, segments)
+
+
+def _literal_prefix(segments: List[_Segment]) -> Tuple[List[str], List[_Segment]]:
+    prefix: List[str] = []
+    # Keep the last segment in the matcher so a fully literal pattern still "matches" an entry
+    while len(segments) - len(prefix) > 1 and isinstance(segments[len(prefix)], str):
+        prefix.append(segments[len(prefix)])
+    return prefix, segments[len(prefix):]
+
+
+def _iter_matches(root: str, segments: List[_Segment], git_spec,
+                  dirs_only: bool = False) -> Iterator[Tuple[float, str]]:
+    """Yield (mtime, relative path) of entries under `root` matching `segments`.
+
+    Walks with os.scandir, descending only into directories some pattern
+    position can still continue through, and skipping DEFAULT_SKIP_DIRS and
+    gitignored directories unless the pattern names them literally. With
+    `dirs_only` (a pattern ending in `/`) only directories match, yielded with
+    a trailing `/` like glob.glob.
+    """
+    final = len(segments)
+    stack = [(root, "", _closure({0}, segments))]
+    while stack:
+        dir_path, rel_dir, states = stack.pop()
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            continue
+        for entry in entries:
+            name = entry.name
+            nxt = _advance(states, segments, name)
+            if not nxt:
+                continue
+            rel = f"{rel_dir}{name}"
+            explicit = any(i < final and segments[i] == name for i in states)
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not explicit and git_spec is not None and git_spec.match_file(rel + ("/" if is_dir else "")):
+                continue
+            if final in nxt and (is_dir or not dirs_only):
+                try:
+                    yield entry.stat().st_mtime, rel + "/" if dirs_only else rel
+                except OSError:
+                    pass  # dangling symlink / vanished entry
+            if (is_dir and any(i < final for i in nxt)
+                    and (explicit or name not in DEFAULT_SKIP_DIRS)
+                    and not entry.is_symlink()):
+                stack.append((entry.path, rel + "/", nxt))
+
 
 def glob(pattern: str, path: str = None) -> str:
     """
@@ -39,22 +148,36 @@ def glob(pattern: str, path: str = None) -> str:
         base_dir = "."
 
     try:
-        # If pattern is absolute, use it directly; otherwise join with base_dir
+        # If pattern is absolute, walk from the filesystem root; otherwise from base_dir
         if os.path.isabs(pattern):
-            search_pattern = pattern
-        else:
-            search_pattern = os.path.join(base_dir, pattern)
-
-        matches = glob_.glob(search_pattern, recursive=True)
-        if not matches:
+            base_dir = os.path.abspath(os.sep)
+        prefix, segments = _literal_prefix(_compile_segments(pattern))
+        if not segments:
+            return "No matches found"
+        root = os.path.join(base_dir, *prefix)
+        if not os.path.isdir(root):
             return "No matches found"
 
-        # Filter out non-files (optional) and sort by modification time (newest first)
-        # Keep directories too in case the pattern is meant to match them.
-        matches = [m for m in matches if os.path.exists(m)]
-        matches.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+        dirs_only = pattern.endswith(("/", os.sep))
+        matches = _iter_matches(root, segments, _compile_gitignore(root), dirs_only)
+        # Newest first without sorting (or holding) every match
+        total = 0
+
+        def counted() -> Iterator[Tuple[float, str]]:
+            nonlocal total
+            for item in matches:
+                total += 1
+                yield item
+
+        newest = heapq.nlargest(GLOB_MAX_RESULTS, counted(), key=lambda t: t[0])
+        if not newest:
+            return "No matches found"
 
-        return "\n".join(matches)
+        out = "\n".join(os.path.join(root, rel) for _, rel in newest)
+        if total > len(newest):
+            out += (f"\n[truncated: showing the {len(newest)} most recently modified of {total} matches; "
+                    "narrow the pattern or path]")
+        return out
     except Exception as e:
         return f"Error running Glob: {e}"
 
@@ -63,4 +186,4 @@ def glob(pattern: str, path: str = None) -> str:
 glob_tool_def = ToolDefinition(
     fn=glob,
     usage_system_prompt=GLOB_TOOL_SYSTEM_PROMPT,
-)
\ No newline at end of file
+)
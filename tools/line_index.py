@@ -0,0 +1,112 @@
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, Optional, Tuple
+
+# One checkpoint every LINE_INDEX_STRIDE lines: ~8 bytes of index per 1000 lines
+LINE_INDEX_STRIDE = 1000
+# Below this size a linear scan is cheaper than building (and caching) an index
+LINE_INDEX_MIN_BYTES = 1_000_000
+_MAX_CACHED_INDEXES = 32
+_CHUNK_BYTES = 1 << 20
+# Universal newlines, as the text decoder and the file cache split lines
+_LINE_BREAK = re.compile(rb'\r\n|\r|\n')
+
+
+class LineIndex:
+    """Sparse map from line number to byte offset for one file version.
+
+    `offsets[k]` is the byte offset where line `k * stride + 1` starts. The
+    index is extended lazily: only as much of the file is scanned as the
+    furthest line requested so far requires. Lines end at `\n`, `\r\n` or a
+    lone `\r`, the same rule `open(..., "r")` applies when reading them back.
+    """
+
+    def __init__(self, path: str, signature: Tuple[int, int], stride: int = LINE_INDEX_STRIDE):
+        self.path = path
+        self.signature = signature
+        self.stride = stride
+        self.offsets = array('Q', [0])
+        self._scanned_bytes = 0
+        self._newlines = 0  # line breaks seen in the scanned prefix
+        self.complete = signature[1] == 0
+        self._lock = threading.Lock()
+
+    def _extend(self, until_line: int) -> None:
+        """Scan forward until the checkpoint for `until_line` is known or EOF."""
+        with open(self.path, 'rb') as f:
+            f.seek(self._scanned_bytes)
+            while not self.complete and len(self.offsets) * self.stride < until_line:
+                chunk = f.read(_CHUNK_BYTES)
+                if not chunk:
+                    self.complete = True
+                    break
+                if chunk.endswith(b'\r'):
+                    # Keep a CRLF split across chunks together
+                    chunk += f.read(1)
+                base = self._scanned_bytes
+                # Offsets (relative to chunk start) just past each line break in the chunk
+                if b'\r' in chunk:
+                    ends = [m.end() for m in _LINE_BREAK.finditer(chunk)]
+                else:
+                    ends = list(accumulate(len(p) + 1 for p in chunk.split(b'\n')[:-1]))
+                # Line `k * stride + 1` starts right after line break number `k * stride`
+                first = len(self.offsets) * self.stride
+                for n in range(first, self._newlines + len(ends) + 1, self.stride):
+                    self.offsets.append(base + ends[n - self._newlines - 1])
+                self._newlines += len(ends)
+                self._scanned_bytes += len(chunk)
+
+    def seek_point(self, line: int) -> Tuple[int, int]:
+        """Return (byte_offset, line_number) of the nearest checkpoint at or before `line`."""
+        with self._lock:
+            if not self.complete and line > len(self.offsets) * self.stride:
+                self._extend(line)
+            k = min((line - 1) // self.stride, len(self.offsets) - 1)
+            return self.offsets[k], k * self.stride + 1
+
+
+_INDEXES: 'OrderedDict[str, LineIndex]' = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+_stats: Dict[str, int] = {'hits': 0, 'builds': 0}
+
+
+def get_line_index(path: str) -> Optional[LineIndex]:
+    """Cached index for `path`, rebuilt when its mtime_ns or size changes.
+
+    Returns None for files too small to benefit (or that cannot be stat'ed).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if st.st_size < LINE_INDEX_MIN_BYTES:
+        return None
+    signature = (st.st_mtime_ns, st.st_size)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(path)
+        if index is not None and index.signature == signature:
+            _INDEXES.move_to_end(path)
+            _stats['hits'] += 1
+            return index
+        index = LineIndex(path, signature)
+        _INDEXES[path] = index
+        _INDEXES.move_to_end(path)
+        while len(_INDEXES) > _MAX_CACHED_INDEXES:
+            _INDEXES.popitem(last=False)
+        _stats['builds'] += 1
+        return index
+
+
+def line_index_stats() -> Dict[str, int]:
+    with _INDEXES_LOCK:
+        return {'indexes': len(_INDEXES), **_stats}
+
+
+def clear_line_indexes() -> None:
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
+        _stats.update(hits=0, builds=0)
@@ -1,18 +1,58 @@
+import fnmatch
 import os
-from fnmatch import fnmatch
+import re
+from typing import Optional
 
 from models.tool_definition import ToolDefinition
+from tools.search_tool import DEFAULT_SKIP_DIRS
 
 LS_TOOL_SYSTEM_PROMPT = """Lists files and directories in a given path. The path parameter must be an absolute path, not a relative path. You can optionally provide an array of glob patterns to ignore with the ignore parameter. You should generally prefer the Glob and Search tools, if you know which directories to search.
+
+- Set depth > 1 to also list subdirectories (entries are then shown relative to path; .git, node_modules and similar directories are listed but not expanded)
+- Large listings are paged: at most `limit` entries (default 1000) are returned, followed by a summary line with the total and the offset to continue from
 """
 
-def ls(path: str, ignore: list[str] = None) -> str:
+LS_DEFAULT_LIMIT = 1000
+LS_MAX_DEPTH = 10
+
+
+def _compile_ignore(patterns: list) -> Optional[re.Pattern]:
+    """One regex for all ignore globs (non-string patterns are skipped silently)."""
+    parts = [f"(?:{fnmatch.translate(p)})" for p in patterns if isinstance(p, str)]
+    return re.compile("|".join(parts)) if parts else None
+
+
+def _walk(path: str, rel_prefix: str, depth: int, ignore_re: Optional[re.Pattern], out: list) -> None:
+    """Append entries of `path` (sorted, dirs marked with '/') and, within `depth`, their children."""
+    with os.scandir(path) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        # Match both the basename and the absolute path against the patterns
+        if ignore_re is not None and (ignore_re.match(entry.name) or ignore_re.match(entry.path)):
+            continue
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        out.append(rel_prefix + entry.name + ("/" if is_dir else ""))
+        if (is_dir and depth > 1 and entry.name not in DEFAULT_SKIP_DIRS
+                and not entry.is_symlink()):
+            try:
+                _walk(entry.path, rel_prefix + entry.name + "/", depth - 1, ignore_re, out)
+            except OSError:
+                continue  # unreadable subdirectory
+
+
+def ls(path: str, ignore: list[str] = None, depth: int = 1, offset: int = 0, limit: int = None) -> str:
     """
     Lists files and directories in a given path.
 
     Args:
         path (str): The absolute path to the directory to list (must be absolute, not relative).
         ignore (list[str], optional): An array of glob patterns to ignore.
+        depth (int, optional): How many directory levels to list (1 = direct children only). Defaults to 1.
+        offset (int, optional): Number of entries to skip, for paging through large directories. Defaults to 0.
+        limit (int, optional): Max number of entries to return. Defaults to 1000.
 
     Returns:
         str: A newline-separated listing of files and directories (directories marked with '/'), or an error message.
@@ -32,29 +72,37 @@ def ls(path: str, ignore: list[str] = None) -> str:
     elif not isinstance(ignore, (list, tuple)):
         return "Error: 'ignore' must be an array of glob patterns"
 
+    # Validate paging / depth
     try:
-        entries = sorted(os.listdir(path))
-        filtered = []
-        for name in entries:
-            full = os.path.join(path, name)
-            skip = False
-            for pat in ignore:
-                # skip non-string patterns silently
-                if not isinstance(pat, str):
-                    continue
-                # Match both the basename and the absolute path against the pattern.
-                if fnmatch(name, pat) or fnmatch(full, pat):
-                    skip = True
-                    break
-            if skip:
-                continue
-            # Mark directories with a trailing slash for clarity
-            filtered.append(name + ("/" if os.path.isdir(full) else ""))
-
-        if not filtered:
+        depth = int(depth)
+        offset = int(offset)
+        limit = LS_DEFAULT_LIMIT if limit is None else int(limit)
+    except Exception:
+        return "Error: 'depth', 'offset' and 'limit' must be integers"
+    if depth < 1 or depth > LS_MAX_DEPTH:
+        return f"Error: 'depth' must be between 1 and {LS_MAX_DEPTH}"
+    if offset < 0:
+        return "Error: 'offset' must be >= 0"
+    if limit < 1:
+        return "Error: 'limit' must be >= 1"
+
+    try:
+        listing: list[str] = []
+        _walk(path, "", depth, _compile_ignore(ignore), listing)
+
+        if not listing:
             return "No files or directories found"
 
-        return "\n".join(filtered)
+        page = listing[offset:offset + limit]
+        if not page:
+            return f"No entries at offset {offset} ({len(listing)} entries total)"
+        out = "\n".join(page)
+        if len(page) < len(listing):
+            summary = f"[showing entries {offset + 1}-{offset + len(page)} of {len(listing)}"
+            if offset + len(page) < len(listing):
+                summary += f"; pass offset={offset + len(page)} to see more"
+            out += "\n" + summary + "]"
+        return out
     except Exception as e:
         return f"Error running LS: {e}"
 
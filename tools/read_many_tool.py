@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from models.file_read_request import FileReadRequest
+from models.tool_definition import ToolDefinition
+from tools.read_tool import read
+
+READ_MANY_TOOL_SYSTEM_PROMPT = """Reads several files in one call. Each entry takes the same file_path / offset / limit as the Read tool.
+
+Usage:
+- Prefer this over several consecutive Read calls when you already know which files you need (e.g. all modules of a package, a test and its implementation)
+- Files are returned in the order given, each under a `==> /abs/path <==` header, in the same `cat -n` format as Read
+- The combined output is capped (default 100000 characters). A file that does not fit is cut at a line boundary with a reminder giving the offset to continue from; files after the budget is exhausted are listed as skipped
+- Errors (missing file, relative path, bad offset) are reported per file and do not affect the other files
+- At most 50 files per call
+"""
+
+DEFAULT_TOTAL_BUDGET_CHARS = 100_000
+MAX_FILES = 50
+_MAX_WORKERS = 8
+
+
+def _fit(result: str, budget: int, request: FileReadRequest) -> str:
+    """Cut `result` to `budget` characters on a line boundary, pointing at where to resume."""
+    cut = result.rfind("\n", 0, budget)
+    kept = result[:cut] if cut > 0 else ""
+    shown = kept.count("\n") + 1 if kept else 0
+    resume_at = (request.offset or 1) + shown
+    note = (f"<system-reminder>output budget reached after {shown} line(s); "
+            f"read {request.file_path} with offset={resume_at} to continue</system-reminder>")
+    return f"{kept}\n{note}" if kept else note
+
+
+def read_many(files: list[FileReadRequest], max_total_chars: int = None) -> str:
+    """
+    Read multiple files concurrently and return them under one size budget.
+
+    Args:
+        files (list[FileReadRequest]): Files to read; each has an absolute file_path and optional offset/limit.
+        max_total_chars (int, optional): Cap on the combined file contents returned. Defaults to 100000.
+
+    Returns:
+        str: One `==> path <==` section per file, in the order given, or an error message.
+    """
+    if not files:
+        return "Error: 'files' must contain at least one file"
+    if len(files) > MAX_FILES:
+        return f"Error: at most {MAX_FILES} files can be read per call (got {len(files)})"
+    if max_total_chars is None:
+        max_total_chars = DEFAULT_TOTAL_BUDGET_CHARS
+    else:
+        try:
+            max_total_chars = int(max_total_chars)
+        except Exception:
+            return "Error: 'max_total_chars' must be an integer"
+        if max_total_chars < 1:
+            return "Error: 'max_total_chars' must be >= 1"
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(files))) as pool:
+        results = list(pool.map(lambda r: read(r.file_path, offset=r.offset, limit=r.limit), files))
+
+    remaining = max_total_chars
+    sections = []
+    for request, result in zip(files, results):
+        header = f"==> {request.file_path} <=="
+        if remaining <= 0:
+            sections.append(f"{header}\n<system-reminder>skipped: output budget exhausted</system-reminder>")
+            continue
+        if len(result) > remaining:
+            result = _fit(result, remaining, request)
+            remaining = 0
+        else:
+            remaining -= len(result)
+        sections.append(f"{header}\n{result}")
+    return "\n\n".join(sections)
+
+
+# Export a ToolDefinition for the batch read tool
+read_many_tool_def = ToolDefinition(
+    fn=read_many,
+    usage_system_prompt=READ_MANY_TOOL_SYSTEM_PROMPT,
+)
@@ -1,4 +1,6 @@
 from models.tool_definition import ToolDefinition
+from tools.file_cache import get_file_cache
+from tools.line_index import get_line_index
 
 READ_TOOL_SYSTEM_PROMPT = """Reads a file from the local filesystem. You can access any file directly by using this tool.
 Assume this tool is able to read all files on the machine. If the User provides a path to a file assume that path is valid. It is okay to read a file that does not exist; an error will be returned.
@@ -18,6 +20,7 @@ Usage:
 """
 
 
+import io
 import os
 
 def read(file_path: str, offset: int = None, limit: int = None) -> str:
@@ -66,14 +69,29 @@ def read(file_path: str, offset: int = None, limit: int = None) -> str:
         pass
 
     MAX_LINE_LEN = 2000
+
+    def _render(lines: list[str]) -> str:
+        # Emulate `cat -n` formatting; numbering in returned chunk starts at 1
+        return "\n".join(f"{i:6}\t{line[:MAX_LINE_LEN]}" for i, line in enumerate(lines, start=1))
+
+    # Small/medium files: serve decoded content (and previously rendered chunks) from memory
+    cached = get_file_cache().read_chunk(file_path, offset, limit, _render)
+    if cached is not None:
+        return cached or "<system-reminder>no lines read (file may be empty or offset exceeds file length)</system-reminder>"
+
     collected = []
     try:
-        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        # Large files: jump to the nearest indexed line instead of decoding everything before `offset`
+        index = get_line_index(file_path) if offset > 1 else None
+        byte_offset, first_lineno = index.seek_point(offset) if index is not None else (0, 1)
+        raw = open(file_path, "rb")
+        raw.seek(byte_offset)
+        with io.TextIOWrapper(raw, encoding="utf-8", errors="replace") as f:
             # Iterate lines without loading whole file into memory
             start = offset
             end = offset + limit - 1
             out_index = 1  # numbering in returned chunk starts at 1
-            for lineno, raw_line in enumerate(f, start=1):
+            for lineno, raw_line in enumerate(f, start=first_lineno):
                 if lineno < start:
                     continue
                 if lineno > end:
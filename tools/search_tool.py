@@ -1,9 +1,9 @@
 import os
 import re
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, List, Dict, Tuple
 
-from pathspec import PathSpec
-from pathspec.patterns.gitwildmatch import GitWildMatchPattern
+if TYPE_CHECKING:  # pathspec is imported on first use to keep CLI startup fast
+    from pathspec import PathSpec
 
 from models.tool_definition import ToolDefinition
 
@@ -46,13 +46,15 @@ FULL_FILES_MAX = 10
 FULL_TOTAL_CHARS_MAX = 120_000
 FULL_PER_FILE_CHARS_MAX = 20_000
 
-def _compile_gitignore(root: str) -> PathSpec | None:
+def _compile_gitignore(root: str) -> "PathSpec | None":
     gitignore_path = os.path.join(root, ".gitignore") if os.path.isdir(root) else os.path.join(os.path.dirname(root), ".gitignore")
     if not os.path.isfile(gitignore_path):
         return None
     try:
         with open(gitignore_path, "r", encoding="utf-8", errors="ignore") as fh:
             lines = fh.read().splitlines()
+        from pathspec import PathSpec
+        from pathspec.patterns.gitwildmatch import GitWildMatchPattern
         return PathSpec.from_lines(GitWildMatchPattern, lines)
     except Exception:
         return None
@@ -80,7 +82,7 @@ def _is_binary(path: str) -> bool:
         return False
     return False
 
-def _gather_files(root: str, glob_patterns: List[str], git_spec: PathSpec | None) -> Tuple[List[str], bool, int]:
+def _gather_files(root: str, glob_patterns: List[str], git_spec: "PathSpec | None") -> Tuple[List[str], bool, int]:
     """Collect candidate text files.
 
     Returns (files, truncated, binary_skipped)
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Opt-in switch and tuning knobs
+TASK_CACHE_ENV = 'COGENT_TASK_CACHE'
+TASK_CACHE_TTL_ENV = 'COGENT_TASK_CACHE_TTL'
+TASK_CACHE_MAX_ENV = 'COGENT_TASK_CACHE_MAX_ENTRIES'
+
+DEFAULT_TTL_S = 24 * 3600
+DEFAULT_MAX_ENTRIES = 256
+CACHE_FILE_NAME = 'task_cache.json'
+
+# Files larger than this are fingerprinted by size + mtime instead of content
+_HASH_CONTENT_MAX_BYTES = 2_000_000
+_MAX_REFERENCED_FILES = 50
+_PATH_TOKEN = re.compile(r"[\w./\\~-]*[\w-]\.[A-Za-z0-9]{1,8}\b|/[\w./-]+")
+
+
+def task_cache_enabled() -> bool:
+    return os.environ.get(TASK_CACHE_ENV, '').strip().lower() in {'1', 'true', 'yes', 'on'}
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case- and whitespace-insensitive form so trivially different prompts share a key."""
+    text = ' '.join((prompt or '').lower().split())
+    return text.rstrip(' .!?')
+
+
+def agent_fingerprint(definition_prompt: str, provider_name: str, model_name: str) -> str:
+    """Identity of the sub-agent that produced an output: its system prompt and the model it ran on."""
+    raw = f"{provider_name}\n{model_name}\n{definition_prompt or ''}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def referenced_files(prompt: str, cwd: str) -> List[str]:
+    """Existing files mentioned in the prompt (absolute or relative to cwd), sorted."""
+    found = set()
+    for token in _PATH_TOKEN.findall(prompt or ''):
+        token = token.strip('.,;:()[]{}"\'`')
+        if not token:
+            continue
+        path = os.path.expanduser(token)
+        if not os.path.isabs(path):
+            path = os.path.join(cwd, path)
+        path = os.path.normpath(path)
+        if os.path.isfile(path):
+            found.add(path)
+            if len(found) >= _MAX_REFERENCED_FILES:
+                break
+    return sorted(found)
+
+
+def fingerprint_files(paths: List[str]) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(path.encode('utf-8', 'surrogateescape'))
+        try:
+            st = os.stat(path)
+            if st.st_size <= _HASH_CONTENT_MAX_BYTES:
+                with open(path, 'rb') as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+            else:
+                h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+        except OSError:
+            h.update(b'<missing>')
+    return h.hexdigest()
+
+
+class TaskResultCache:
+    """Persistent LRU of sub-agent outputs keyed by (subagent_type, normalized prompt, agent).
+
+    `agent` is an `agent_fingerprint`, so editing the sub-agent definition or
+    switching provider/model never serves an output produced by another agent.
+
+    An entry is served only while it is younger than `ttl_s` and the
+    fingerprint of the files referenced by the prompt is unchanged.
+    Stored in `<cwd>/.cogent/task_cache.json`.
+    """
+
+    def __init__(self, cwd: str, ttl_s: float = DEFAULT_TTL_S, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cwd = cwd
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.path = os.path.join(cwd, '.cogent', CACHE_FILE_NAME)
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def key(subagent_type: str, prompt: str, agent: str = '') -> str:
+        raw = f"{subagent_type}\n{agent}\n{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for entry in data.get('entries', []):
+                self._entries[entry['key']] = entry
+        except (OSError, ValueError, KeyError, TypeError):
+            self._entries.clear()
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': list(self._entries.values())}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:  # pragma: no cover - cache persistence is best effort
+            pass
+
+    def get(self, subagent_type: str, prompt: str, agent: str = '') -> Optional[str]:
+        key = self.key(subagent_type, prompt, agent)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry['created_at'] > self.ttl_s:
+                del self._entries[key]
+                self.misses += 1
+                self._save()
+                return None
+        # Fingerprinting reads files: do it outside the lock
+        current = fingerprint_files(referenced_files(prompt, self.cwd))
+        with self._lock:
+            if entry['fingerprint'] != current:
+                self._entries.pop(key, None)
+                self.misses += 1
+                self._save()
+                return None
+            self._entries.move_to_end(key)
+            entry['last_used'] = time.time()
+            self.hits += 1
+            return entry['output']
+
+    def put(self, subagent_type: str, prompt: str, output: str, agent: str = '') -> None:
+        key = self.key(subagent_type, prompt, agent)
+        fingerprint = fingerprint_files(referenced_files(prompt, self.cwd))
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {
+                'key': key,
+                'subagent_type': subagent_type,
+                'fingerprint': fingerprint,
+                'output': output,
+                'created_at': now,
+                'last_used': now,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+_CACHES: Dict[str, TaskResultCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_task_cache(cwd: str) -> TaskResultCache:
+    """Per-project cache instance (configured from COGENT_TASK_CACHE_* env vars)."""
+    with _CACHES_LOCK:
+        cache = _CACHES.get(cwd)
+        if cache is None:
+            try:
+                ttl = float(os.environ.get(TASK_CACHE_TTL_ENV, DEFAULT_TTL_S))
+            except ValueError:
+                ttl = DEFAULT_TTL_S
+            try:
+                max_entries = int(os.environ.get(TASK_CACHE_MAX_ENV, DEFAULT_MAX_ENTRIES))
+            except ValueError:
+                max_entries = DEFAULT_MAX_ENTRIES
+            cache = TaskResultCache(cwd, ttl_s=ttl, max_entries=max_entries)
+            _CACHES[cwd] = cache
+        return cache
@@ -1,12 +1,23 @@
 from models.agent_deps import AgentDeps
-from pydantic_ai import RunContext, Tool
+from pydantic_ai import Agent, RunContext, Tool
+from pydantic_ai.usage import RunUsage
 from models.tool_definition import ToolDefinition
+from models.rate_limiter import PRIORITY_SUBAGENT, request_priority
+from tools.task_cache import agent_fingerprint, get_task_cache, task_cache_enabled
 
+import asyncio
+import functools
+import os
 import textwrap
+import threading
+import time
 from pathlib import Path
 import re
+from typing import Any, Optional
 
-from sub_agents import create_sub_agent
+from models.provider_config import ProviderSpec, resolve_provider
+from models.task_request import TaskRequest
+from sub_agents import SubAgentTimeout, create_sub_agent, get_subagent_executor
 from toolsets.common_agent_toolset import common_agent_tool_definitions
 
 
@@ -24,9 +35,35 @@ async def task(ctx: RunContext[AgentDeps], description: str, prompt: str, subage
         str: The resulting output produced by the sub-agent, or an error message if execution failed.
     """
     # Removed direct print side-effect; rely on returned output only.
+    return await _run_task(ctx, prompt, subagent_type)
 
-    # Load available sub-agent definitions from disk
-    sub_agent_defs = load_sub_agent_definitions()
+
+async def task_batch(ctx: RunContext[AgentDeps], tasks: list[TaskRequest]) -> str:
+    """
+    Run several independent sub-agents concurrently and return all of their results.
+
+    Args:
+        ctx (RunContext[AgentDeps]): Execution context providing dependencies and runtime info.
+        tasks (list[TaskRequest]): The sub-agent runs to perform; each has a description, prompt and subagent_type.
+
+    Returns:
+        str: One section per task, in the order given, with each sub-agent's output or error message.
+    """
+    if not tasks:
+        return "Error: tasks must contain at least one task"
+
+    results = await asyncio.gather(*(_run_task(ctx, t.prompt, t.subagent_type) for t in tasks))
+    sections = [
+        f"## Task {i}: {t.description} ({t.subagent_type})\n{result}"
+        for i, (t, result) in enumerate(zip(tasks, results), start=1)
+    ]
+    return "\n\n".join(sections)
+
+
+async def _run_task(ctx: RunContext[AgentDeps], prompt: str, subagent_type: str) -> str:
+    # Sub-agent definitions are parsed once and refreshed only when Agents/ changes
+    registry = get_sub_agent_registry()
+    sub_agent_defs = registry.definitions()
 
     # Find the selected sub-agent definition
     selected = None
@@ -43,19 +80,43 @@ async def task(ctx: RunContext[AgentDeps], description: str, prompt: str, subage
         else:
             return f"Unknown subagent_type '{subagent_type}'. Available types: {', '.join([s.type for s in sub_agent_defs]) + ', general-purpose' if sub_agent_defs else 'general-purpose'}"
 
-    # Build the complete system prompt for the sub-agent by combining the agent's prompt
-    # with tool usage instructions so the sub-agent is aware of available tools.
-    tool_usage = _render_tool_usage()
-    system_prompt = selected.prompt + "\n\n" + "Tool usage:\n" + tool_usage
-
-    sub_agent = create_sub_agent(system_prompt=system_prompt)
+    provider, model_name = resolve_provider()
+    # Opt-in: reuse the output of an identical earlier request to the same sub-agent
+    # (definition prompt, provider and model) while referenced files are unchanged
+    cache = get_task_cache(ctx.deps.cwd) if task_cache_enabled() else None
+    agent_id = ''
+    if cache is not None:
+        agent_id = agent_fingerprint(selected.prompt, provider.name, model_name)
+        cached = cache.get(selected.type, prompt, agent_id)
+        if cached is not None:
+            return cached
+
+    sub_agent = registry.agent_for(selected, provider.name, model_name)
+    # Isolated bash session / scratch state so concurrent sub-agents cannot race on them
+    child_deps = ctx.deps.fork()
+    # Accumulates across model requests, so partial usage survives errors and timeouts
+    run_usage = RunUsage()
+
+    async def run_sub_agent():
+        # Provide the user-supplied prompt as the actual task to perform
+        # Sub-agent model requests queue behind the main agent's on rate-limited providers
+        with request_priority(PRIORITY_SUBAGENT):
+            return await sub_agent.run(prompt, deps=child_deps, usage=run_usage)
 
+    started = time.perf_counter()
     try:
-        # Provide the user-supplied prompt as the actual task to perform
-        result = await sub_agent.run(prompt, deps=ctx.deps)
+        # Bounded parallelism and a per-run deadline across all concurrent task calls
+        result = await get_subagent_executor().run(run_sub_agent)
+        if cache is not None and isinstance(result.output, str):
+            cache.put(selected.type, prompt, result.output, agent_id)
         return result.output
+    except SubAgentTimeout as e:
+        return f"Error: {e}"
     except Exception as e:
         return f"Error generating task plan: {e}"
+    finally:
+        child_deps.usage.add_run(run_usage, time.perf_counter() - started)
+        ctx.deps.usage.merge(child_deps.usage)
 
 
 from dataclasses import dataclass
@@ -171,6 +232,19 @@ def create_task_tool_def(sub_agent_defs: list[SubAgentDefinition]) -> ToolDefini
     return ToolDefinition(fn=task, usage_system_prompt=_task_tool_description(sub_agent_defs))
 
 
+TASK_BATCH_TOOL_SYSTEM_PROMPT = """Launch several independent sub-agents at once and wait for all of them. Each entry in `tasks` takes the same description, prompt and subagent_type as the Task tool.
+
+Usage notes:
+- Use this for fan-out work whose branches do not depend on each other, e.g. exploring five areas of a codebase in parallel. The batch finishes in about the time of its slowest branch.
+- Results come back as one section per task, in the order given. A failed or timed-out branch reports its error in its own section without affecting the others.
+- Sub-agents run with bounded parallelism and a per-run deadline; extra tasks queue until a slot frees up.
+- Do not batch tasks where one needs another's result; run those sequentially with the Task tool instead."""
+
+
+def create_task_batch_tool_def() -> ToolDefinition:
+    return ToolDefinition(fn=task_batch, usage_system_prompt=TASK_BATCH_TOOL_SYSTEM_PROMPT)
+
+
 # --- Helpers for loading custom agent definitions from Agents/ ---
 
 def load_sub_agent_definitions(agents_dir: str = "Agents") -> list[SubAgentDefinition]:
@@ -210,6 +284,78 @@ def load_sub_agent_definitions(agents_dir: str = "Agents") -> list[SubAgentDefin
     return defs
 
 
+def _definitions_signature(agents_dir: str) -> Optional[tuple]:
+    """Cheap change detector for Agents/: the directory's and every .md file's mtime and size."""
+    try:
+        dir_mtime = os.stat(agents_dir).st_mtime_ns
+        with os.scandir(agents_dir) as it:
+            files = sorted(
+                (e.name, e.stat().st_mtime_ns, e.stat().st_size)
+                for e in it if e.name.endswith('.md') and e.is_file()
+            )
+    except OSError:
+        return None
+    return (dir_mtime, tuple(files))
+
+
+class SubAgentRegistry:
+    """Parsed sub-agent definitions plus memoized agents built from them.
+
+    Definitions are re-read only when the Agents/ directory signature
+    changes. Agents are memoized per (type, provider, model) and rebuilt
+    when their definition or the provider spec they were built for changes.
+    """
+
+    def __init__(self, agents_dir: str = "Agents"):
+        self.agents_dir = agents_dir
+        self._lock = threading.Lock()
+        self._signature: Any = object()  # never equal to a real signature
+        self._defs: list[SubAgentDefinition] = []
+        self._agents: dict[tuple, tuple[SubAgentDefinition, ProviderSpec, Agent]] = {}
+        self.loads = 0
+        self.agent_builds = 0
+
+    def definitions(self) -> list[SubAgentDefinition]:
+        signature = _definitions_signature(self.agents_dir)
+        with self._lock:
+            if signature != self._signature:
+                self._defs = load_sub_agent_definitions(self.agents_dir)
+                self._signature = signature
+                self.loads += 1
+            return list(self._defs)
+
+    def agent_for(self, definition: SubAgentDefinition, provider_name: str | None = None,
+                  model_name: str | None = None) -> Agent:
+        provider, chosen_model = resolve_provider(provider_name, model_name)
+        key = (definition.type, provider.name, chosen_model)
+        with self._lock:
+            cached = self._agents.get(key)
+        if cached is not None and cached[0] == definition and cached[1] == provider:
+            return cached[2]
+        # Build the complete system prompt for the sub-agent by combining the agent's prompt
+        # with tool usage instructions so the sub-agent is aware of available tools.
+        system_prompt = definition.prompt + "\n\n" + "Tool usage:\n" + _render_tool_usage()
+        agent = create_sub_agent(system_prompt=system_prompt, provider_name=provider.name, model_name=chosen_model)
+        with self._lock:
+            self._agents[key] = (definition, provider, agent)
+            self.agent_builds += 1
+        return agent
+
+    def clear(self) -> None:
+        with self._lock:
+            self._signature = object()
+            self._defs = []
+            self._agents.clear()
+
+
+_registry = SubAgentRegistry()
+
+
+def get_sub_agent_registry() -> SubAgentRegistry:
+    return _registry
+
+
+@functools.lru_cache(maxsize=1)
 def _render_tool_usage() -> str:
     """Render usage text for common agent tools so sub-agents know what's available."""
     parts = [f"Tool name: {d.fn.__name__}\nTool description: {d.usage_system_prompt}" for d in common_agent_tool_definitions]
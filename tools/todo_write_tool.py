@@ -1,5 +1,9 @@
+from pydantic_ai import RunContext
+
+from models.agent_deps import AgentDeps
 from models.tool_definition import ToolDefinition
 from models.todo_item import TodoItem
+from models.todo_patch import TodoPatch
 
 TODO_WRITE_TOOL_SYSTEM_PROMPT = """Use this tool to create and manage a structured task list for your current coding session. This helps you track progress, organize complex tasks, and demonstrate thoroughness to the user.
 It also helps the user understand the progress of the task and overall progress of their requests.
@@ -154,6 +158,8 @@ The assistant did not use the todo list because this is a single command executi
    - completed: Task finished successfully
 
 2. **Task Management**:
+   - The list is kept between calls. To change it, send only the affected items in `updates` (by id; fields you leave out keep their value) and ids to delete in `remove`. Pass `todos` only to create or fully replace the list
+   - The reply lists only what changed (`+` added, `~` changed, `-` removed) and a status summary
    - Update task status in real-time as you work
    - Mark tasks complete IMMEDIATELY after finishing (don't batch completions)
    - Only have ONE task in_progress at any time
@@ -179,49 +185,43 @@ When in doubt, use this tool. Being proactive with task management demonstrates
     """
 
 
-def todo_write(todos: list[TodoItem] = None) -> str:
+def todo_write(ctx: RunContext[AgentDeps], todos: list[TodoItem] = None, updates: list[TodoPatch] = None,
+               remove: list[int] = None) -> str:
     """
-    Create or update a structured TODO list for the current coding session.
+    Create or update the structured TODO list for the current coding session.
 
     Args:
-        todos (list[TodoItem], optional): A list of TodoItem objects representing the tasks to record. If omitted, an empty list is assumed.
+        ctx (RunContext[AgentDeps]): Execution context; the list lives in `ctx.deps.todos`.
+        todos (list[TodoItem], optional): The complete list, replacing the current one. Omit it to patch instead.
+        updates (list[TodoPatch], optional): Changes to individual items by id (unknown ids create new items).
+        remove (list[int], optional): Ids of items to delete.
 
     Returns:
-        str: A summary message indicating the updated TODO list status or an error message on failure.
+        str: The changes made (one line per item) and a status summary, or an error message on failure.
     """
-    if todos is None:
-        todos = []
-
+    store = ctx.deps.todos
     try:
-        # Create formatted todo list content
-        content = "# TODO List\n\n"
-        pending_todos = [t for t in todos if t.state == 'pending'] if todos else []
-        in_progress_todos = [t for t in todos if t.state == 'in_progress'] if todos else []
-        completed_todos = [t for t in todos if t.state == 'completed'] if todos else []
-        if not todos:
-            content += "No active tasks.\n"
+        if todos is not None:
+            if updates or remove:
+                return "Error: pass either 'todos' (full list) or 'updates'/'remove' (patch), not both"
+            ids = [t.id for t in todos]
+            if len(ids) != len(set(ids)):
+                return "Error: todo ids must be unique"
+            changes = store.replace_all(todos)
         else:
-            if in_progress_todos:
-                content += "## 🔄 In Progress\n\n"
-                for todo in in_progress_todos:
-                    content += f"- [ ] **{todo.description}** (ID: `{todo.id}`)\n"
-                content += "\n"
-            if pending_todos:
-                content += "## 📋 Pending\n\n"
-                for todo in pending_todos:
-                    content += f"- [ ] {todo.description} (ID: `{todo.id}`)\n"
-                content += "\n"
-            if completed_todos:
-                content += "## ✅ Completed\n\n"
-                for todo in completed_todos:
-                    content += f"- [x] {todo.description} (ID: `{todo.id}`)\n"
-                content += "\n"
-        status_summary = f"📊 {len(pending_todos)} pending, {len(in_progress_todos)} in progress, {len(completed_todos)} completed"
-        return f"Updated TODO list\n{status_summary}"
-        
+            changes = store.patch(updates or [], remove or [])
+    except ValueError as e:
+        return f"Error: {e}"
     except Exception as e:
         return f"Error writing TODO list: {e}"
 
+    counts = store.counts()
+    status_summary = (f"📊 {counts['pending']} pending, {counts['in_progress']} in progress, "
+                      f"{counts['completed']} completed")
+    if not changes:
+        return f"TODO list unchanged\n{status_summary}"
+    return "Updated TODO list\n" + "\n".join(changes) + f"\n{status_summary}"
+
 
 todo_write_tool_def = ToolDefinition(
     fn=todo_write,
@@ -0,0 +1,261 @@
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Opt-in OpenTelemetry spans per tool call (also switched on with --logfire)
+TOOL_SPANS_ENV = 'COGENT_TOOL_SPANS'
+
+# Log-spaced latency buckets: each upper bound is 25% above the previous one,
+# from 10 microseconds to well over an hour, so percentiles are within ~25%.
+_BUCKET_GROWTH = 1.25
+_FIRST_BUCKET_MS = 0.01
+_NUM_BUCKETS = 100
+
+# Process-wide counters, so work a tool hands to helper threads (read_many's pool)
+# is counted; calls that overlap in time also see each other's reads and CPU.
+_PROC_IO = '/proc/self/io'
+
+
+class LatencyHistogram:
+    """Fixed log-bucket histogram of durations in milliseconds."""
+
+    __slots__ = ('counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.counts = [0] * _NUM_BUCKETS
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @staticmethod
+    def _bucket(ms: float) -> int:
+        if ms <= _FIRST_BUCKET_MS:
+            return 0
+        return min(_NUM_BUCKETS - 1, math.ceil(math.log(ms / _FIRST_BUCKET_MS, _BUCKET_GROWTH)))
+
+    def add(self, ms: float) -> None:
+        self.counts[self._bucket(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (capped at the observed max)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_FIRST_BUCKET_MS * _BUCKET_GROWTH ** i, self.max_ms)
+        return self.max_ms  # pragma: no cover
+
+
+class ToolStats:
+    __slots__ = ('latency', 'errors', 'cpu_ms', 'bytes_read', 'result_chars')
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.cpu_ms = 0.0
+        self.bytes_read = 0
+        self.result_chars = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        # Only characters are counted per call; tokens are approximated here, off the hot path
+        from models.token_estimator import HeuristicTokenizer
+        return {
+            'calls': self.latency.count,
+            'errors': self.errors,
+            'wall_ms_total': round(self.latency.total_ms, 1),
+            'wall_ms_p50': round(self.latency.percentile(50), 1),
+            'wall_ms_p95': round(self.latency.percentile(95), 1),
+            'wall_ms_max': round(self.latency.max_ms, 1),
+            'cpu_ms_total': round(self.cpu_ms, 1),
+            'bytes_read': self.bytes_read,
+            'result_chars': self.result_chars,
+            'result_tokens': math.ceil(self.result_chars / HeuristicTokenizer.CHARS_PER_TOKEN),
+        }
+
+
+class ToolMetricsRegistry:
+    """Per-tool latency histograms and payload counters for the current process (session)."""
+
+    def __init__(self):
+        self._stats: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+        # Union of in-flight call intervals: concurrent calls are not double-counted
+        self._active = 0
+        self._busy_since = 0.0
+        self._busy_s = 0.0
+
+    def call_started(self, at: float) -> None:
+        with self._lock:
+            if self._active == 0:
+                self._busy_since = at
+            self._active += 1
+
+    def call_finished(self, at: float) -> None:
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                self._busy_s += at - self._busy_since
+
+    def busy_ms(self) -> float:
+        """Wall time (perf_counter ms) during which at least one tool call was running."""
+        with self._lock:
+            busy = self._busy_s
+            if self._active:
+                busy += time.perf_counter() - self._busy_since
+            return busy * 1000
+
+    def record(self, tool: str, wall_ms: float, cpu_ms: float, bytes_read: int,
+               result_chars: int, error: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(tool)
+            if stats is None:
+                stats = self._stats[tool] = ToolStats()
+            stats.latency.add(wall_ms)
+            stats.cpu_ms += cpu_ms
+            stats.bytes_read += bytes_read
+            stats.result_chars += result_chars
+            stats.errors += int(error)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._stats.items())}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._busy_s = 0.0
+
+
+_registry = ToolMetricsRegistry()
+_spans_enabled: Optional[bool] = None
+
+
+def get_tool_metrics() -> ToolMetricsRegistry:
+    return _registry
+
+
+def enable_tool_spans(enabled: bool = True) -> None:
+    """Emit an OpenTelemetry span per tool call (no-op when opentelemetry is not installed)."""
+    global _spans_enabled
+    _spans_enabled = enabled
+
+
+def _tracer():
+    global _spans_enabled
+    if _spans_enabled is None:
+        _spans_enabled = os.environ.get(TOOL_SPANS_ENV, '').strip().lower() in {'1', 'true', 'yes', 'on'}
+    if not _spans_enabled:
+        return None
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace.get_tracer('cogent.tools')
+
+
+def _process_rchar() -> Optional[int]:
+    """Bytes this process has read through read-like syscalls so far (Linux only)."""
+    try:
+        with open(_PROC_IO, 'rb') as f:
+            for line in f:
+                if line.startswith(b'rchar:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _result_text(result: Any) -> str:
+    return result if isinstance(result, str) else str(result)
+
+
+class _Call:
+    """Measures one tool call: wall time, plus process CPU time and bytes read over its duration."""
+
+    def __init__(self, name: str):
+        self.name = name
+        tracer = _tracer()
+        self.span = tracer.start_span(f'tool {name}') if tracer is not None else None
+        self.rchar = _process_rchar()
+        self.cpu = time.process_time()
+        self.started = time.perf_counter()
+        _registry.call_started(self.started)
+
+    def finish(self, result: Any = None, exc: Optional[BaseException] = None) -> None:
+        finished = time.perf_counter()
+        _registry.call_finished(finished)
+        wall_ms = (finished - self.started) * 1000
+        cpu_ms = (time.process_time() - self.cpu) * 1000
+        rchar = _process_rchar()
+        bytes_read = rchar - self.rchar if rchar is not None and self.rchar is not None else 0
+        text = _result_text(result) if exc is None else ''
+        error = exc is not None or text.startswith('Error')
+        _registry.record(self.name, wall_ms, cpu_ms, bytes_read, len(text), error)
+        if self.span is not None:
+            self.span.set_attributes({
+                'cogent.tool': self.name,
+                'cogent.tool.cpu_ms': cpu_ms,
+                'cogent.tool.bytes_read': bytes_read,
+                'cogent.tool.result_chars': len(text),
+                'cogent.tool.error': error,
+            })
+            if exc is not None:
+                self.span.record_exception(exc)
+            self.span.end()
+
+
+def instrument_tool(fn: Callable) -> Callable:
+    """Wrap a tool function so every call is measured into the tool metrics registry.
+
+    The wrapper keeps the function's name, docstring and signature, so the
+    tool schema the model sees is unchanged.
+    """
+    name = fn.__name__
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            call = _Call(name)
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as e:
+                call.finish(exc=e)
+                raise
+            call.finish(result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        call = _Call(name)
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.finish(exc=e)
+            raise
+        call.finish(result)
+        return result
+    return wrapper
+
+
+def format_tool_stats(summary: Dict[str, Dict[str, Any]]) -> str:
+    """Table for the /stats slash command."""
+    if not summary:
+        return "No tool calls recorded in this session."
+    header = f"{'tool':<12} {'calls':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'cpu ms':>8} {'read KB':>8} {'~tokens':>8}"
+    rows: List[str] = [header, '-' * len(header)]
+    for name, s in summary.items():
+        rows.append(f"{name:<12} {s['calls']:>5} {s['errors']:>4} {s['wall_ms_p50']:>8.1f} {s['wall_ms_p95']:>8.1f} "
+                    f"{s['wall_ms_max']:>8.1f} {s['cpu_ms_total']:>8.1f} {s['bytes_read'] / 1024:>8.1f} "
+                    f"{s['result_tokens']:>8}")
+    return "\n".join(rows)
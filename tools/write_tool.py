@@ -1,4 +1,6 @@
 from models.tool_definition import ToolDefinition
+from tools.atomic_io import atomic_write_text, path_lock
+from tools.file_cache import get_file_cache
 
 WRITE_TOOL_SYSTEM_PROMPT = """Writes content to an absolute file path (creates directories as needed).
 
@@ -11,6 +13,7 @@ Usage:
 
 
 import os
+import time
 
 def write(file_path: str, content: str) -> str:
     """
@@ -38,10 +41,15 @@ def write(file_path: str, content: str) -> str:
         if dir_name and not os.path.exists(dir_name):
             os.makedirs(dir_name, exist_ok=True)
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        return ("Overwrote file: " if overwrite else "Wrote new file: ") + file_path
+        started = time.perf_counter()
+        # Temp file + rename: readers never see a partial file; concurrent writers/editors are serialized
+        with path_lock(file_path):
+            written = atomic_write_text(file_path, content)
+            get_file_cache().update(file_path, content)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return ("Overwrote file: " if overwrite else "Wrote new file: ") + f"{file_path} ({written} bytes in {elapsed_ms:.1f} ms)"
     except Exception as e:
+        get_file_cache().invalidate(file_path)
         return f"Error writing to file: {e}"
 
 
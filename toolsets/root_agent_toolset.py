@@ -1,21 +1,46 @@
+from functools import lru_cache
+
 from pydantic_ai.toolsets import FunctionToolset
 
-from tools.task_tool import SubAgentDefinition, create_task_tool_def, load_sub_agent_definitions
+from models.tool_definition import ToolDefinition
+from tools.task_tool import (
+    SubAgentDefinition,
+    create_task_batch_tool_def,
+    create_task_tool_def,
+    get_sub_agent_registry,
+)
+
+
+@lru_cache(maxsize=1)
+def get_root_agent_tool_definitions() -> list[ToolDefinition]:
+    """Task tool definitions, built on first use so importing this module does not scan Agents/."""
+    # Load custom agents from the Agents/ directory and ensure a general-purpose fallback
+    sub_agents = get_sub_agent_registry().definitions()
+
+    if not any(sa.type == 'general-purpose' for sa in sub_agents):
+        sub_agents.append(SubAgentDefinition(
+            type="general-purpose",
+            description="A general-purpose agent capable of handling a wide range of tasks.",
+            prompt="",
+        ))
+
+    return [
+        create_task_tool_def(sub_agents),
+        create_task_batch_tool_def(),
+    ]
 
-# Load custom agents from the Agents/ directory and ensure a general-purpose fallback
-_sub_agents = load_sub_agent_definitions()
 
-if not any(sa.type == 'general-purpose' for sa in _sub_agents):
-    _sub_agents.append(SubAgentDefinition(
-        type="general-purpose",
-        description="A general-purpose agent capable of handling a wide range of tasks.",
-        prompt="",
-    ))
+@lru_cache(maxsize=1)
+def get_root_agent_toolset() -> FunctionToolset:
+    return FunctionToolset(
+        tools=[d.fn for d in get_root_agent_tool_definitions()]
+    )
 
-root_agent_tool_definitions = [
-    create_task_tool_def(_sub_agents)
-]
 
-root_agent_toolset = FunctionToolset(
-    tools=[d.fn for d in root_agent_tool_definitions]
-)
\ No newline at end of file
+def __getattr__(name: str):
+    # Backward-compatible module attributes, resolved lazily
+    if name == 'root_agent_tool_definitions':
+        return get_root_agent_tool_definitions()
+    if name == 'root_agent_toolset':
+        return get_root_agent_toolset()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")